@@ -0,0 +1,117 @@
+from functools import lru_cache
+from fastapi import Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials
+from app.core.security import security, verify_token, is_warden, is_admin
+from app.core.structured_logging import bind
+from app.core.jobs import JobContext, JobRunner
+from app.services.allocation_service import AllocationService
+from app.services.assignment_service import AssignmentService
+from app.services.dashboard_service import DashboardService
+from app.services.hostel_service import HostelService
+from app.services.occupancy_history_service import OccupancyHistoryService
+from app.services.room_service import RoomService
+from app.services.rollover_service import RolloverService
+from app.services.user_service import UserService
+from app.services.waitlist_service import WaitlistService
+
+# Services hold no per-request state, so one instance per process is shared by
+# every request instead of rebuilding repositories and collection refs each call.
+
+@lru_cache()
+def get_allocation_service() -> AllocationService:
+    return AllocationService()
+
+@lru_cache()
+def get_hostel_service() -> HostelService:
+    return HostelService()
+
+@lru_cache()
+def get_room_service() -> RoomService:
+    return RoomService()
+
+@lru_cache()
+def get_user_service() -> UserService:
+    return UserService()
+
+@lru_cache()
+def get_rollover_service() -> RolloverService:
+    return RolloverService()
+
+@lru_cache()
+def get_assignment_service() -> AssignmentService:
+    # Places students through the same allocation service as the allocation routes
+    return AssignmentService(get_allocation_service())
+
+@lru_cache()
+def get_dashboard_service() -> DashboardService:
+    return DashboardService()
+
+@lru_cache()
+def get_waitlist_service() -> WaitlistService:
+    # Shares the allocation service so its cancellations trigger promotions
+    return WaitlistService(get_allocation_service())
+
+@lru_cache()
+def get_occupancy_history_service() -> OccupancyHistoryService:
+    return OccupancyHistoryService()
+
+@lru_cache()
+def get_job_runner() -> JobRunner:
+    runner = JobRunner()
+    rollover_service = get_rollover_service()
+    assignment_service = get_assignment_service()
+    history_service = get_occupancy_history_service()
+
+    async def rollover(job: JobContext) -> dict:
+        return await rollover_service.rollover_semester(
+            job.params["semester"], batch_size=job.params["batchSize"], restart=job.params["restart"], progress=job.progress
+        )
+
+    async def bulk_assign(job: JobContext) -> dict:
+        return await assignment_service.bulk_assign(
+            job.params["semester"], job.created_by, dry_run=job.params["dryRun"], progress=job.progress
+        )
+
+    async def occupancy_compaction(job: JobContext) -> dict:
+        return await history_service.compact(progress=job.progress)
+
+    runner.register("rollover", rollover)
+    runner.register("bulk_assign", bulk_assign)
+    runner.register("occupancy_compaction", occupancy_compaction)
+    return runner
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    user_service: UserService = Depends(get_user_service)
+) -> dict:
+    """
+    Verify the bearer token and resolve the caller's uid, role and profile
+    claims (gender, hostelId) from it. The Firestore profile is only read
+    for accounts whose token predates the claims sync (no role claim).
+    """
+    decoded_token = verify_token(credentials.credentials)
+    uid = decoded_token["uid"]
+
+    role = decoded_token.get("role")
+    if role is None:
+        profile = await user_service.get_user(uid)
+        role = (profile or {}).get("role", "student")
+
+    bind(uid=uid, role=role)
+    return {
+        "uid": uid,
+        "email": decoded_token.get("email"),
+        "role": role,
+        "gender": decoded_token.get("gender"),
+        "hostelId": decoded_token.get("hostelId")
+    }
+
+async def require_warden(current_user: dict = Depends(get_current_user)) -> dict:
+    if not is_warden(current_user):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Warden or admin access required")
+    return current_user
+
+async def require_admin(current_user: dict = Depends(get_current_user)) -> dict:
+    if not is_admin(current_user):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
+    return current_user
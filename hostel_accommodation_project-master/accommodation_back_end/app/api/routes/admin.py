@@ -0,0 +1,41 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from app.api.deps import require_admin, get_job_runner
+from app.core.jobs import JobRunner
+from app.core.profiling import profile_store
+import asyncio
+from typing import List
+
+router = APIRouter()
+
+@router.get("/profiles", response_model=List[dict])
+async def list_profiles(current_user: dict = Depends(require_admin)):
+    """
+    Captured profiles and slow requests on this worker, newest first
+    (send X-Profile: 1 or ?profile=1 as an admin to profile a request)
+    """
+    return profile_store.list()
+
+@router.get("/profiles/{profile_id}", response_model=dict)
+async def get_profile(profile_id: str, current_user: dict = Depends(require_admin)):
+    entry = profile_store.get(profile_id)
+    if not entry:
+        raise HTTPException(status_code=404, detail="Profile not found (it may have rotated out, or been recorded by another worker)")
+    return entry
+
+@router.delete("/profiles")
+async def clear_profiles(current_user: dict = Depends(require_admin)):
+    profile_store.clear()
+    return {"message": "Profiles cleared"}
+
+@router.post("/occupancy-history/compact", response_model=dict, status_code=status.HTTP_202_ACCEPTED)
+async def compact_occupancy_history(
+    current_user: dict = Depends(require_admin),
+    runner: JobRunner = Depends(get_job_runner)
+):
+    """
+    Delete occupancy events and buckets past their retention, as a background job
+    """
+    try:
+        return await runner.submit("occupancy_compaction", {}, current_user["uid"])
+    except asyncio.QueueFull:
+        raise HTTPException(status_code=503, detail="Too many background jobs queued, try again later")
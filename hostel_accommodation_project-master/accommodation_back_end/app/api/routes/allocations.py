@@ -1,15 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from app.services.allocation_service import AllocationService
-from app.schemas.allocation import AllocationCreate, AllocationUpdate, Allocation
-from app.api.deps import get_current_user, require_warden
+from app.schemas.allocation import AllocationCreate, AllocationUpdate, Allocation, BulkAssignmentRequest
+from app.services.rollover_service import RolloverService, DEFAULT_BATCH_SIZE
+from app.services.assignment_service import AssignmentService
+from app.api.deps import get_current_user, require_warden, require_admin, get_allocation_service, get_rollover_service, get_assignment_service, get_job_runner, get_occupancy_history_service
+from app.core.exceptions import FirestoreUnavailableError, RolloverInProgressError
+from app.core.jobs import JobRunner
+from app.core.responses import FastJSONResponse
+from app.services.occupancy_history_service import OccupancyHistoryService
+from datetime import datetime, timedelta, timezone
 from typing import List, Optional
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 @router.post("/", response_model=dict, status_code=status.HTTP_201_CREATED)
 async def allocate_room(
     allocation: AllocationCreate,
-    current_user: dict = Depends(require_warden)
+    current_user: dict = Depends(require_warden),
+    service: AllocationService = Depends(get_allocation_service)
 ):
     """
     Allocate a room to a student (Warden/Admin only)
@@ -21,7 +33,6 @@ async def allocate_room(
     - Updates rooms.occupied correctly
     - Hostel gender restrictions
     """
-    service = AllocationService()
     try:
         result = await service.allocate_room(allocation, current_user["uid"])
         return {
@@ -31,52 +42,85 @@ async def allocate_room(
         }
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Allocation failed: {str(e)}")
+    except FirestoreUnavailableError:
+        raise
+    except Exception:
+        logger.exception("allocation failed", extra={"studentId": allocation.studentId, "roomId": allocation.roomId})
+        raise HTTPException(status_code=500, detail="Allocation failed")
+
+async def submit_job(runner: JobRunner, response: Response, kind: str, params: dict, created_by: str) -> dict:
+    try:
+        job = await runner.submit(kind, params, created_by)
+    except asyncio.QueueFull:
+        raise HTTPException(status_code=503, detail="Too many background jobs queued, try again later")
+    response.status_code = status.HTTP_202_ACCEPTED
+    return job
+
+@router.post("/bulk", response_model=dict)
+async def bulk_assign(
+    request: BulkAssignmentRequest,
+    response: Response,
+    background: bool = False,
+    current_user: dict = Depends(require_warden),
+    service: AssignmentService = Depends(get_assignment_service),
+    runner: JobRunner = Depends(get_job_runner)
+):
+    """
+    Assign every approved application of a semester to a bed (Warden/Admin only)
+
+    Maximises preference satisfaction (hostel, floor, block, amenities)
+    within capacity and hostel gender rules. Dry run by default: returns the
+    plan without allocating anything. With ?background=true the work runs as
+    a job: the response is the job record, follow it at /api/jobs/{id}.
+    """
+    if background:
+        params = {"semester": request.semester, "dryRun": request.dryRun}
+        return await submit_job(runner, response, "bulk_assign", params, current_user["uid"])
+    return await service.bulk_assign(request.semester, current_user["uid"], dry_run=request.dryRun)
 
-@router.get("/", response_model=List[dict])
+@router.get("/", response_model=List[dict], response_class=FastJSONResponse)
 async def get_allocations(
     semester: Optional[str] = None,
     hostel_id: Optional[str] = None,
     status: Optional[str] = None,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user),
+    service: AllocationService = Depends(get_allocation_service)
 ):
     """
     Get allocations with optional filters
     - Students can only see their own allocations
     - Wardens/Admins can see all allocations
+    Sent as read from Firestore, without per-item validation
     """
-    service = AllocationService()
-    
     if current_user["role"] in ["warden", "admin"]:
-        return await service.get_all_allocations(
+        return FastJSONResponse(await service.get_all_allocations(
             semester=semester,
             hostel_id=hostel_id,
             status=status
-        )
+        ))
     else:
         # Students can only see their own allocations
-        return await service.get_user_allocations(current_user["uid"])
+        return FastJSONResponse(await service.get_user_allocations(current_user["uid"]))
 
 @router.get("/mine", response_model=List[dict])
 async def get_my_allocations(
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user),
+    service: AllocationService = Depends(get_allocation_service)
 ):
     """
     Get current user's allocations
     """
-    service = AllocationService()
     return await service.get_user_allocations(current_user["uid"])
 
 @router.get("/{allocation_id}", response_model=dict)
 async def get_allocation(
     allocation_id: str,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user),
+    service: AllocationService = Depends(get_allocation_service)
 ):
     """
     Get allocation details by ID
     """
-    service = AllocationService()
     allocation = await service.get_allocation(allocation_id)
     
     if not allocation:
@@ -91,7 +135,8 @@ async def get_allocation(
 @router.get("/user/{user_id}", response_model=List[dict])
 async def get_user_allocations(
     user_id: str,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user),
+    service: AllocationService = Depends(get_allocation_service)
 ):
     """
     Get allocations for a specific user
@@ -100,31 +145,33 @@ async def get_user_allocations(
     if current_user["role"] not in ["warden", "admin"] and user_id != current_user["uid"]:
         raise HTTPException(status_code=403, detail="Not authorized to view these allocations")
     
-    service = AllocationService()
     return await service.get_user_allocations(user_id)
 
-@router.get("/room/{room_id}", response_model=List[dict])
+@router.get("/room/{room_id}", response_model=List[dict], response_class=FastJSONResponse)
 async def get_room_allocations(
     room_id: str,
-    current_user: dict = Depends(require_warden)
+    current_user: dict = Depends(require_warden),
+    service: AllocationService = Depends(get_allocation_service)
 ):
     """
     Get all allocations for a specific room (Warden/Admin only)
     """
-    service = AllocationService()
-    return await service.get_room_allocations(room_id)
+    return FastJSONResponse(await service.get_room_allocations(room_id))
 
 @router.patch("/{allocation_id}", response_model=dict)
 async def update_allocation(
     allocation_id: str,
     update_data: AllocationUpdate,
-    current_user: dict = Depends(require_warden)
+    current_user: dict = Depends(require_warden),
+    service: AllocationService = Depends(get_allocation_service)
 ):
     """
     Update allocation details (Warden/Admin only)
     """
-    service = AllocationService()
-    allocation = await service.update_allocation(allocation_id, update_data)
+    try:
+        allocation = await service.update_allocation(allocation_id, update_data)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     if not allocation:
         raise HTTPException(status_code=404, detail="Allocation not found")
@@ -134,14 +181,13 @@ async def update_allocation(
 @router.patch("/{allocation_id}/end", status_code=status.HTTP_200_OK)
 async def end_allocation(
     allocation_id: str,
-    current_user: dict = Depends(require_warden)
+    current_user: dict = Depends(require_warden),
+    service: AllocationService = Depends(get_allocation_service)
 ):
     """
     End/cancel an allocation (Warden/Admin only)
     Updates room occupancy accordingly
     """
-    service = AllocationService()
-    
     try:
         success = await service.cancel_allocation(allocation_id, current_user["uid"])
         if not success:
@@ -151,18 +197,21 @@ async def end_allocation(
             "success": True,
             "message": "Allocation ended successfully"
         }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to end allocation: {str(e)}")
+    except (HTTPException, FirestoreUnavailableError):
+        raise
+    except Exception:
+        logger.exception("ending allocation failed", extra={"allocationId": allocation_id})
+        raise HTTPException(status_code=500, detail="Failed to end allocation")
 
 @router.delete("/{allocation_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_allocation(
     allocation_id: str,
-    current_user: dict = Depends(require_warden)
+    current_user: dict = Depends(require_warden),
+    service: AllocationService = Depends(get_allocation_service)
 ):
     """
     Delete an allocation (Warden/Admin only)
     """
-    service = AllocationService()
     success = await service.cancel_allocation(allocation_id, current_user["uid"])
     
     if not success:
@@ -173,15 +222,78 @@ async def delete_allocation(
 @router.get("/hostel/{hostel_id}/occupancy")
 async def get_hostel_occupancy(
     hostel_id: str,
-    current_user: dict = Depends(require_warden)
+    current_user: dict = Depends(require_warden),
+    service: AllocationService = Depends(get_allocation_service)
 ):
     """
     Get occupancy statistics for a hostel (Warden/Admin only)
     """
-    service = AllocationService()
     occupancy = await service.get_hostel_occupancy(hostel_id)
     
     if not occupancy:
         raise HTTPException(status_code=404, detail="Hostel not found")
     
     return occupancy
+
+@router.get("/hostel/{hostel_id}/occupancy/history")
+async def get_hostel_occupancy_history(
+    hostel_id: str,
+    resolution: str = "day",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    current_user: dict = Depends(require_warden),
+    service: OccupancyHistoryService = Depends(get_occupancy_history_service)
+):
+    """
+    Occupancy of a hostel over time, one point per hour or day (Warden/Admin only)
+    Defaults to the last 30 days (7 days hourly), read from precomputed buckets
+    """
+    end = end or datetime.now(timezone.utc)
+    start = start or end - (timedelta(days=7) if resolution == "hour" else timedelta(days=30))
+    try:
+        return await service.get_history(hostel_id, resolution, start, end)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/rollover/{semester}")
+async def rollover_semester(
+    semester: str,
+    response: Response,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    restart: bool = False,
+    background: bool = False,
+    current_user: dict = Depends(require_admin),
+    service: RolloverService = Depends(get_rollover_service),
+    runner: JobRunner = Depends(get_job_runner)
+):
+    """
+    Complete and archive a semester's allocations (Admin only)
+    Safe to call again after a timeout: the run resumes from its checkpoint,
+    or is refused with 409 while the earlier run is still going.
+    With ?background=true it runs as a job followed at /api/jobs/{id}
+    """
+    try:
+        if background:
+            if batch_size < 1 or batch_size > DEFAULT_BATCH_SIZE:
+                raise ValueError(f"batch_size must be between 1 and {DEFAULT_BATCH_SIZE}")
+            params = {"semester": semester, "batchSize": batch_size, "restart": restart}
+            return await submit_job(runner, response, "rollover", params, current_user["uid"])
+        return await service.rollover_semester(semester, batch_size=batch_size, restart=restart)
+    except RolloverInProgressError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/rollover/{semester}")
+async def get_rollover_progress(
+    semester: str,
+    current_user: dict = Depends(require_admin),
+    service: RolloverService = Depends(get_rollover_service)
+):
+    """
+    Get the checkpoint of a semester rollover (Admin only)
+    """
+    checkpoint = await service.get_checkpoint(semester)
+    if not checkpoint:
+        raise HTTPException(status_code=404, detail="No rollover recorded for this semester")
+    return checkpoint
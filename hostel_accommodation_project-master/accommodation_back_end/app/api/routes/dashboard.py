@@ -0,0 +1,19 @@
+from fastapi import APIRouter, Depends
+from app.services.dashboard_service import DashboardService
+from app.api.deps import get_current_user, get_dashboard_service
+
+router = APIRouter()
+
+@router.get("/", response_model=dict)
+async def get_dashboard(
+    current_user: dict = Depends(get_current_user),
+    service: DashboardService = Depends(get_dashboard_service)
+):
+    """
+    Everything the caller's dashboard needs in one response
+    - Students: profile, applications, current room, waitlist, hostels
+    - Wardens/Admins: headline stats, occupancy per hostel, rooms, pending applications
+    """
+    if current_user["role"] in ["warden", "admin"]:
+        return await service.get_warden_dashboard()
+    return await service.get_student_dashboard(current_user["uid"])
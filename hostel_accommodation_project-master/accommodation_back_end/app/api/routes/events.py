@@ -0,0 +1,39 @@
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect, status
+from app.core.events import event_hub
+from app.core.security import verify_token
+import asyncio
+
+router = APIRouter()
+
+@router.websocket("/ws")
+async def occupancy_events(websocket: WebSocket, token: str):
+    """
+    Stream allocation events ({type, hostelId, roomId, semester}) as JSON.
+    Browsers cannot set headers on a websocket, so the ID token comes in
+    the query string. Any worker can serve the connection.
+    """
+    try:
+        verify_token(token)
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    queue = event_hub.connect()
+    # Reading lets us notice the client leaving while we wait for events
+    receiver = asyncio.create_task(websocket.receive_text())
+    try:
+        while True:
+            sender = asyncio.create_task(queue.get())
+            done, _ = await asyncio.wait({sender, receiver}, return_when=asyncio.FIRST_COMPLETED)
+            if receiver in done:
+                sender.cancel()
+                receiver.result()
+                receiver = asyncio.create_task(websocket.receive_text())
+                continue
+            await websocket.send_json(sender.result())
+    except WebSocketDisconnect:
+        pass
+    finally:
+        receiver.cancel()
+        event_hub.disconnect(queue)
@@ -0,0 +1,48 @@
+from fastapi import APIRouter, Depends, HTTPException
+from app.api.deps import get_job_runner, require_admin, require_warden
+from app.core.jobs import JobRunner
+from app.core.security import is_admin
+from typing import List
+
+router = APIRouter()
+
+async def get_visible_job(job_id: str, current_user: dict, runner: JobRunner) -> dict:
+    job = await runner.get(job_id)
+    # Wardens see the jobs they started, admins see every job
+    if not job or (not is_admin(current_user) and job.get("createdBy") != current_user["uid"]):
+        raise HTTPException(status_code=404, detail="Job not found (finished jobs expire)")
+    return job
+
+@router.get("/", response_model=List[dict])
+async def list_jobs(
+    limit: int = 50,
+    current_user: dict = Depends(require_admin),
+    runner: JobRunner = Depends(get_job_runner)
+):
+    """
+    Recent background jobs, newest first (Admin only)
+    """
+    return await runner.list(min(max(limit, 1), 200))
+
+@router.get("/{job_id}", response_model=dict)
+async def get_job(
+    job_id: str,
+    current_user: dict = Depends(require_warden),
+    runner: JobRunner = Depends(get_job_runner)
+):
+    """
+    Status, progress and, once finished, result or error of a job
+    """
+    return await get_visible_job(job_id, current_user, runner)
+
+@router.delete("/{job_id}", response_model=dict)
+async def cancel_job(
+    job_id: str,
+    current_user: dict = Depends(require_warden),
+    runner: JobRunner = Depends(get_job_runner)
+):
+    """
+    Cancel a job: a queued one at once, a running one at its next progress report
+    """
+    await get_visible_job(job_id, current_user, runner)
+    return await runner.cancel(job_id)
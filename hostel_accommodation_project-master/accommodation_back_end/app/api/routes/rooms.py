@@ -1,52 +1,56 @@
 from fastapi import APIRouter, Depends, HTTPException
 from app.services.room_service import RoomService
-from app.schemas.room import RoomCreate, RoomUpdate, Room
-from app.core.security import get_current_user
+from app.schemas.room import RoomCreate, RoomUpdate, Room, RoomOut
+from app.api.deps import get_current_user, require_warden, get_room_service
+from app.core.responses import FastJSONResponse
 from typing import List
 
-router = APIRouter(prefix="/rooms", tags=["rooms"])
+router = APIRouter()
 
 @router.post("/", response_model=dict)
 async def create_room(
     room: RoomCreate,
-    current_user: dict = Depends(get_current_user),
-    service: RoomService = Depends()
+    current_user: dict = Depends(require_warden),
+    service: RoomService = Depends(get_room_service)
 ):
-    # Only wardens and admins can create rooms
-    if current_user["role"] not in ["warden", "admin"]:
-        raise HTTPException(status_code=403, detail="Not authorized to create rooms")
-
     return await service.create_room(room)
 
-@router.get("/", response_model=List[dict])
+@router.get("/", response_model=List[RoomOut], response_class=FastJSONResponse)
 async def get_rooms(
     current_user: dict = Depends(get_current_user),
-    service: RoomService = Depends()
+    service: RoomService = Depends(get_room_service)
 ):
-    return await service.get_all_rooms()
+    return FastJSONResponse(await service.get_room_list())
 
 @router.get("/{room_id}", response_model=dict)
 async def get_room(
     room_id: str,
     current_user: dict = Depends(get_current_user),
-    service: RoomService = Depends()
+    service: RoomService = Depends(get_room_service)
 ):
     room = await service.get_room(room_id)
     if not room:
         raise HTTPException(status_code=404, detail="Room not found")
     return room
 
+@router.get("/{room_id}/roster", response_model=List[dict])
+async def get_room_roster(
+    room_id: str,
+    current_user: dict = Depends(require_warden),
+    service: RoomService = Depends(get_room_service)
+):
+    """
+    Who is in this room: student id, name and bed for each active allocation
+    """
+    return await service.get_room_roster(room_id)
+
 @router.put("/{room_id}", response_model=dict)
 async def update_room(
     room_id: str,
     update_data: RoomUpdate,
-    current_user: dict = Depends(get_current_user),
-    service: RoomService = Depends()
+    current_user: dict = Depends(require_warden),
+    service: RoomService = Depends(get_room_service)
 ):
-    # Only wardens and admins can update rooms
-    if current_user["role"] not in ["warden", "admin"]:
-        raise HTTPException(status_code=403, detail="Not authorized to update rooms")
-
     room = await service.update_room(room_id, update_data)
     if not room:
         raise HTTPException(status_code=404, detail="Room not found")
@@ -55,13 +59,9 @@ async def update_room(
 @router.delete("/{room_id}")
 async def delete_room(
     room_id: str,
-    current_user: dict = Depends(get_current_user),
-    service: RoomService = Depends()
+    current_user: dict = Depends(require_warden),
+    service: RoomService = Depends(get_room_service)
 ):
-    # Only wardens and admins can delete rooms
-    if current_user["role"] not in ["warden", "admin"]:
-        raise HTTPException(status_code=403, detail="Not authorized to delete rooms")
-
     success = await service.delete_room(room_id)
     if not success:
         raise HTTPException(status_code=404, detail="Room not found")
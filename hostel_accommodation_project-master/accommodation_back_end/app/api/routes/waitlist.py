@@ -0,0 +1,69 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from app.services.waitlist_service import WaitlistService
+from app.schemas.waitlist import WaitlistCreate
+from app.api.deps import get_current_user, require_warden, get_waitlist_service
+from typing import List
+
+router = APIRouter()
+
+@router.post("/", response_model=dict, status_code=status.HTTP_201_CREATED)
+async def join_waitlist(
+    request: WaitlistCreate,
+    current_user: dict = Depends(get_current_user),
+    service: WaitlistService = Depends(get_waitlist_service)
+):
+    """
+    Join the waitlist for a hostel
+    - Students join for themselves
+    - Wardens/Admins may enqueue any student and set the priority
+    """
+    is_warden = current_user["role"] in ["warden", "admin"]
+    if not is_warden and (request.studentId not in (None, current_user["uid"]) or request.priority is not None):
+        raise HTTPException(status_code=403, detail="Not authorized to enqueue other students or set priority")
+
+    student_id = request.studentId if is_warden and request.studentId else current_user["uid"]
+    try:
+        return await service.join(request, student_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/mine", response_model=List[dict])
+async def get_my_entries(
+    current_user: dict = Depends(get_current_user),
+    service: WaitlistService = Depends(get_waitlist_service)
+):
+    """
+    Get current user's waitlist entries
+    """
+    return await service.get_student_entries(current_user["uid"])
+
+@router.get("/hostel/{hostel_id}", response_model=List[dict])
+async def get_hostel_queue(
+    hostel_id: str,
+    semester: str,
+    current_user: dict = Depends(require_warden),
+    service: WaitlistService = Depends(get_waitlist_service)
+):
+    """
+    Get the waiting students of a hostel in promotion order (Warden/Admin only)
+    """
+    return await service.get_queue(semester, hostel_id)
+
+@router.delete("/{entry_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def leave_waitlist(
+    entry_id: str,
+    current_user: dict = Depends(get_current_user),
+    service: WaitlistService = Depends(get_waitlist_service)
+):
+    """
+    Leave the waitlist (own entry, or any entry for Wardens/Admins)
+    """
+    entry = await service.get_entry(entry_id)
+    if not entry:
+        raise HTTPException(status_code=404, detail="Waitlist entry not found")
+    if current_user["role"] not in ["warden", "admin"] and entry["studentId"] != current_user["uid"]:
+        raise HTTPException(status_code=403, detail="Not authorized to remove this entry")
+
+    if not await service.leave(entry_id):
+        raise HTTPException(status_code=400, detail="Entry is no longer waiting")
+    return None
@@ -0,0 +1,46 @@
+from app.core.config import READ_CACHE_TTL_SECONDS
+from app.core.pubsub import pubsub, PubSub
+from typing import Awaitable, Callable, Hashable
+import time
+
+class ReadCache:
+    """
+    Per-worker cache for hot, rarely changing reads (room and hostel lists).
+
+    Keys are tuples whose first element is a namespace ("rooms", "hostels").
+    Writers call invalidate(namespace); the namespace is dropped on every
+    worker through pubsub, and the TTL bounds staleness if a message is lost.
+    Cached values are shared between requests: treat them as read-only.
+    """
+    CHANNEL = "cache.invalidate"
+
+    def __init__(self, broker: PubSub, ttl: float = READ_CACHE_TTL_SECONDS):
+        self.broker = broker
+        self.ttl = ttl
+        self.entries = {}
+        self.generations = {}
+        broker.subscribe(self.CHANNEL, self._on_invalidate)
+
+    async def get(self, key: tuple, loader: Callable[[], Awaitable]):
+        entry = self.entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+
+        namespace = key[0]
+        generation = self.generations.get(namespace, 0)
+        value = await loader()
+        # Skip storing a result an invalidation raced with
+        if self.ttl > 0 and self.generations.get(namespace, 0) == generation:
+            self.entries[key] = (time.monotonic() + self.ttl, value)
+        return value
+
+    async def invalidate(self, namespace: Hashable) -> None:
+        await self.broker.publish(self.CHANNEL, {"namespace": namespace})
+
+    async def _on_invalidate(self, data: dict) -> None:
+        namespace = data["namespace"]
+        self.generations[namespace] = self.generations.get(namespace, 0) + 1
+        for key in [key for key in self.entries if key[0] == namespace]:
+            self.entries.pop(key, None)
+
+read_cache = ReadCache(pubsub)
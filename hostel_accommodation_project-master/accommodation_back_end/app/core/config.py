@@ -12,3 +12,50 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
 # CORS settings
 BACKEND_CORS_ORIGINS = ["http://localhost:3000", "http://localhost:8080"]
+
+# Multi-worker coordination (see app/core/pubsub.py)
+# "local": single process; "unix": workers on one host; "firestore": workers on several hosts
+PUBSUB_BACKEND = os.getenv("PUBSUB_BACKEND", "local")
+PUBSUB_SOCKET_DIR = os.getenv("PUBSUB_SOCKET_DIR", "/tmp/hostel-pubsub")
+READ_CACHE_TTL_SECONDS = float(os.getenv("READ_CACHE_TTL_SECONDS", "30"))
+
+# Room inventory (app/services/room_inventory.py) is reloaded from Firestore at least this often
+INVENTORY_MAX_AGE_SECONDS = float(os.getenv("INVENTORY_MAX_AGE_SECONDS", "300"))
+
+# Semester rollover (app/services/rollover_service.py): a run holds the semester's
+# checkpoint for this long, renewed every batch; a crashed run's lease lapses after it
+ROLLOVER_LEASE_SECONDS = float(os.getenv("ROLLOVER_LEASE_SECONDS", "120"))
+
+# Request profiling (app/core/profiling.py)
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", "1000"))
+PROFILE_BUFFER_SIZE = int(os.getenv("PROFILE_BUFFER_SIZE", "50"))
+PROFILE_TOP_FUNCTIONS = int(os.getenv("PROFILE_TOP_FUNCTIONS", "40"))
+
+# Logging (app/core/structured_logging.py): LOG_FORMAT "json" or "text"
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")
+LOG_DEBUG_SAMPLE_RATE = float(os.getenv("LOG_DEBUG_SAMPLE_RATE", "0.01"))
+
+# Background jobs (app/core/jobs.py): JOB_STORE "sqlite" locally, "firestore" in production
+JOB_STORE = os.getenv("JOB_STORE", "sqlite")
+JOB_SQLITE_PATH = os.getenv("JOB_SQLITE_PATH", "jobs.sqlite3")
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_QUEUE_LIMIT = int(os.getenv("JOB_QUEUE_LIMIT", "100"))
+JOB_RESULT_TTL_SECONDS = float(os.getenv("JOB_RESULT_TTL_SECONDS", "86400"))
+JOB_HEARTBEAT_SECONDS = float(os.getenv("JOB_HEARTBEAT_SECONDS", "30"))
+JOB_PROGRESS_INTERVAL_SECONDS = float(os.getenv("JOB_PROGRESS_INTERVAL_SECONDS", "1"))
+
+# Firestore client (app/core/firestore_client.py): gRPC channels, per-RPC deadlines, circuit breaker
+FIRESTORE_CHANNELS = int(os.getenv("FIRESTORE_CHANNELS", "4"))
+FIRESTORE_KEEPALIVE_SECONDS = float(os.getenv("FIRESTORE_KEEPALIVE_SECONDS", "30"))
+FIRESTORE_READ_DEADLINE_SECONDS = float(os.getenv("FIRESTORE_READ_DEADLINE_SECONDS", "5"))
+FIRESTORE_QUERY_DEADLINE_SECONDS = float(os.getenv("FIRESTORE_QUERY_DEADLINE_SECONDS", "15"))
+FIRESTORE_WRITE_DEADLINE_SECONDS = float(os.getenv("FIRESTORE_WRITE_DEADLINE_SECONDS", "10"))
+FIRESTORE_BREAKER_FAILURES = int(os.getenv("FIRESTORE_BREAKER_FAILURES", "5"))
+FIRESTORE_BREAKER_RESET_SECONDS = float(os.getenv("FIRESTORE_BREAKER_RESET_SECONDS", "30"))
+
+# Occupancy history (app/services/occupancy_history_service.py): how long each resolution is kept
+OCCUPANCY_EVENTS_RETENTION_DAYS = float(os.getenv("OCCUPANCY_EVENTS_RETENTION_DAYS", "14"))
+OCCUPANCY_HOURLY_RETENTION_DAYS = float(os.getenv("OCCUPANCY_HOURLY_RETENTION_DAYS", "180"))
+OCCUPANCY_DAILY_RETENTION_DAYS = float(os.getenv("OCCUPANCY_DAILY_RETENTION_DAYS", "1095"))
+OCCUPANCY_HISTORY_MAX_POINTS = int(os.getenv("OCCUPANCY_HISTORY_MAX_POINTS", "2000"))
@@ -0,0 +1,37 @@
+from app.core.pubsub import pubsub, PubSub
+import asyncio
+
+class EventHub:
+    """
+    Occupancy events for websocket clients. Events go out over pubsub and
+    every worker forwards them to its own connections, so a client sees
+    changes made through any worker.
+    """
+    CHANNEL = "events"
+    QUEUE_SIZE = 100
+
+    def __init__(self, broker: PubSub):
+        self.broker = broker
+        self.queues = set()
+        broker.subscribe(self.CHANNEL, self._fan_out)
+
+    async def publish(self, event: dict) -> None:
+        await self.broker.publish(self.CHANNEL, event)
+
+    def connect(self) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=self.QUEUE_SIZE)
+        self.queues.add(queue)
+        return queue
+
+    def disconnect(self, queue: asyncio.Queue) -> None:
+        self.queues.discard(queue)
+
+    async def _fan_out(self, event: dict) -> None:
+        for queue in list(self.queues):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # A stalled client loses events rather than holding up the rest
+                pass
+
+event_hub = EventHub(pubsub)
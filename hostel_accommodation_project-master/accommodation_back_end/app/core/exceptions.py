@@ -0,0 +1,17 @@
+# Domain errors raised by the services. They subclass ValueError so routes
+# that already map ValueError to 400 keep working.
+
+class RoomFullError(ValueError):
+    """The room has no free bed left"""
+
+class RolloverInProgressError(ValueError):
+    """Another run holds the lease on this semester's rollover"""
+
+# Infrastructure errors: not the caller's fault, answered with 503 (see main.py)
+
+class FirestoreUnavailableError(Exception):
+    """Firestore missed its deadline, is unavailable, or the circuit breaker is open"""
+
+    def __init__(self, message: str, retry_after: float = 1.0):
+        super().__init__(message)
+        self.retry_after = retry_after
@@ -1,29 +1,33 @@
 import firebase_admin
 from firebase_admin import credentials, firestore
+import logging
 import os
 
+logger = logging.getLogger(__name__)
+
 # Initialize Firebase Admin SDK
 try:
     cred_path = os.getenv("FIREBASE_CREDENTIALS_PATH", "serviceAccountKey.json")
     if os.path.exists(cred_path):
         cred = credentials.Certificate(cred_path)
         firebase_admin.initialize_app(cred)
-        print("Firebase initialized successfully")
+        logger.info("Firebase initialized")
     else:
         # For development/demo purposes, initialize without credentials
         # This will work for basic operations but won't connect to real Firebase
         firebase_admin.initialize_app()
-        print("Firebase initialized in demo mode (no credentials)")
+        logger.warning("Firebase initialized in demo mode (no credentials at %s)", cred_path)
 except Exception as e:
-    print(f"Firebase initialization error: {e}")
+    logger.exception("Firebase initialization failed")
     # For development, continue without Firebase
     pass
 
-# Get Firestore client
+# Get Firestore client: pooled channels, deadlines and circuit breaker (app/core/firestore_client.py)
 try:
-    db = firestore.client()
+    from app.core.firestore_client import create_client
+    db = create_client(firebase_admin.get_app())
 except Exception as e:
-    print(f"Firestore client error: {e}")
+    logger.error("Firestore client unavailable: %s", e)
     db = None
 
 # Collections
@@ -32,3 +36,13 @@ ROOMS_COLLECTION = "rooms"
 ALLOCATIONS_COLLECTION = "allocations"
 HOSTELS_COLLECTION = "hostels"
 APPLICATIONS_COLLECTION = "applications"
+ALLOCATION_ARCHIVES_COLLECTION = "allocation_archives"
+ROLLOVER_CHECKPOINTS_COLLECTION = "rollover_checkpoints"
+WAITLIST_COLLECTION = "waitlist"
+ALLOCATIONS_INDEX_COLLECTION = "allocations_index"
+JOBS_COLLECTION = "jobs"
+OCCUPANCY_EVENTS_COLLECTION = "occupancy_events"
+OCCUPANCY_BUCKETS_COLLECTION = "occupancy_buckets"
+
+# Subcollections
+ROOM_ROSTER_SUBCOLLECTION = "roster"  # rooms/{roomId}/roster/{allocationId}
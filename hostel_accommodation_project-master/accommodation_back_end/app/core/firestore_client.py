@@ -0,0 +1,267 @@
+"""
+Firestore client with a pool of gRPC channels, per-RPC deadlines and a
+circuit breaker.
+
+create_client() builds app.core.firebase.db. It opens FIRESTORE_CHANNELS
+gRPC channels with keepalive and hands RPCs to them round-robin; collection
+and document references share the one client, so repositories that bind
+db.collection(...) at construction still spread their calls over every
+channel.
+
+Every RPC runs under a deadline for its kind (FIRESTORE_READ_, _QUERY_ and
+_WRITE_DEADLINE_SECONDS), the client's retries of transient errors
+included, unless the caller passes its own timeout. An RPC that misses its
+deadline or finds Firestore unavailable counts against the circuit
+breaker: after FIRESTORE_BREAKER_FAILURES such failures in a row it opens,
+and for FIRESTORE_BREAKER_RESET_SECONDS calls fail at once instead of each
+waiting out its deadline. Then one probe call is let through; its outcome
+closes the breaker or opens it again. Either way the caller gets
+FirestoreUnavailableError, which the app answers with 503 and Retry-After.
+
+The benchmarks' MemoryFirestore runs its simulated round trips through the
+same guard and can inject faults (FaultPlan), so all of this can be
+exercised without Firestore: benchmarks/bench_firestore_faults.py.
+"""
+from app.core.config import (
+    FIRESTORE_BREAKER_FAILURES, FIRESTORE_BREAKER_RESET_SECONDS, FIRESTORE_CHANNELS, FIRESTORE_KEEPALIVE_SECONDS,
+    FIRESTORE_QUERY_DEADLINE_SECONDS, FIRESTORE_READ_DEADLINE_SECONDS, FIRESTORE_WRITE_DEADLINE_SECONDS
+)
+from app.core.exceptions import FirestoreUnavailableError
+from google.api_core import exceptions, retry as retries
+from google.cloud import firestore
+from fastapi.responses import JSONResponse
+import itertools
+import logging
+import math
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+READ_RPCS = ["batch_get_documents", "get_document", "list_documents", "list_collection_ids"]
+QUERY_RPCS = ["run_query", "run_aggregation_query", "partition_query"]
+WRITE_RPCS = ["commit", "begin_transaction", "rollback", "batch_write", "create_document", "update_document", "delete_document"]
+STREAMING_RPCS = {"batch_get_documents", "run_query", "run_aggregation_query"}
+
+# Errors that say Firestore is slow or down, as opposed to a bad request
+UNAVAILABLE_ERRORS = (exceptions.DeadlineExceeded, exceptions.ServiceUnavailable, exceptions.RetryError)
+
+def default_deadlines() -> dict:
+    deadlines = {rpc: FIRESTORE_READ_DEADLINE_SECONDS for rpc in READ_RPCS}
+    deadlines.update({rpc: FIRESTORE_QUERY_DEADLINE_SECONDS for rpc in QUERY_RPCS})
+    deadlines.update({rpc: FIRESTORE_WRITE_DEADLINE_SECONDS for rpc in WRITE_RPCS})
+    return deadlines
+
+class CircuitBreaker:
+    """
+    Closed, open after `failures` consecutive failures, half-open (one
+    probe at a time) once `reset_seconds` have passed. Shared by threads.
+    """
+
+    def __init__(self, failures: int = FIRESTORE_BREAKER_FAILURES, reset_seconds: float = FIRESTORE_BREAKER_RESET_SECONDS):
+        self.threshold = failures
+        self.reset_seconds = reset_seconds
+        self.lock = threading.Lock()
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+        self.stats = {"opened": 0, "rejected": 0}
+
+    def _state(self, now: float) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "open" if now - self.opened_at < self.reset_seconds else "half_open"
+
+    @property
+    def state(self) -> str:
+        with self.lock:
+            return self._state(time.monotonic())
+
+    def allow(self, rpc: str) -> None:
+        """
+        Raise FirestoreUnavailableError unless a call may go out now
+        """
+        with self.lock:
+            now = time.monotonic()
+            state = self._state(now)
+            if state == "closed":
+                return
+            if state == "half_open" and not self.probing:
+                self.probing = True
+                return
+            self.stats["rejected"] += 1
+        raise FirestoreUnavailableError(f"Firestore is unavailable (circuit open, {rpc} not sent)", self.retry_after())
+
+    def retry_after(self) -> float:
+        with self.lock:
+            if self.opened_at is None:
+                return 1.0
+            return max(self.reset_seconds - (time.monotonic() - self.opened_at), 1.0)
+
+    def success(self) -> None:
+        with self.lock:
+            if self.opened_at is not None:
+                logger.info("Firestore circuit closed")
+            self.failures = 0
+            self.opened_at = None
+            self.probing = False
+
+    def failure(self) -> None:
+        with self.lock:
+            self.failures += 1
+            if self.probing or (self.opened_at is None and self.failures >= self.threshold):
+                if self.opened_at is None:
+                    self.stats["opened"] += 1
+                    logger.warning("Firestore circuit opened after %d failed calls", self.failures)
+                self.opened_at = time.monotonic()
+            self.probing = False
+
+    def release(self) -> None:
+        with self.lock:
+            self.probing = False
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            return {"state": self._state(time.monotonic()), "consecutiveFailures": self.failures, **self.stats}
+
+class FirestoreGuard:
+    """
+    Applies deadlines to RPCs and reports their outcome to the breaker
+    """
+
+    def __init__(self, breaker: CircuitBreaker = None, deadlines: dict = None):
+        self.breaker = breaker or CircuitBreaker()
+        self.deadlines = deadlines or default_deadlines()
+
+    def _with_deadline(self, rpc: str, kwargs: dict) -> dict:
+        deadline = self.deadlines.get(rpc)
+        if deadline is None or kwargs.get("timeout") is not None:
+            return kwargs
+        # Retry transient errors only within the deadline; a timed out attempt is not retried
+        retry = kwargs.get("retry")
+        if not isinstance(retry, retries.Retry):
+            retry = retries.Retry(
+                predicate=retries.if_exception_type(exceptions.ServiceUnavailable, exceptions.InternalServerError),
+                initial=0.1, maximum=1.0, multiplier=2.0, deadline=deadline
+            )
+        return {**kwargs, "timeout": deadline, "retry": retry}
+
+    def _failed(self, rpc: str, error: Exception) -> FirestoreUnavailableError:
+        self.breaker.failure()
+        if isinstance(error, exceptions.DeadlineExceeded):
+            message = f"Firestore did not answer {rpc} within {self.deadlines.get(rpc)} s"
+        else:
+            message = f"Firestore is unavailable ({rpc}: {error})"
+        return FirestoreUnavailableError(message, retry_after=self.breaker.retry_after())
+
+    def call(self, rpc: str, method, *args, **kwargs):
+        """
+        Unary call: done when method returns
+        """
+        result = self._send(rpc, method, args, kwargs)
+        self.breaker.success()
+        return result
+
+    def stream(self, rpc: str, method, *args, **kwargs):
+        """
+        Server-streaming call: done when the responses are read
+        """
+        return self._read(rpc, self._send(rpc, method, args, kwargs))
+
+    def _send(self, rpc: str, method, args: tuple, kwargs: dict):
+        self.breaker.allow(rpc)
+        try:
+            return method(*args, **self._with_deadline(rpc, kwargs))
+        except UNAVAILABLE_ERRORS as e:
+            raise self._failed(rpc, e) from e
+        except exceptions.GoogleAPICallError:
+            # Firestore answered, if not with what the caller hoped for
+            self.breaker.success()
+            raise
+        except BaseException:
+            # Not Firestore's doing; let another call probe
+            self.breaker.release()
+            raise
+
+    def _read(self, rpc: str, responses):
+        # Streaming RPCs fail (or time out) while being read, not when called
+        answered = None
+        try:
+            yield from responses
+            answered = True
+        except UNAVAILABLE_ERRORS as e:
+            answered = False
+            raise self._failed(rpc, e) from e
+        except exceptions.GoogleAPICallError:
+            answered = True
+            raise
+        finally:
+            if answered:
+                self.breaker.success()
+            elif answered is None:
+                # Abandoned part way, or failed on our side
+                self.breaker.release()
+
+firestore_guard = FirestoreGuard()
+
+def _guard_api(api, guard: FirestoreGuard):
+    for rpc in guard.deadlines:
+        method = getattr(api, rpc, None)
+        if method is not None:
+            send = guard.stream if rpc in STREAMING_RPCS else guard.call
+            setattr(api, rpc, lambda *args, _rpc=rpc, _method=method, _send=send, **kwargs: _send(_rpc, _method, *args, **kwargs))
+    return api
+
+class PooledClient(firestore.Client):
+    """
+    firestore.Client whose RPCs go round-robin over several guarded gRPC channels
+    """
+
+    def __init__(self, *args, channels: int = FIRESTORE_CHANNELS, keepalive: float = FIRESTORE_KEEPALIVE_SECONDS,
+                 guard: FirestoreGuard = firestore_guard, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.channels = max(channels, 1)
+        self.guard = guard
+        self.channel_options = [
+            ("grpc.keepalive_time_ms", int(keepalive * 1000)),
+            ("grpc.keepalive_timeout_ms", 10000),
+            ("grpc.max_send_message_length", -1),
+            ("grpc.max_receive_message_length", -1),
+            # Otherwise channels with the same target and options share one connection
+            ("grpc.use_local_subchannel_pool", 1),
+        ]
+        self.apis = None
+        self.apis_lock = threading.Lock()
+
+    def _new_api(self):
+        from google.cloud.firestore_v1.services.firestore.client import FirestoreClient
+        from google.cloud.firestore_v1.services.firestore.transports.grpc import FirestoreGrpcTransport
+        channel = FirestoreGrpcTransport.create_channel(self._target, credentials=self._credentials, options=self.channel_options)
+        transport = FirestoreGrpcTransport(host=self._target, channel=channel)
+        return FirestoreClient(transport=transport, client_options=self._client_options)
+
+    @property
+    def _firestore_api(self):
+        if self.apis is None:
+            with self.apis_lock:
+                if self.apis is None:
+                    if self._emulator_host is not None:
+                        # The stock client knows how to authenticate to the emulator; one channel is plenty
+                        apis = [_guard_api(super()._firestore_api, self.guard)]
+                    else:
+                        apis = [_guard_api(self._new_api(), self.guard) for _ in range(self.channels)]
+                    self.apis = itertools.cycle(apis)
+        return next(self.apis)
+
+def create_client(app) -> PooledClient:
+    """
+    The app's Firestore client, with the credentials and project of a firebase_admin App
+    """
+    return PooledClient(credentials=app.credential.get_credential(), project=app.project_id)
+
+async def firestore_unavailable_handler(request, exc: FirestoreUnavailableError) -> JSONResponse:
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(math.ceil(exc.retry_after))}
+    )
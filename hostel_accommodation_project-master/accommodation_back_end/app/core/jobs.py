@@ -0,0 +1,414 @@
+"""
+Background jobs for long-running admin operations.
+
+A route submits a job instead of doing the work in the request and answers
+with the job record; GET /api/jobs/{id} reports its status and progress.
+JobRunner keeps a bounded queue per worker process and runs at most
+JOB_WORKERS jobs at a time, each on its own thread and event loop: the
+services call the synchronous Firestore client, so running them on the
+app's loop would stall every other request for the length of the job.
+
+Job records are persisted in a JobStore, chosen by JOB_STORE:
+- sqlite:    a local database file (JOB_SQLITE_PATH), for development and
+             single-host deployments
+- firestore: the jobs collection, for production (set a TTL policy on
+             expireAt so expired records are purged server-side too)
+
+Cancellation is cooperative. DELETE /api/jobs/{id} marks the record and the
+job stops at its next progress report by raising JobCancelled, so it is
+never interrupted between a write and the bookkeeping that follows it. The
+flag is read from the store, so a job can be cancelled through any worker.
+
+Finished records are kept for JOB_RESULT_TTL_SECONDS. Each worker
+heartbeats the jobs it holds; queued or running jobs whose worker stopped
+heartbeating (crashed or redeployed) are marked failed by the next sweep.
+"""
+from app.core.config import (
+    JOB_HEARTBEAT_SECONDS, JOB_PROGRESS_INTERVAL_SECONDS, JOB_QUEUE_LIMIT, JOB_RESULT_TTL_SECONDS,
+    JOB_SQLITE_PATH, JOB_STORE, JOB_WORKERS
+)
+from app.core.firebase import JOBS_COLLECTION
+from app.core.structured_logging import log_context
+from app.utils.concurrency import run_blocking
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, List, Optional
+import asyncio
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+QUEUED, RUNNING, SUCCEEDED, FAILED, CANCELLED = "queued", "running", "succeeded", "failed", "cancelled"
+ACTIVE_STATUSES = [QUEUED, RUNNING]
+
+# Firestore documents are capped at 1 MiB; larger results are replaced by a note
+MAX_RESULT_BYTES = 900_000
+
+class JobCancelled(Exception):
+    """Raised inside a job at a progress report once cancellation was requested"""
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+def _encode(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+def _epoch(value) -> Optional[float]:
+    # Records read back from SQLite hold ISO strings, fresh ones datetimes
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return value.timestamp() if isinstance(value, datetime) else None
+
+class JobStore:
+    """
+    Persistence for job records. Methods are async and call a synchronous
+    client, like the repositories.
+    """
+
+    async def create(self, job: dict) -> None:
+        raise NotImplementedError
+
+    async def update(self, job_id: str, fields: dict) -> None:
+        raise NotImplementedError
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        raise NotImplementedError
+
+    async def list(self, limit: int = 50) -> List[dict]:
+        """Newest first"""
+        raise NotImplementedError
+
+    async def stale(self, before: datetime) -> List[dict]:
+        """Queued or running jobs last heartbeated before `before`"""
+        raise NotImplementedError
+
+    async def purge(self, now: datetime) -> int:
+        """Delete expired records; returns how many"""
+        raise NotImplementedError
+
+class SQLiteJobStore(JobStore):
+    """
+    Local store: one row per job, the record as JSON next to the columns
+    queried on. Worker processes on one host can share the file (WAL mode).
+    """
+
+    def __init__(self, path: str = JOB_SQLITE_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, timeout=10, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs (id TEXT PRIMARY KEY, status TEXT NOT NULL, created_at REAL, "
+            "heartbeat_at REAL, expire_at REAL, data TEXT NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS jobs_created_at ON jobs (created_at)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS jobs_expire_at ON jobs (expire_at)")
+
+    def _write(self, job: dict) -> None:
+        self.conn.execute(
+            "INSERT OR REPLACE INTO jobs (id, status, created_at, heartbeat_at, expire_at, data) VALUES (?, ?, ?, ?, ?, ?)",
+            (job["id"], job["status"], _epoch(job.get("createdAt")), _epoch(job.get("heartbeatAt")),
+             _epoch(job.get("expireAt")), json.dumps(job, default=_encode))
+        )
+
+    async def create(self, job: dict) -> None:
+        with self.lock:
+            self._write(job)
+
+    async def update(self, job_id: str, fields: dict) -> None:
+        with self.lock:
+            # Read-modify-write under an immediate transaction: other processes may share the file
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self.conn.execute("SELECT data FROM jobs WHERE id = ?", (job_id,)).fetchone()
+                if row is not None:
+                    self._write({**json.loads(row[0]), **fields})
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        with self.lock:
+            row = self.conn.execute("SELECT data FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    async def list(self, limit: int = 50) -> List[dict]:
+        with self.lock:
+            rows = self.conn.execute("SELECT data FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    async def stale(self, before: datetime) -> List[dict]:
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT data FROM jobs WHERE status IN (?, ?) AND heartbeat_at < ?", (*ACTIVE_STATUSES, before.timestamp())
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    async def purge(self, now: datetime) -> int:
+        with self.lock:
+            return self.conn.execute("DELETE FROM jobs WHERE expire_at < ?", (now.timestamp(),)).rowcount
+
+class FirestoreJobStore(JobStore):
+    """
+    Production store over the jobs collection. stale() needs a composite
+    index on (status, heartbeatAt).
+    """
+
+    @property
+    def collection(self):
+        from app.core.firebase import db
+        return db.collection(JOBS_COLLECTION)
+
+    async def create(self, job: dict) -> None:
+        await run_blocking(self.collection.document(job["id"]).set, job)
+
+    async def update(self, job_id: str, fields: dict) -> None:
+        await run_blocking(self.collection.document(job_id).update, fields)
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        doc = await run_blocking(self.collection.document(job_id).get)
+        return doc.to_dict() if doc.exists else None
+
+    async def list(self, limit: int = 50) -> List[dict]:
+        docs = await run_blocking(self.collection.order_by("createdAt", direction="DESCENDING").limit(limit).get)
+        return [doc.to_dict() for doc in docs]
+
+    async def stale(self, before: datetime) -> List[dict]:
+        docs = await run_blocking(self.collection.where("status", "in", ACTIVE_STATUSES).where("heartbeatAt", "<", before).get)
+        return [doc.to_dict() for doc in docs]
+
+    async def purge(self, now: datetime) -> int:
+        from app.core.firebase import db
+        docs = await run_blocking(self.collection.where("expireAt", "<", now).limit(500).get)
+        if docs:
+            batch = db.batch()
+            for doc in docs:
+                batch.delete(doc.reference)
+            await run_blocking(batch.commit)
+        return len(docs)
+
+def create_job_store(backend: str = JOB_STORE) -> JobStore:
+    backends = {"sqlite": SQLiteJobStore, "firestore": FirestoreJobStore}
+    if backend not in backends:
+        raise ValueError(f"Unknown JOB_STORE {backend!r}; expected one of {', '.join(backends)}")
+    return backends[backend]()
+
+class JobContext:
+    """
+    Handed to a running job: reports progress and raises JobCancelled once
+    cancellation was requested. Store writes are throttled to one per
+    JOB_PROGRESS_INTERVAL_SECONDS.
+    """
+
+    def __init__(self, store: JobStore, job: dict, interval: float = JOB_PROGRESS_INTERVAL_SECONDS):
+        self.store = store
+        self.id = job["id"]
+        self.kind = job["kind"]
+        self.params = job.get("params") or {}
+        self.created_by = job.get("createdBy")
+        self.interval = interval
+        self.cancel_requested = threading.Event()
+        self.last_write = 0.0
+
+    async def progress(self, done: int, total: int = None, message: str = None) -> None:
+        cancelled = self.cancel_requested.is_set()
+        if not cancelled and time.monotonic() - self.last_write < self.interval:
+            return
+        self.last_write = time.monotonic()
+        await self.store.update(self.id, {
+            "progress": {"done": done, "total": total, "message": message},
+            "heartbeatAt": _now(),
+        })
+        if not cancelled:
+            # Cancellation may have been requested through another worker
+            job = await self.store.get(self.id)
+            cancelled = bool(job and job.get("cancelRequested"))
+        if cancelled:
+            self.cancel_requested.set()
+            raise JobCancelled()
+
+JobHandler = Callable[[JobContext], Awaitable[dict]]
+
+class JobRunner:
+    def __init__(self, store: JobStore = None, workers: int = JOB_WORKERS, queue_limit: int = JOB_QUEUE_LIMIT,
+                 ttl: float = JOB_RESULT_TTL_SECONDS, heartbeat: float = JOB_HEARTBEAT_SECONDS):
+        self.store = store or create_job_store()
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self.ttl = timedelta(seconds=ttl)
+        self.heartbeat = heartbeat
+        self.handlers: Dict[str, JobHandler] = {}
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.queue = None
+        self.tasks = []
+        self.held = set()     # ids queued or running on this worker
+        self.running: Dict[str, JobContext] = {}
+        self.stopping = False
+
+    def register(self, kind: str, handler: JobHandler) -> None:
+        self.handlers[kind] = handler
+
+    async def start(self) -> None:
+        if self.queue is not None:
+            return
+        self.stopping = False
+        self.queue = asyncio.Queue(maxsize=self.queue_limit)
+        self.tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+        self.tasks.append(asyncio.create_task(self._housekeeping()))
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """
+        Ask running jobs to stop, fail the queued ones, and wait up to
+        `timeout` for the running ones to reach a progress report
+        """
+        if self.queue is None:
+            return
+        self.stopping = True
+        for context in self.running.values():
+            context.cancel_requested.set()
+        for job_id in self.held - set(self.running):
+            await self._finish(job_id, FAILED, error="Worker shut down before the job started")
+        deadline = time.monotonic() + timeout
+        while self.running and time.monotonic() < deadline:
+            await asyncio.sleep(0.1)
+        for task in self.tasks:
+            task.cancel()
+        self.queue = None
+        self.tasks = []
+
+    async def submit(self, kind: str, params: dict = None, created_by: str = None) -> dict:
+        """
+        Persist and enqueue a job; raises asyncio.QueueFull when this worker's queue is full
+        """
+        if kind not in self.handlers:
+            raise ValueError(f"Unknown job kind {kind!r}")
+        if self.queue is None:
+            raise RuntimeError("Job runner is not started")
+        if self.queue.full():
+            raise asyncio.QueueFull()
+        now = _now()
+        job = {
+            "id": uuid.uuid4().hex,
+            "kind": kind,
+            "status": QUEUED,
+            "params": params or {},
+            "progress": {"done": 0, "total": None, "message": None},
+            "result": None,
+            "error": None,
+            "createdBy": created_by,
+            "createdAt": now,
+            "startedAt": None,
+            "finishedAt": None,
+            "heartbeatAt": now,
+            "expireAt": None,
+            "cancelRequested": False,
+            "worker": self.worker_id,
+        }
+        await self.store.create(job)
+        self.held.add(job["id"])
+        self.queue.put_nowait(job["id"])
+        logger.info("job %s queued", kind, extra={"jobId": job["id"]})
+        return job
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        job = await self.store.get(job_id)
+        # The store may not have purged it yet
+        if job is None or (job.get("expireAt") and _epoch(job["expireAt"]) < time.time()):
+            return None
+        return job
+
+    async def list(self, limit: int = 50) -> List[dict]:
+        now = time.time()
+        return [job for job in await self.store.list(limit) if not job.get("expireAt") or _epoch(job["expireAt"]) >= now]
+
+    async def cancel(self, job_id: str) -> Optional[dict]:
+        """
+        Request cancellation. A queued job is cancelled at once, a running
+        one at its next progress report; finished jobs are left as they are.
+        """
+        job = await self.get(job_id)
+        if job is None or job["status"] not in ACTIVE_STATUSES:
+            return job
+        await self.store.update(job_id, {"cancelRequested": True})
+        if job_id in self.running:
+            self.running[job_id].cancel_requested.set()
+        elif job["status"] == QUEUED:
+            # Skipped when a worker dequeues it
+            await self._finish(job_id, CANCELLED)
+        return await self.store.get(job_id)
+
+    async def _work(self) -> None:
+        while True:
+            job_id = await self.queue.get()
+            try:
+                await self._run(job_id)
+            except Exception:
+                logger.exception("job bookkeeping failed", extra={"jobId": job_id})
+            finally:
+                self.held.discard(job_id)
+
+    async def _run(self, job_id: str) -> None:
+        job = await self.store.get(job_id)
+        if job is None or job["status"] != QUEUED:
+            return
+        context = JobContext(self.store, job)
+        self.running[job_id] = context
+        try:
+            await self.store.update(job_id, {"status": RUNNING, "startedAt": _now(), "heartbeatAt": _now()})
+            # On a thread with its own loop: the services block on Firestore calls
+            result = await asyncio.to_thread(asyncio.run, self._call(context))
+            await self._finish(job_id, SUCCEEDED, result=result)
+        except JobCancelled:
+            await self._finish(job_id, CANCELLED, error="Worker shut down" if self.stopping else None)
+        except Exception as e:
+            logger.exception("job %s failed", job["kind"], extra={"jobId": job_id})
+            await self._finish(job_id, FAILED, error=str(e) or type(e).__name__)
+        finally:
+            self.running.pop(job_id, None)
+
+    async def _call(self, context: JobContext) -> dict:
+        with log_context(jobId=context.id, jobKind=context.kind, uid=context.created_by):
+            started = time.perf_counter()
+            result = await self.handlers[context.kind](context)
+            logger.info("job %s finished in %.1f s", context.kind, time.perf_counter() - started)
+            return result
+
+    async def _finish(self, job_id: str, status: str, result: dict = None, error: str = None) -> None:
+        if result is not None:
+            size = len(json.dumps(result, default=_encode))
+            if size > MAX_RESULT_BYTES:
+                result = {"truncated": True, "bytes": size}
+        now = _now()
+        await self.store.update(job_id, {
+            "status": status,
+            "result": result,
+            "error": error,
+            "finishedAt": now,
+            "expireAt": now + self.ttl,
+        })
+
+    async def _housekeeping(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat)
+            try:
+                now = _now()
+                for job_id in list(self.held):
+                    await self.store.update(job_id, {"heartbeatAt": now})
+                for job in await self.store.stale(now - 3 * timedelta(seconds=self.heartbeat)):
+                    if job["id"] not in self.held:
+                        logger.warning("job %s lost its worker %s", job["kind"], job.get("worker"), extra={"jobId": job["id"]})
+                        await self._finish(job["id"], FAILED, error=f"Worker {job.get('worker')} stopped before the job finished")
+                purged = await self.store.purge(now)
+                if purged:
+                    logger.info("purged %d expired jobs", purged)
+            except Exception:
+                logger.exception("job housekeeping failed")
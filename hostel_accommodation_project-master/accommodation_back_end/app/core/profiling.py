@@ -0,0 +1,230 @@
+"""
+Request profiling for admins, and automatic capture of slow requests.
+
+Every HTTP request gets a RequestTrace that counts and times its Firestore
+RPCs (instrument_firestore() wraps the GAPIC client methods once at
+startup). A request slower than SLOW_REQUEST_MS is logged with that
+breakdown and kept in the ring buffer.
+
+An admin can ask for a full cProfile of a request with the header
+"X-Profile: 1" or the query flag "?profile=1". The profile is stored in
+the same ring buffer and its id returned in the X-Profile-Id response
+header; GET /api/admin/profiles/{id} shows it. cProfile follows the event
+loop thread only: Firestore calls handed to worker threads (run_blocking)
+show up as time spent waiting, and other requests running on the loop at
+the same time appear in the profile too. One request per worker is profiled at a time.
+
+The buffer is per worker process; entries note the pid that recorded them.
+"""
+from app.core.config import PROFILE_BUFFER_SIZE, PROFILE_TOP_FUNCTIONS, SLOW_REQUEST_MS
+from app.core.structured_logging import request_id
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import List, Optional
+from urllib.parse import parse_qs
+import cProfile
+import io
+import logging
+import os
+import pstats
+import threading
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_ID_HEADER = b"x-profile-id"
+
+# RPCs of google.cloud.firestore_v1's generated client, i.e. one per round trip
+FIRESTORE_RPCS = [
+    "batch_get_documents", "run_query", "run_aggregation_query", "commit", "begin_transaction",
+    "rollback", "batch_write", "get_document", "create_document", "update_document",
+    "delete_document", "list_documents", "list_collection_ids",
+]
+STREAMING_RPCS = {"batch_get_documents", "run_query", "run_aggregation_query"}
+
+_current_trace = ContextVar("request_trace", default=None)
+
+class RequestTrace:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.firestore = {}
+
+    def add(self, rpc: str, seconds: float) -> None:
+        # run_blocking threads share the request's trace
+        with self.lock:
+            entry = self.firestore.setdefault(rpc, {"calls": 0, "ms": 0.0})
+            entry["calls"] += 1
+            entry["ms"] += seconds * 1000
+
+    def breakdown(self) -> dict:
+        with self.lock:
+            return {rpc: {"calls": e["calls"], "ms": round(e["ms"], 2)} for rpc, e in self.firestore.items()}
+
+@contextmanager
+def firestore_rpc(rpc: str):
+    """
+    Time one Firestore round trip against the current request's trace
+    """
+    trace = _current_trace.get()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        if trace is not None:
+            trace.add(rpc, time.perf_counter() - started)
+
+def _timed_stream(trace: RequestTrace, rpc: str, started: float, responses):
+    # Streaming RPCs spend most of their time in iteration, not in the call
+    try:
+        yield from responses
+    finally:
+        trace.add(rpc, time.perf_counter() - started)
+
+def _wrap_rpc(rpc: str, method):
+    def wrapper(*args, **kwargs):
+        trace = _current_trace.get()
+        if trace is None:
+            return method(*args, **kwargs)
+        started = time.perf_counter()
+        if rpc in STREAMING_RPCS:
+            return _timed_stream(trace, rpc, started, method(*args, **kwargs))
+        try:
+            return method(*args, **kwargs)
+        finally:
+            trace.add(rpc, time.perf_counter() - started)
+    wrapper.__wrapped__ = method
+    return wrapper
+
+def instrument_firestore() -> None:
+    """
+    Wrap the Firestore GAPIC client so each RPC is recorded on the current trace (idempotent)
+    """
+    from google.cloud.firestore_v1.services.firestore.client import FirestoreClient
+    for rpc in FIRESTORE_RPCS:
+        method = getattr(FirestoreClient, rpc, None)
+        if method is not None and not hasattr(method, "__wrapped__"):
+            setattr(FirestoreClient, rpc, _wrap_rpc(rpc, method))
+
+class ProfileStore:
+    """
+    Bounded ring buffer of captured profiles and slow requests; oldest entries drop off
+    """
+
+    def __init__(self, size: int = PROFILE_BUFFER_SIZE):
+        self.entries = deque(maxlen=size)
+
+    def add(self, entry: dict) -> None:
+        self.entries.append(entry)
+
+    def list(self) -> List[dict]:
+        # Newest first, without the (large) profile text
+        return [{k: v for k, v in entry.items() if k != "profile"} for entry in reversed(self.entries)]
+
+    def get(self, profile_id: str) -> Optional[dict]:
+        return next((entry for entry in self.entries if entry["id"] == profile_id), None)
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+profile_store = ProfileStore()
+
+def _is_admin_request(scope) -> bool:
+    from app.core.security import verify_token, is_admin
+    from fastapi import HTTPException
+    authorization = dict(scope["headers"]).get(b"authorization", b"").decode("latin-1")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+    try:
+        # Admin role comes from the custom claims synced on role changes
+        return is_admin(verify_token(token))
+    except HTTPException:
+        return False
+
+def _wants_profile(scope) -> bool:
+    if dict(scope["headers"]).get(PROFILE_HEADER, b"").lower() in (b"1", b"true"):
+        return True
+    flags = parse_qs(scope.get("query_string", b"").decode("latin-1")).get("profile", [])
+    return any(flag.lower() in ("1", "true") for flag in flags)
+
+def _profile_text(profiler: cProfile.Profile) -> str:
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(PROFILE_TOP_FUNCTIONS)
+    return out.getvalue()
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware: per-request Firestore tracing, slow-request capture and
+    on-demand cProfile for admins
+    """
+
+    def __init__(self, app, slow_ms: float = SLOW_REQUEST_MS, store: ProfileStore = profile_store):
+        self.app = app
+        self.slow_ms = slow_ms
+        self.store = store
+        self.profiling = threading.Lock()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profiler = None
+        profile_id = uuid.uuid4().hex[:12]
+        if _wants_profile(scope) and _is_admin_request(scope) and self.profiling.acquire(blocking=False):
+            profiler = cProfile.Profile()
+        response_status = []
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                response_status.append(message["status"])
+                if profiler is not None:
+                    message = {**message, "headers": list(message.get("headers", [])) + [(PROFILE_ID_HEADER, profile_id.encode())]}
+            await send(message)
+
+        trace = RequestTrace()
+        token = _current_trace.set(trace)
+        started = time.perf_counter()
+        try:
+            if profiler is not None:
+                profiler.enable()
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                self.profiling.release()
+            _current_trace.reset(token)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            slow = elapsed_ms >= self.slow_ms
+            if profiler is not None or slow:
+                self._record(profile_id, scope, response_status, elapsed_ms, trace, profiler, slow)
+
+    def _record(self, profile_id, scope, response_status, elapsed_ms, trace, profiler, slow) -> None:
+        breakdown = trace.breakdown()
+        entry = {
+            "id": profile_id,
+            "kind": "profile" if profiler is not None else "slow",
+            "method": scope["method"],
+            "path": scope["path"],
+            "requestId": request_id(),
+            "status": response_status[0] if response_status else None,
+            "durationMs": round(elapsed_ms, 2),
+            "firestore": breakdown,
+            "firestoreCalls": sum(e["calls"] for e in breakdown.values()),
+            "firestoreMs": round(sum(e["ms"] for e in breakdown.values()), 2),
+            "pid": os.getpid(),
+            "recordedAt": datetime.now(timezone.utc).isoformat(),
+        }
+        if profiler is not None:
+            entry["profile"] = _profile_text(profiler)
+        self.store.add(entry)
+        if slow:
+            logger.warning(
+                "slow request %s %s: %.0f ms, %d Firestore calls (%.0f ms)",
+                entry["method"], entry["path"], elapsed_ms, entry["firestoreCalls"], entry["firestoreMs"],
+                extra={"profileId": profile_id, "durationMs": entry["durationMs"], "firestore": breakdown}
+            )
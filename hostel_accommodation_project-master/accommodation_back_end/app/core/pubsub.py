@@ -0,0 +1,193 @@
+"""
+Broadcast of small JSON messages to every worker process.
+
+In-process state (the read cache, waitlist queues, websocket subscribers)
+lives once per worker. Anything that changes it is published here and
+applied by each worker's handler, including the publisher's own, so all
+workers converge without sticky routing.
+
+Backends, chosen by PUBSUB_BACKEND:
+- local:     one process; handlers are called directly (also used by tests)
+- unix:      workers on one host; each binds a datagram socket in
+             PUBSUB_SOCKET_DIR and publishing sends to every socket there
+- firestore: workers on several hosts; messages are documents in
+             pubsub_messages, delivered through a snapshot listener
+             (set a TTL policy on expireAt to purge them)
+"""
+from app.core.config import PUBSUB_BACKEND, PUBSUB_SOCKET_DIR
+from app.utils.concurrency import run_blocking
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable
+import asyncio
+import glob
+import json
+import logging
+import os
+import socket
+import uuid
+
+logger = logging.getLogger(__name__)
+
+PUBSUB_COLLECTION = "pubsub_messages"
+
+def _encode(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+class PubSub:
+    def __init__(self):
+        self.origin = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.handlers = defaultdict(list)
+        self.loop = None
+
+    def subscribe(self, channel: str, handler: Callable[[dict], Awaitable[None]]) -> None:
+        self.handlers[channel].append(handler)
+
+    async def start(self) -> None:
+        self.loop = asyncio.get_running_loop()
+
+    async def stop(self) -> None:
+        pass
+
+    async def publish(self, channel: str, data: dict) -> None:
+        """
+        Deliver to this worker's handlers, then to every other worker.
+        Local handlers see the same JSON-decoded payload remote ones do.
+        """
+        raw = json.dumps({"channel": channel, "origin": self.origin, "data": data}, default=_encode)
+        message = json.loads(raw)
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if self.loop is None or running is self.loop:
+            await self._dispatch(message)
+        else:
+            # Published from a background job's own loop (app/core/jobs.py): hand over to the app loop
+            self.loop.call_soon_threadsafe(lambda: self.loop.create_task(self._dispatch(message)))
+        await self._send(raw.encode("utf-8"))
+
+    async def _send(self, raw: bytes) -> None:
+        pass
+
+    async def _dispatch(self, message: dict) -> None:
+        for handler in self.handlers.get(message["channel"], []):
+            try:
+                await handler(message["data"])
+            except Exception:
+                logger.exception("pubsub handler failed on %s", message["channel"])
+
+    def _receive(self, raw) -> None:
+        message = json.loads(raw) if isinstance(raw, (bytes, str)) else raw
+        if message.get("origin") == self.origin or self.loop is None:
+            return
+        self.loop.call_soon_threadsafe(lambda: self.loop.create_task(self._dispatch(message)))
+
+class LocalPubSub(PubSub):
+    """
+    Single-process backend: publish only reaches this process's handlers
+    """
+
+class UnixSocketPubSub(PubSub):
+    """
+    Same-host backend without a broker: one datagram socket per worker in a
+    shared directory. Sockets of dead workers are unlinked when a send is refused.
+    """
+
+    def __init__(self, directory: str = PUBSUB_SOCKET_DIR):
+        super().__init__()
+        self.directory = directory
+        self.path = os.path.join(directory, f"{os.getpid()}-{uuid.uuid4().hex[:8]}.sock")
+        self.sock = None
+        self.sender = None
+
+    async def start(self) -> None:
+        await super().start()
+        os.makedirs(self.directory, exist_ok=True)
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self.sock.bind(self.path)
+        self.sock.setblocking(False)
+        self.sender = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self.sender.setblocking(False)
+        self.loop.add_reader(self.sock.fileno(), self._on_readable)
+
+    async def stop(self) -> None:
+        if self.sock is None:
+            return
+        self.loop.remove_reader(self.sock.fileno())
+        self.sock.close()
+        self.sender.close()
+        self.sock = self.sender = None
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    def _on_readable(self) -> None:
+        while True:
+            try:
+                raw = self.sock.recv(65536)
+            except (BlockingIOError, InterruptedError):
+                return
+            self._receive(raw)
+
+    async def _send(self, raw: bytes) -> None:
+        if self.sender is None:
+            return
+        for peer in glob.glob(os.path.join(self.directory, "*.sock")):
+            if peer == self.path:
+                continue
+            try:
+                self.sender.sendto(raw, peer)
+            except (ConnectionRefusedError, FileNotFoundError):
+                # Worker exited without cleaning up
+                try:
+                    os.unlink(peer)
+                except FileNotFoundError:
+                    pass
+            except BlockingIOError:
+                # Peer is not keeping up; the read cache TTL bounds what it misses
+                logger.warning("pubsub peer %s is full, dropping message", peer)
+
+class FirestorePubSub(PubSub):
+    """
+    Multi-host backend over a Firestore collection and snapshot listener
+    """
+
+    def __init__(self, ttl: timedelta = timedelta(hours=1)):
+        super().__init__()
+        self.ttl = ttl
+        self.watch = None
+
+    @property
+    def collection(self):
+        from app.core.firebase import db
+        return db.collection(PUBSUB_COLLECTION)
+
+    async def start(self) -> None:
+        await super().start()
+        started = datetime.now(timezone.utc)
+
+        def on_snapshot(docs, changes, read_time):
+            for change in changes:
+                if change.type.name == "ADDED":
+                    self._receive(change.document.to_dict())
+
+        self.watch = await run_blocking(self.collection.where("createdAt", ">", started).on_snapshot, on_snapshot)
+
+    async def stop(self) -> None:
+        if self.watch is not None:
+            await run_blocking(self.watch.unsubscribe)
+            self.watch = None
+
+    async def _send(self, raw: bytes) -> None:
+        now = datetime.now(timezone.utc)
+        await run_blocking(self.collection.add, {**json.loads(raw), "createdAt": now, "expireAt": now + self.ttl})
+
+def create_pubsub(backend: str = PUBSUB_BACKEND) -> PubSub:
+    backends = {"local": LocalPubSub, "unix": UnixSocketPubSub, "firestore": FirestorePubSub}
+    if backend not in backends:
+        raise ValueError(f"Unknown PUBSUB_BACKEND {backend!r}; expected one of {', '.join(backends)}")
+    return backends[backend]()
+
+pubsub = create_pubsub()
@@ -0,0 +1,72 @@
+"""
+orjson fast path for large list responses.
+
+A route with response_model=List[...] has FastAPI validate every item and
+serialize it again through pydantic on each response, which dominates the
+cost of listing thousands of rooms or allocations. For data the app loaded
+itself that work need not be repeated:
+
+- prevalidate() checks documents against a schema once, when they are
+  loaded (and cached, see RoomService.get_room_list), and keeps them as
+  JSON-ready dicts; a document that fails is logged and left out;
+- a route opts in by returning FastJSONResponse(items). FastAPI sends a
+  returned Response as is, so response_model only documents the shape.
+
+Only for trusted internal data: nothing in a FastJSONResponse is validated.
+Output matches FastAPI's own (timestamps as ISO 8601, UTC as "Z").
+"""
+from datetime import datetime
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from functools import lru_cache
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from typing import Any, Iterable, List, Type
+import logging
+import orjson
+
+logger = logging.getLogger(__name__)
+
+def _default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        # Firestore timestamps are a datetime subclass, which orjson will not take
+        return datetime.combine(value.date(), value.timetz())
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    return jsonable_encoder(value)
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse encoded by orjson, without validation
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+@lru_cache()
+def _list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(List[model])
+
+def prevalidate(model: Type[BaseModel], docs: Iterable[dict]) -> List[dict]:
+    """
+    docs validated against model, as the JSON-ready dicts FastAPI would send
+    for response_model=List[model]. A document that does not validate is
+    logged and left out rather than failing the whole list.
+    """
+    docs = list(docs)
+    adapter = _list_adapter(model)
+    try:
+        return adapter.dump_python(adapter.validate_python(docs), mode="json")
+    except ValidationError:
+        pass
+
+    items = []
+    for doc in docs:
+        try:
+            items.append(model.model_validate(doc).model_dump(mode="json"))
+        except ValidationError as e:
+            logger.warning("%s left out of list response: %s", model.__name__, e.errors()[0]["msg"],
+                           extra={"id": doc.get("id") if isinstance(doc, dict) else None})
+    return items
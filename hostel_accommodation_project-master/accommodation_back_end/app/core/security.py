@@ -1,26 +1,25 @@
-from fastapi import Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi import HTTPException, status
+from fastapi.security import HTTPBearer
 from firebase_admin import auth
 import firebase_admin
 
 security = HTTPBearer()
 
-async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+def verify_token(token: str) -> dict:
+    """
+    Verify a Firebase ID token and return its decoded claims
+    """
     try:
-        # Verify Firebase token
-        decoded_token = auth.verify_id_token(credentials.credentials)
-        uid = decoded_token['uid']
-
-        # Get user data from Firestore (assuming we store additional user info there)
-        # For now, return basic user info from token
-        return {
-            "id": uid,
-            "email": decoded_token.get("email"),
-            "role": decoded_token.get("role", "student")  # Default to student
-        }
-    except firebase_admin.exceptions.FirebaseError:
+        return auth.verify_id_token(token)
+    except (firebase_admin.exceptions.FirebaseError, ValueError):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
+
+def is_warden(user: dict) -> bool:
+    return user.get("role") in ["warden", "admin"]
+
+def is_admin(user: dict) -> bool:
+    return user.get("role") == "admin"
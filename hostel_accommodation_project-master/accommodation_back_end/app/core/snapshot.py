@@ -0,0 +1,104 @@
+"""
+Offline Firestore snapshots for analytics and benchmarks.
+
+export_snapshot() reads whole collections (one reader thread per collection,
+paging by document id) and writes each to <collection>.ndjson.gz: one JSON
+object per line, {"id": ..., "data": {...}}, with timestamps encoded as
+{"$ts": "<iso>"}. manifest.json records what was taken and when.
+
+read_collection() reads one back. Serving a snapshot to the repositories
+is left to the in-memory stand-in used by the benchmarks and scripts
+(benchmarks/firestore_backend.py, install_snapshot()), so the app itself
+does not carry it.
+"""
+from app.core.firebase import (
+    USERS_COLLECTION, ROOMS_COLLECTION, HOSTELS_COLLECTION, ALLOCATIONS_COLLECTION, APPLICATIONS_COLLECTION
+)
+from google.cloud.firestore_v1.field_path import FieldPath
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, List
+import gzip
+import json
+import os
+import time
+
+DEFAULT_COLLECTIONS = [USERS_COLLECTION, ROOMS_COLLECTION, HOSTELS_COLLECTION, ALLOCATIONS_COLLECTION, APPLICATIONS_COLLECTION]
+MANIFEST = "manifest.json"
+FORMAT_VERSION = 1
+PAGE_SIZE = 1000
+
+def _encode(value):
+    if isinstance(value, datetime):
+        return {"$ts": value.isoformat()}
+    # GeoPoints, references and bytes are not used by this app's documents
+    return str(value)
+
+def _decode(value: dict):
+    if len(value) == 1 and "$ts" in value:
+        return datetime.fromisoformat(value["$ts"])
+    return value
+
+def _path(directory: str, collection: str) -> str:
+    return os.path.join(directory, f"{collection}.ndjson.gz")
+
+def _export_collection(client, collection: str, directory: str, page_size: int) -> dict:
+    started = time.perf_counter()
+    count = 0
+    query = client.collection(collection).order_by(FieldPath.document_id()).limit(page_size)
+    with gzip.open(_path(directory, collection), "wt", encoding="utf-8", compresslevel=6) as out:
+        last = None
+        while True:
+            page = list((query.start_after(last) if last is not None else query).stream())
+            for doc in page:
+                out.write(json.dumps({"id": doc.id, "data": doc.to_dict()}, default=_encode, separators=(",", ":")))
+                out.write("\n")
+            count += len(page)
+            if len(page) < page_size:
+                break
+            last = page[-1]
+    return {
+        "documents": count,
+        "bytes": os.path.getsize(_path(directory, collection)),
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+
+def export_snapshot(client, directory: str, collections: List[str] = None, workers: int = None,
+                    page_size: int = PAGE_SIZE) -> dict:
+    """
+    Export collections to directory in parallel; returns the manifest
+    """
+    collections = collections or DEFAULT_COLLECTIONS
+    os.makedirs(directory, exist_ok=True)
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers or len(collections)) as pool:
+        futures = {name: pool.submit(_export_collection, client, name, directory, page_size) for name in collections}
+        results = {name: future.result() for name, future in futures.items()}
+
+    manifest = {
+        "format": FORMAT_VERSION,
+        "createdAt": datetime.now(timezone.utc).isoformat(),
+        "seconds": round(time.perf_counter() - started, 3),
+        "collections": results,
+    }
+    with open(os.path.join(directory, MANIFEST), "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+def read_manifest(directory: str) -> dict:
+    with open(os.path.join(directory, MANIFEST)) as f:
+        manifest = json.load(f)
+    if manifest.get("format") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported snapshot format {manifest.get('format')} in {directory}")
+    return manifest
+
+def read_collection(directory: str, collection: str) -> Dict[str, dict]:
+    """
+    A snapshot collection as {"<collection>/<id>": data}
+    """
+    documents = {}
+    with gzip.open(_path(directory, collection), "rt", encoding="utf-8") as f:
+        for line in f:
+            row = json.loads(line, object_hook=_decode)
+            documents[f"{collection}/{row['id']}"] = row["data"]
+    return documents
@@ -0,0 +1,94 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+from fastapi import Request
+from fastapi.responses import FileResponse, Response
+from fastapi.staticfiles import StaticFiles
+
+# Files written by scripts/build_frontend.py: name.<10 hex chars>.ext
+HASHED_ASSET = re.compile(r"^build/.+\.[0-9a-f]{10}\.[A-Za-z0-9]+$")
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+def _quality(params: list) -> float:
+    for param in params:
+        name, _, value = param.partition("=")
+        if name.strip().lower() == "q":
+            try:
+                return float(value)
+            except ValueError:
+                return 0.0
+    return 1.0
+
+def accepted_encodings(headers) -> set:
+    """
+    Codings in Accept-Encoding, less those refused with q=0 (q=0.5 still accepts)
+    """
+    encodings = set()
+    for part in headers.get("accept-encoding", "").split(","):
+        coding, *params = part.split(";")
+        if coding.strip() and _quality(params) > 0:
+            encodings.add(coding.strip().lower())
+    return encodings
+
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    StaticFiles that serves the .br/.gz siblings produced by the frontend
+    build when the client accepts them, and marks content-hashed files as
+    immutable. Everything else is revalidated through StaticFiles' ETag.
+    """
+
+    async def get_response(self, path: str, scope) -> Response:
+        response = await super().get_response(path, scope)
+        if response.status_code != 200 or not isinstance(response, FileResponse):
+            if response.status_code == 304 and HASHED_ASSET.match(path):
+                response.headers["Cache-Control"] = IMMUTABLE
+            return response
+
+        hashed = bool(HASHED_ASSET.match(path))
+        encodings = accepted_encodings(Request(scope).headers)
+        for encoding, suffix in (("br", ".br"), ("gzip", ".gz")):
+            variant = response.path + suffix
+            if encoding in encodings and os.path.isfile(variant):
+                media_type = mimetypes.guess_type(response.path)[0] or "application/octet-stream"
+                response = FileResponse(variant, media_type=media_type, headers={"Content-Encoding": encoding})
+                break
+
+        response.headers["Vary"] = "Accept-Encoding"
+        response.headers["Cache-Control"] = IMMUTABLE if hashed else REVALIDATE
+        return response
+
+class PageCache:
+    """
+    HTML pages held in memory with a strong ETag and a gzip copy, so "/" and
+    "/login" cost no disk I/O and repeat visits are answered with 304.
+    Prefers the build output (hashed asset URLs) and falls back to the sources.
+    """
+
+    def __init__(self, frontend_dir: str):
+        self.frontend_dir = frontend_dir
+        self.pages = {}
+
+    def _load(self, rel_path: str) -> tuple:
+        for base in (os.path.join(self.frontend_dir, "build"), self.frontend_dir):
+            path = os.path.join(base, rel_path)
+            if os.path.isfile(path):
+                with open(path, "rb") as f:
+                    body = f.read()
+                etag = '"' + hashlib.sha256(body).hexdigest()[:16] + '"'
+                return body, gzip.compress(body, compresslevel=9, mtime=0), etag
+        raise FileNotFoundError(rel_path)
+
+    def response(self, rel_path: str, request: Request) -> Response:
+        if rel_path not in self.pages:
+            self.pages[rel_path] = self._load(rel_path)
+        body, gzipped, etag = self.pages[rel_path]
+
+        headers = {"ETag": etag, "Cache-Control": REVALIDATE, "Vary": "Accept-Encoding"}
+        if etag in request.headers.get("if-none-match", ""):
+            return Response(status_code=304, headers=headers)
+        if "gzip" in accepted_encodings(request.headers):
+            return Response(gzipped, media_type="text/html", headers={**headers, "Content-Encoding": "gzip"})
+        return Response(body, media_type="text/html", headers=headers)
@@ -0,0 +1,215 @@
+"""
+Structured JSON logging with request context, written off the event loop.
+
+configure_logging() puts a QueueHandler on the root logger: emitting a
+record only enqueues it, and a QueueListener thread formats it as one JSON
+line and writes it out, so slow log I/O never blocks a request.
+
+RequestLoggingMiddleware binds a request id (X-Request-Id, taken from the
+caller or generated), method and route to every record logged while the
+request runs; get_current_user adds the uid. It also writes one access line
+per request with status and duration.
+
+DEBUG records are sampled at LOG_DEBUG_SAMPLE_RATE. Sampling is decided per
+request id, so a sampled request keeps all of its debug lines.
+"""
+from app.core.config import LOG_DEBUG_SAMPLE_RATE, LOG_FORMAT, LOG_LEVEL
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+import atexit
+import json
+import logging
+import queue
+import random
+import sys
+import time
+import traceback
+import uuid
+import zlib
+
+REQUEST_ID_HEADER = b"x-request-id"
+
+_request_context = ContextVar("log_context", default=None)
+
+# Attributes every LogRecord has; anything else came in through extra=
+_RECORD_FIELDS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "context"}
+
+_listener = None
+
+def bind(**fields) -> None:
+    """
+    Add fields (e.g. uid) to the current request's log context
+    """
+    context = _request_context.get()
+    if context is not None:
+        context.update({k: v for k, v in fields.items() if v is not None})
+
+def request_id() -> str:
+    context = _request_context.get()
+    return context.get("requestId") if context else None
+
+@contextmanager
+def log_context(**fields):
+    """
+    Bind fields to records logged outside a request, e.g. by a background job
+    """
+    token = _request_context.set({k: v for k, v in fields.items() if v is not None})
+    try:
+        yield
+    finally:
+        _request_context.reset(token)
+
+class ContextQueueHandler(QueueHandler):
+    """
+    Enqueues records with the caller's request context attached. Unlike the
+    stock QueueHandler it does not format here: JSON encoding happens on the
+    listener thread, only the message and traceback are rendered up front.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = "".join(traceback.format_exception(*record.exc_info)).rstrip()
+            record.exc_info = None
+        context = _request_context.get()
+        record.context = dict(context) if context else {}
+        return record
+
+class DebugSampler(logging.Filter):
+    def __init__(self, rate: float = LOG_DEBUG_SAMPLE_RATE):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG or self.rate >= 1:
+            return True
+        current = request_id()
+        if current is not None:
+            # Stable per request: all or none of a request's debug lines
+            return zlib.crc32(current.encode()) % 10000 < self.rate * 10000
+        return random.random() < self.rate
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update(getattr(record, "context", None) or {})
+        entry.update({k: v for k, v in vars(record).items() if k not in _RECORD_FIELDS})
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        elif record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+class TextFormatter(logging.Formatter):
+    """
+    Human-readable lines for local development (LOG_FORMAT=text)
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        context = getattr(record, "context", None) or {}
+        line = f"{datetime.fromtimestamp(record.created).strftime('%H:%M:%S')} {record.levelname:<7} {record.name}: {record.getMessage()}"
+        if context.get("requestId"):
+            line += f" [{context['requestId']}]"
+        if record.exc_text:
+            line += "\n" + record.exc_text
+        return line
+
+def configure_logging(level: str = LOG_LEVEL, stream=None) -> None:
+    """
+    Route all logging through a queue to a JSON (or text) stream handler (idempotent)
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(TextFormatter() if LOG_FORMAT == "text" else JsonFormatter())
+
+    records = queue.SimpleQueue()
+    handler = ContextQueueHandler(records)
+    handler.addFilter(DebugSampler())
+
+    root = logging.getLogger()
+    root.handlers = [handler]
+    root.setLevel(level)
+    # uvicorn's loggers keep their own handlers otherwise; send them through the queue too
+    for name in ("uvicorn", "uvicorn.error", "uvicorn.access", "gunicorn.error"):
+        logging.getLogger(name).handlers = []
+        logging.getLogger(name).propagate = True
+    # Our access line replaces uvicorn's
+    logging.getLogger("uvicorn.access").disabled = True
+
+    _listener = QueueListener(records, output, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+def shutdown_logging() -> None:
+    """
+    Flush queued records and stop the writer thread
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+access_logger = logging.getLogger("app.access")
+
+def _route_template(scope) -> str:
+    # /api/rooms/{room_id} rather than the concrete path, so lines group by endpoint
+    if scope.get("route") is None:
+        return None
+    params = {str(value): name for name, value in (scope.get("path_params") or {}).items()}
+    return "/".join(f"{{{params[part]}}}" if part in params else part for part in scope["path"].split("/"))
+
+class RequestLoggingMiddleware:
+    """
+    ASGI middleware: binds request context for logging and writes the access line
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        incoming = dict(scope["headers"]).get(REQUEST_ID_HEADER, b"").decode("latin-1")[:64]
+        context = {"requestId": incoming or uuid.uuid4().hex[:16], "method": scope.get("method", "WS"), "path": scope["path"]}
+        token = _request_context.set(context)
+        response_status = []
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                response_status.append(message["status"])
+                headers = list(message.get("headers", [])) + [(REQUEST_ID_HEADER, context["requestId"].encode())]
+                message = {**message, "headers": headers}
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception:
+            response_status.append(500)
+            access_logger.exception("unhandled error")
+            raise
+        finally:
+            # The router has matched the request by now
+            route = _route_template(scope)
+            if route:
+                context["route"] = route
+            status = response_status[0] if response_status else None
+            duration_ms = round((time.perf_counter() - started) * 1000, 2)
+            level = logging.ERROR if status and status >= 500 else logging.INFO
+            access_logger.log(level, "%s %s %s", context["method"], route or scope["path"], status,
+                              extra={"status": status, "durationMs": duration_ms})
+            _request_context.reset(token)
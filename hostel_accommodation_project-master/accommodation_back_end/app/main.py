@@ -1,11 +1,23 @@
+from app.core.structured_logging import configure_logging, RequestLoggingMiddleware
+
+# Before anything else logs (the Firebase client logs on import)
+configure_logging()
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi import Request
 import os
 
 # Import routers
-from app.api.routes import applications, allocations, users, hostels, rooms, reports
+from app.api.routes import applications, allocations, users, hostels, rooms, reports, waitlist, dashboard, events, admin, jobs
+from app.api.deps import get_waitlist_service, get_job_runner
+from app.core.static_assets import PrecompressedStaticFiles, PageCache
+from app.core.pubsub import pubsub
+from app.repositories.loader import DocumentLoaderMiddleware
+from app.core.profiling import ProfilingMiddleware, instrument_firestore
+from app.core.exceptions import FirestoreUnavailableError
+from app.core.firestore_client import firestore_guard, firestore_unavailable_handler
+from app.services.room_inventory import room_inventory
 
 app = FastAPI(
     title="AU Hostel Accommodation System",
@@ -13,6 +25,9 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# One batching/memoizing document loader per request (app/repositories/loader.py)
+app.add_middleware(DocumentLoaderMiddleware)
+
 # CORS Configuration
 app.add_middleware(
     CORSMiddleware,
@@ -20,9 +35,21 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Profile-Id", "X-Request-Id"],
 )
 
+# Times the whole request, counts its Firestore RPCs, profiles on admin request
+instrument_firestore()
+app.add_middleware(ProfilingMiddleware)
+# Outside profiling, so slow-request records carry the request id
+app.add_middleware(RequestLoggingMiddleware)
+
+# Firestore deadlines and an open circuit breaker answer 503 with Retry-After
+app.add_exception_handler(FirestoreUnavailableError, firestore_unavailable_handler)
+
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+FRONTEND_DIR = os.path.join(BASE_DIR, "../../frontend")
+pages = PageCache(FRONTEND_DIR)
 
 # Include API routers
 app.include_router(users.router, prefix="/api/users", tags=["Users"])
@@ -31,23 +58,60 @@ app.include_router(allocations.router, prefix="/api/allocations", tags=["Allocat
 app.include_router(hostels.router, prefix="/api/hostels", tags=["Hostels"])
 app.include_router(rooms.router, prefix="/api/rooms", tags=["Rooms"])
 app.include_router(reports.router, prefix="/api/reports", tags=["Reports"])
+app.include_router(waitlist.router, prefix="/api/waitlist", tags=["Waitlist"])
+app.include_router(dashboard.router, prefix="/api/dashboard", tags=["Dashboard"])
+app.include_router(events.router, prefix="/api/events", tags=["Events"])
+app.include_router(admin.router, prefix="/api/admin", tags=["Admin"])
+app.include_router(jobs.router, prefix="/api/jobs", tags=["Jobs"])
+
+@app.on_event("startup")
+async def start_workers_sync():
+    # Join the other workers before anything publishes cache or waitlist changes
+    await pubsub.start()
+
+@app.on_event("startup")
+async def load_waitlist():
+    # Rebuild the in-memory waitlist queues and hook them into cancellations
+    await get_waitlist_service().load()
+
+@app.on_event("startup")
+async def load_room_inventory():
+    # Columnar room table behind the occupancy figures, kept in step over pubsub
+    await room_inventory.load()
+
+@app.on_event("startup")
+async def start_job_runner():
+    # Bounded pool for rollovers and bulk assignments submitted with ?background=true
+    await get_job_runner().start()
+
+@app.on_event("shutdown")
+async def stop_job_runner():
+    await get_job_runner().stop()
+
+@app.on_event("shutdown")
+async def stop_workers_sync():
+    await pubsub.stop()
 
-# Mount static files
+# Mount static files (run scripts/build_frontend.py for hashed, precompressed assets)
 app.mount(
     "/frontend",
-    StaticFiles(directory=os.path.join(BASE_DIR, "../../frontend")),
+    PrecompressedStaticFiles(directory=FRONTEND_DIR),
     name="frontend"
 )
 
 @app.get("/")
-def home():
-    return FileResponse(os.path.join(BASE_DIR, "../../frontend/index.html"))
+def home(request: Request):
+    return pages.response("index.html", request)
 
 @app.get("/login")
-def login():
-    return FileResponse(os.path.join(BASE_DIR, "../../frontend/pages/login.html"))
+def login(request: Request):
+    return pages.response("pages/login.html", request)
 
 @app.get("/health")
 def health_check():
-    return {"status": "ok", "message": "AU Hostel Accommodation System is running"}
+    return {
+        "status": "ok",
+        "message": "AU Hostel Accommodation System is running",
+        "firestore": firestore_guard.breaker.snapshot()
+    }
 
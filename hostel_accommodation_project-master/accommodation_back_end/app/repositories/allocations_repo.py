@@ -1,6 +1,8 @@
 from firebase_admin import firestore
-from app.core.firebase import db, ALLOCATIONS_COLLECTION
+from app.core.firebase import db, ALLOCATIONS_COLLECTION, ALLOCATIONS_INDEX_COLLECTION
 from app.schemas.allocation import AllocationCreate, AllocationUpdate
+from app.repositories.loader import get_loader
+from app.utils.concurrency import run_blocking
 from typing import List, Optional
 import uuid
 from datetime import datetime
@@ -8,6 +10,7 @@ from datetime import datetime
 class AllocationRepository:
     def __init__(self):
         self.collection = db.collection(ALLOCATIONS_COLLECTION)
+        self.index = db.collection(ALLOCATIONS_INDEX_COLLECTION)
 
     async def create_allocation(self, allocation: AllocationCreate) -> dict:
         allocation_id = str(uuid.uuid4())
@@ -18,41 +21,58 @@ class AllocationRepository:
             "status": "active"
         })
 
-        self.collection.document(allocation_id).set(allocation_data)
+        await run_blocking(self.collection.document(allocation_id).set, allocation_data)
         return allocation_data
 
     async def get_allocation_by_id(self, allocation_id: str) -> Optional[dict]:
-        doc = self.collection.document(allocation_id).get()
-        return doc.to_dict() if doc.exists else None
+        return await get_loader().load(self.collection.document(allocation_id))
 
     async def get_allocations_by_user(self, user_id: str) -> List[dict]:
-        docs = self.collection.where("user_id", "==", user_id).stream()
-        return [doc.to_dict() for doc in docs]
+        docs = await run_blocking(self.collection.where("studentId", "==", user_id).get)
+        return [{**doc.to_dict(), "id": doc.id} for doc in docs]
 
     async def get_allocations_by_room(self, room_id: str) -> List[dict]:
-        docs = self.collection.where("room_id", "==", room_id).stream()
+        docs = await run_blocking(self.collection.where("roomId", "==", room_id).get)
+        return [{**doc.to_dict(), "id": doc.id} for doc in docs]
+
+    async def get_student_locks(self, student_id: str) -> List[dict]:
+        # allocations_index entries: one per semester the student is allocated for
+        docs = await run_blocking(self.index.where("studentId", "==", student_id).get)
         return [doc.to_dict() for doc in docs]
 
     async def update_allocation(self, allocation_id: str, update_data: AllocationUpdate) -> Optional[dict]:
         doc_ref = self.collection.document(allocation_id)
-        doc = doc_ref.get()
+        doc = await run_blocking(doc_ref.get)
         if not doc.exists:
             return None
 
         update_dict = {k: v for k, v in update_data.dict().items() if v is not None}
-        doc_ref.update(update_dict)
-        updated_doc = doc_ref.get()
+        await run_blocking(doc_ref.update, update_dict)
+        get_loader().forget(doc_ref)
+        updated_doc = await run_blocking(doc_ref.get)
         return updated_doc.to_dict()
 
     async def cancel_allocation(self, allocation_id: str) -> bool:
         doc_ref = self.collection.document(allocation_id)
-        doc = doc_ref.get()
+        doc = await run_blocking(doc_ref.get)
         if not doc.exists:
             return False
 
-        doc_ref.update({"status": "cancelled"})
+        await run_blocking(doc_ref.update, {"status": "cancelled"})
+        get_loader().forget(doc_ref)
         return True
 
-    async def get_all_allocations(self) -> List[dict]:
-        docs = self.collection.stream()
-        return [doc.to_dict() for doc in docs]
+    async def get_all_allocations(
+        self,
+        semester: Optional[str] = None,
+        hostel_id: Optional[str] = None,
+        status: Optional[str] = None
+    ) -> List[dict]:
+        query = self.collection
+        if semester is not None:
+            query = query.where("semester", "==", semester)
+        if hostel_id is not None:
+            query = query.where("hostelId", "==", hostel_id)
+        if status is not None:
+            query = query.where("status", "==", status)
+        return [{**doc.to_dict(), "id": doc.id} for doc in await run_blocking(query.get)]
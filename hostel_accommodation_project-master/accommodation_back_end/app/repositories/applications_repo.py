@@ -0,0 +1,44 @@
+from app.core.firebase import db, APPLICATIONS_COLLECTION
+from app.repositories.loader import get_loader
+from app.utils.concurrency import run_blocking
+from typing import List, Optional
+
+class ApplicationRepository:
+    def __init__(self):
+        self.collection = db.collection(APPLICATIONS_COLLECTION)
+
+    async def get_application_by_id(self, application_id: str) -> Optional[dict]:
+        application = await get_loader().load(self.collection.document(application_id))
+        return {**application, "id": application_id} if application is not None else None
+
+    async def get_applications_by_student(self, student_id: str) -> List[dict]:
+        docs = await run_blocking(self.collection.where("studentId", "==", student_id).get)
+        return [{**doc.to_dict(), "id": doc.id} for doc in docs]
+
+    async def get_applications_by_status(self, status: str, semester: Optional[str] = None) -> List[dict]:
+        query = self.collection.where("status", "==", status)
+        if semester is not None:
+            query = query.where("semester", "==", semester)
+        return [{**doc.to_dict(), "id": doc.id} for doc in await run_blocking(query.get)]
+
+    async def get_applications_by_semester(self, semester: str) -> List[dict]:
+        docs = await run_blocking(self.collection.where("semester", "==", semester).get)
+        return [{**doc.to_dict(), "id": doc.id} for doc in docs]
+
+    async def get_applications_by_statuses(self, statuses: List[str]) -> List[dict]:
+        docs = await run_blocking(self.collection.where("status", "in", statuses).get)
+        return [{**doc.to_dict(), "id": doc.id} for doc in docs]
+
+    async def count_applications_by_status(self, status: str) -> int:
+        result = await run_blocking(self.collection.where("status", "==", status).count().get)
+        return int(result[0][0].value)
+
+    async def update_status(self, application_id: str, status: str) -> bool:
+        doc_ref = self.collection.document(application_id)
+        doc = await run_blocking(doc_ref.get)
+        if not doc.exists:
+            return False
+
+        await run_blocking(doc_ref.update, {"status": status})
+        get_loader().forget(doc_ref)
+        return True
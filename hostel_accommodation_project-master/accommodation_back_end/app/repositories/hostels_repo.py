@@ -0,0 +1,67 @@
+from app.core.firebase import db, HOSTELS_COLLECTION
+from app.schemas.hostel import HostelCreate, HostelUpdate
+from app.repositories.loader import get_loader
+from app.utils.concurrency import run_blocking
+from typing import List, Optional
+import uuid
+from datetime import datetime
+
+class HostelRepository:
+    def __init__(self):
+        self.collection = db.collection(HOSTELS_COLLECTION)
+
+    async def create_hostel(self, hostel: HostelCreate, created_by: str) -> dict:
+        hostel_id = str(uuid.uuid4())
+        hostel_data = hostel.dict()
+        hostel_data.update({
+            "id": hostel_id,
+            "createdBy": created_by,
+            "createdAt": datetime.utcnow(),
+            "updatedAt": datetime.utcnow()
+        })
+
+        await run_blocking(self.collection.document(hostel_id).set, hostel_data)
+        return hostel_data
+
+    async def get_hostel_by_id(self, hostel_id: str) -> Optional[dict]:
+        hostel = await get_loader().load(self.collection.document(hostel_id))
+        return {**hostel, "id": hostel_id} if hostel is not None else None
+
+    async def get_hostels_by_ids(self, hostel_ids: List[str]) -> dict:
+        """
+        Hostels keyed by id, fetched in one batched read; missing hostels are left out
+        """
+        ids = list(dict.fromkeys(hostel_ids))
+        hostels = await get_loader().load_many(self.collection.document(hostel_id) for hostel_id in ids)
+        return {hostel_id: {**hostel, "id": hostel_id} for hostel_id, hostel in zip(ids, hostels) if hostel is not None}
+
+    async def get_hostels(self, gender: Optional[str] = None, is_active: Optional[bool] = None) -> List[dict]:
+        query = self.collection
+        if gender is not None:
+            query = query.where("gender", "==", gender)
+        if is_active is not None:
+            query = query.where("isActive", "==", is_active)
+        return [{**doc.to_dict(), "id": doc.id} for doc in await run_blocking(query.get)]
+
+    async def update_hostel(self, hostel_id: str, update_data: HostelUpdate) -> Optional[dict]:
+        doc_ref = self.collection.document(hostel_id)
+        doc = await run_blocking(doc_ref.get)
+        if not doc.exists:
+            return None
+
+        update_dict = {k: v for k, v in update_data.dict().items() if v is not None}
+        update_dict["updatedAt"] = datetime.utcnow()
+        await run_blocking(doc_ref.update, update_dict)
+        get_loader().forget(doc_ref)
+        updated_doc = await run_blocking(doc_ref.get)
+        return {**updated_doc.to_dict(), "id": updated_doc.id}
+
+    async def deactivate_hostel(self, hostel_id: str) -> bool:
+        doc_ref = self.collection.document(hostel_id)
+        doc = await run_blocking(doc_ref.get)
+        if not doc.exists:
+            return False
+
+        await run_blocking(doc_ref.update, {"isActive": False, "updatedAt": datetime.utcnow()})
+        get_loader().forget(doc_ref)
+        return True
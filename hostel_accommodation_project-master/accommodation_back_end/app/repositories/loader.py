@@ -0,0 +1,105 @@
+"""
+DataLoader-style batching for document point reads.
+
+Repositories read single documents through get_loader().load(ref). Loads
+issued in the same event-loop tick (e.g. under asyncio.gather, or via
+load_many) are resolved together with one db.get_all() round trip, and
+every document is remembered for the rest of the request, so asking for
+the same user or room twice costs nothing.
+
+DocumentLoaderMiddleware gives each HTTP/websocket request its own loader.
+Outside a request (scripts, benchmarks) each call gets a fresh loader:
+batching still applies within load_many, memoization does not.
+Anything that writes a document should forget() it, so a later read in the
+same request sees the write.
+"""
+from app.core.firebase import db
+from app.utils.concurrency import run_blocking
+from contextvars import ContextVar
+from typing import Iterable, List, Optional
+import asyncio
+
+_current_loader = ContextVar("document_loader", default=None)
+
+class DocumentLoader:
+    def __init__(self, client=None):
+        self.client = client
+        self.resolved = {}
+        # Loads waiting for the next tick
+        self.batch = None
+        self.stats = {"batches": 0, "documents": 0, "hits": 0}
+
+    async def load(self, ref) -> Optional[dict]:
+        return (await self.load_many([ref]))[0]
+
+    async def load_many(self, refs: Iterable) -> List[Optional[dict]]:
+        """
+        Document data (None when missing) for each reference, in order
+        """
+        loop = asyncio.get_running_loop()
+        futures = []
+        for ref in refs:
+            if ref.path in self.resolved:
+                self.stats["hits"] += 1
+                future = loop.create_future()
+                future.set_result(self.resolved[ref.path])
+            else:
+                if self.batch is None:
+                    self.batch = {}
+                    loop.call_soon(lambda: loop.create_task(self._flush()))
+                if ref.path not in self.batch:
+                    self.batch[ref.path] = (ref, loop.create_future())
+                future = self.batch[ref.path][1]
+            futures.append(future)
+        results = await asyncio.gather(*futures)
+        return [dict(data) if data is not None else None for data in results]
+
+    def forget(self, *refs) -> None:
+        for ref in refs:
+            self.resolved.pop(ref.path, None)
+
+    async def _flush(self) -> None:
+        batch, self.batch = self.batch or {}, None
+        if not batch:
+            return
+
+        try:
+            refs = [ref for ref, _ in batch.values()]
+            snapshots = await run_blocking(lambda: list((self.client or db).get_all(refs)))
+            # get_all does not promise to keep the request order
+            found = {snap.reference.path: snap.to_dict() if snap.exists else None for snap in snapshots}
+        except Exception as e:
+            for _, future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.stats["batches"] += 1
+        self.stats["documents"] += len(batch)
+        for path in batch:
+            self.resolved[path] = found.get(path)
+        for path, (_, future) in batch.items():
+            if not future.done():
+                future.set_result(found.get(path))
+
+def get_loader() -> DocumentLoader:
+    loader = _current_loader.get()
+    return loader if loader is not None else DocumentLoader()
+
+class DocumentLoaderMiddleware:
+    """
+    ASGI middleware: one DocumentLoader (batching + memoization) per request
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+        token = _current_loader.set(DocumentLoader())
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current_loader.reset(token)
@@ -0,0 +1,105 @@
+from app.core.firebase import db, OCCUPANCY_EVENTS_COLLECTION, OCCUPANCY_BUCKETS_COLLECTION, ROOMS_COLLECTION
+from app.utils.concurrency import run_blocking
+from firebase_admin import firestore
+from google.cloud.firestore_v1 import transactional
+from datetime import datetime
+from typing import List, Optional
+
+class OccupancyHistoryRepository:
+    def __init__(self):
+        self.events = db.collection(OCCUPANCY_EVENTS_COLLECTION)
+        self.buckets = db.collection(OCCUPANCY_BUCKETS_COLLECTION)
+        self.rooms = db.collection(ROOMS_COLLECTION)
+
+    @staticmethod
+    def bucket_id(hostel_id: str, resolution: str, start: datetime) -> str:
+        return f"{hostel_id}_{resolution}_{start:%Y%m%d%H}"
+
+    async def record(self, changes: List[dict]) -> None:
+        """
+        Append one event per hostel change and fold it into its buckets, in
+        one transaction. A change carries hostelId, at, reason, allocated,
+        released, eventExpireAt and its buckets (resolution, start, expireAt).
+
+        The level and capacity are summed from the hostel's room documents in
+        the same transaction, after the change itself was committed: every
+        worker records the level Firestore holds, so the latest write to a
+        bucket always carries the current one. The stored bucket keeps that
+        level and the extremes seen.
+        """
+        @transactional
+        def record_in_transaction(transaction):
+            # Every read before the first write
+            levels = {}
+            for change in changes:
+                occupied = capacity = 0
+                for room in transaction.get(self.rooms.where("hostel_id", "==", change["hostelId"])):
+                    data = room.to_dict()
+                    occupied += data.get("occupied") or 0
+                    capacity += data.get("capacity") or 0
+                levels[change["hostelId"]] = (occupied, capacity)
+
+            for change in changes:
+                occupied, capacity = levels[change["hostelId"]]
+                before = max(occupied - change["allocated"] + change["released"], 0)
+                transaction.set(self.events.document(), {
+                    "hostelId": change["hostelId"],
+                    "at": change["at"],
+                    "reason": change["reason"],
+                    "delta": change["allocated"] - change["released"],
+                    "occupied": occupied,
+                    "capacity": capacity,
+                    "expireAt": change["eventExpireAt"],
+                })
+                low, high = sorted((before, occupied))
+                for bucket in change["buckets"]:
+                    transaction.set(self.buckets.document(self.bucket_id(change["hostelId"], bucket["resolution"], bucket["start"])), {
+                        "hostelId": change["hostelId"],
+                        "resolution": bucket["resolution"],
+                        "start": bucket["start"],
+                        "occupied": occupied,
+                        "capacity": capacity,
+                        "min": firestore.Minimum(low),
+                        "max": firestore.Maximum(high),
+                        "allocated": firestore.Increment(change["allocated"]),
+                        "released": firestore.Increment(change["released"]),
+                        "updatedAt": change["at"],
+                        "expireAt": bucket["expireAt"],
+                    }, merge=True)
+
+        await run_blocking(record_in_transaction, db.transaction())
+
+    async def get_buckets(self, hostel_id: str, resolution: str, start: datetime, end: datetime) -> List[dict]:
+        # Needs a composite index on (hostelId, resolution, start)
+        query = (
+            self.buckets.where("hostelId", "==", hostel_id)
+            .where("resolution", "==", resolution)
+            .where("start", ">=", start)
+            .where("start", "<", end)
+            .order_by("start")
+        )
+        docs = await run_blocking(query.get)
+        return [doc.to_dict() for doc in docs]
+
+    async def get_bucket_before(self, hostel_id: str, resolution: str, start: datetime) -> Optional[dict]:
+        query = (
+            self.buckets.where("hostelId", "==", hostel_id)
+            .where("resolution", "==", resolution)
+            .where("start", "<", start)
+            .order_by("start", direction="DESCENDING")
+            .limit(1)
+        )
+        docs = await run_blocking(query.get)
+        return docs[0].to_dict() if docs else None
+
+    async def delete_expired(self, collection: str, now: datetime, limit: int = 400) -> int:
+        """
+        Delete up to `limit` documents whose expireAt has passed; returns how many
+        """
+        docs = await run_blocking(db.collection(collection).where("expireAt", "<", now).limit(limit).get)
+        if docs:
+            batch = db.batch()
+            for doc in docs:
+                batch.delete(doc.reference)
+            await run_blocking(batch.commit)
+        return len(docs)
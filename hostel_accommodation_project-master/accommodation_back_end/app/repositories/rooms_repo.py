@@ -1,6 +1,8 @@
 from firebase_admin import firestore
-from app.core.firebase import db, ROOMS_COLLECTION
+from app.core.firebase import db, ROOMS_COLLECTION, ROOM_ROSTER_SUBCOLLECTION
 from app.schemas.room import RoomCreate, RoomUpdate
+from app.repositories.loader import get_loader
+from app.utils.concurrency import run_blocking
 from typing import List, Optional
 import uuid
 from datetime import datetime
@@ -18,47 +20,75 @@ class RoomRepository:
             "updated_at": datetime.utcnow()
         })
 
-        self.collection.document(room_id).set(room_data)
+        await run_blocking(self.collection.document(room_id).set, room_data)
         return room_data
 
     async def get_room_by_id(self, room_id: str) -> Optional[dict]:
-        doc = self.collection.document(room_id).get()
-        return doc.to_dict() if doc.exists else None
+        return await get_loader().load(self.collection.document(room_id))
+
+    async def get_rooms_by_ids(self, room_ids: List[str]) -> dict:
+        """
+        Rooms keyed by id, fetched in one batched read; missing rooms are left out
+        """
+        ids = list(dict.fromkeys(room_ids))
+        rooms = await get_loader().load_many(self.collection.document(room_id) for room_id in ids)
+        return {room_id: room for room_id, room in zip(ids, rooms) if room is not None}
 
     async def get_rooms_by_hostel(self, hostel_id: str) -> List[dict]:
-        docs = self.collection.where("hostel_id", "==", hostel_id).stream()
-        return [doc.to_dict() for doc in docs]
+        docs = await run_blocking(self.collection.where("hostel_id", "==", hostel_id).get)
+        return [{**doc.to_dict(), "id": doc.id} for doc in docs]
 
     async def update_room(self, room_id: str, update_data: RoomUpdate) -> Optional[dict]:
         doc_ref = self.collection.document(room_id)
-        doc = doc_ref.get()
+        doc = await run_blocking(doc_ref.get)
         if not doc.exists:
             return None
 
         update_dict = {k: v for k, v in update_data.dict().items() if v is not None}
         update_dict["updated_at"] = datetime.utcnow()
-        doc_ref.update(update_dict)
-        updated_doc = doc_ref.get()
+        await run_blocking(doc_ref.update, update_dict)
+        get_loader().forget(doc_ref)
+        updated_doc = await run_blocking(doc_ref.get)
         return updated_doc.to_dict()
 
     async def update_room_occupancy(self, room_id: str, new_occupied: int) -> bool:
         doc_ref = self.collection.document(room_id)
-        doc = doc_ref.get()
+        doc = await run_blocking(doc_ref.get)
         if not doc.exists:
             return False
 
-        doc_ref.update({"occupied": new_occupied, "updated_at": datetime.utcnow()})
+        await run_blocking(doc_ref.update, {"occupied": new_occupied, "updated_at": datetime.utcnow()})
+        get_loader().forget(doc_ref)
         return True
 
     async def delete_room(self, room_id: str) -> bool:
         doc_ref = self.collection.document(room_id)
-        doc = doc_ref.get()
+        doc = await run_blocking(doc_ref.get)
         if not doc.exists:
             return False
 
-        doc_ref.delete()
+        await run_blocking(doc_ref.delete)
+        get_loader().forget(doc_ref)
+        return True
+
+    def roster(self, room_id: str):
+        return self.collection.document(room_id).collection(ROOM_ROSTER_SUBCOLLECTION)
+
+    async def get_roster(self, room_id: str) -> List[dict]:
+        # One query for every occupant; names are copied in at allocation time
+        docs = await run_blocking(self.roster(room_id).get)
+        return sorted((doc.to_dict() for doc in docs), key=lambda entry: entry.get("bedLabel") or "")
+
+    async def update_roster_entry(self, room_id: str, allocation_id: str, fields: dict) -> bool:
+        doc_ref = self.roster(room_id).document(allocation_id)
+        if not (await run_blocking(doc_ref.get)).exists:
+            return False
+
+        await run_blocking(doc_ref.update, fields)
+        get_loader().forget(doc_ref)
         return True
 
     async def get_all_rooms(self) -> List[dict]:
-        docs = self.collection.stream()
-        return [doc.to_dict() for doc in docs]
+        # Rooms seeded outside the API (addDoc) have no stored id field
+        docs = await run_blocking(self.collection.get)
+        return [{**doc.to_dict(), "id": doc.id} for doc in docs]
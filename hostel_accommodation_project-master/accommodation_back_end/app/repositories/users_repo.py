@@ -1,6 +1,8 @@
 from firebase_admin import firestore
 from app.core.firebase import db, USERS_COLLECTION
 from app.schemas.user import UserCreate, UserUpdate
+from app.repositories.loader import get_loader
+from app.utils.concurrency import run_blocking
 from typing import List, Optional
 import uuid
 from datetime import datetime
@@ -18,44 +20,59 @@ class UserRepository:
             "updated_at": datetime.utcnow()
         })
 
-        self.collection.document(user_id).set(user_data)
+        await run_blocking(self.collection.document(user_id).set, user_data)
         return user_data
 
     async def get_user_by_id(self, user_id: str) -> Optional[dict]:
-        doc = self.collection.document(user_id).get()
-        return doc.to_dict() if doc.exists else None
+        return await get_loader().load(self.collection.document(user_id))
+
+    async def get_users_by_ids(self, user_ids: List[str]) -> dict:
+        """
+        Profiles keyed by id, fetched in one batched read; missing users are left out
+        """
+        ids = list(dict.fromkeys(user_ids))
+        users = await get_loader().load_many(self.collection.document(user_id) for user_id in ids)
+        return {user_id: user for user_id, user in zip(ids, users) if user is not None}
 
     async def get_user_by_email(self, email: str) -> Optional[dict]:
-        docs = self.collection.where("email", "==", email).limit(1).stream()
+        docs = await run_blocking(self.collection.where("email", "==", email).limit(1).get)
         for doc in docs:
             return doc.to_dict()
         return None
 
     async def update_user(self, user_id: str, update_data: UserUpdate) -> Optional[dict]:
         doc_ref = self.collection.document(user_id)
-        doc = doc_ref.get()
+        doc = await run_blocking(doc_ref.get)
         if not doc.exists:
             return None
 
         update_dict = {k: v for k, v in update_data.dict().items() if v is not None}
         update_dict["updated_at"] = datetime.utcnow()
-        doc_ref.update(update_dict)
-        updated_doc = doc_ref.get()
+        await run_blocking(doc_ref.update, update_dict)
+        get_loader().forget(doc_ref)
+        updated_doc = await run_blocking(doc_ref.get)
         return updated_doc.to_dict()
 
     async def delete_user(self, user_id: str) -> bool:
         doc_ref = self.collection.document(user_id)
-        doc = doc_ref.get()
+        doc = await run_blocking(doc_ref.get)
         if not doc.exists:
             return False
 
-        doc_ref.delete()
+        await run_blocking(doc_ref.delete)
+        get_loader().forget(doc_ref)
         return True
 
     async def get_users_by_role(self, role: str) -> List[dict]:
-        docs = self.collection.where("role", "==", role).stream()
-        return [doc.to_dict() for doc in docs]
+        docs = await run_blocking(self.collection.where("role", "==", role).get)
+        # Seed-data profiles (addDoc) have no id field of their own
+        return [{**doc.to_dict(), "id": doc.id} for doc in docs]
+
+    async def count_users_by_role(self, role: str) -> int:
+        # Server-side aggregation: one round trip, no documents transferred
+        result = await run_blocking(self.collection.where("role", "==", role).count().get)
+        return int(result[0][0].value)
 
     async def get_all_users(self) -> List[dict]:
-        docs = self.collection.stream()
+        docs = await run_blocking(self.collection.get)
         return [doc.to_dict() for doc in docs]
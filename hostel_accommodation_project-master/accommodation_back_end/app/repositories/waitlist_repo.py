@@ -0,0 +1,32 @@
+from app.core.firebase import db, WAITLIST_COLLECTION
+from app.repositories.loader import get_loader
+from app.utils.concurrency import run_blocking
+from typing import List, Optional
+from datetime import datetime, timezone
+
+class WaitlistRepository:
+    def __init__(self):
+        self.collection = db.collection(WAITLIST_COLLECTION)
+
+    async def create_entry(self, entry: dict) -> dict:
+        # One entry per student per semester, so re-joining replaces the old one
+        entry_id = f"{entry['studentId']}_{entry['semester']}"
+        entry_data = {**entry, "id": entry_id, "status": "waiting", "createdAt": datetime.now(timezone.utc)}
+        await run_blocking(self.collection.document(entry_id).set, entry_data)
+        get_loader().forget(self.collection.document(entry_id))
+        return entry_data
+
+    async def get_entry_by_id(self, entry_id: str) -> Optional[dict]:
+        return await get_loader().load(self.collection.document(entry_id))
+
+    async def get_waiting_entries(self) -> List[dict]:
+        docs = await run_blocking(self.collection.where("status", "==", "waiting").get)
+        return [doc.to_dict() for doc in docs]
+
+    async def get_entries_by_student(self, student_id: str) -> List[dict]:
+        docs = await run_blocking(self.collection.where("studentId", "==", student_id).get)
+        return [doc.to_dict() for doc in docs]
+
+    async def update_status(self, entry_id: str, status: str, **fields) -> None:
+        await run_blocking(self.collection.document(entry_id).update, {"status": status, "updatedAt": datetime.utcnow(), **fields})
+        get_loader().forget(self.collection.document(entry_id))
@@ -3,23 +3,29 @@ from typing import Optional
 from datetime import datetime
 
 class AllocationBase(BaseModel):
-    user_id: str
-    room_id: str
-    allocated_by: str  # warden/admin id
-    academic_year: str
+    studentId: str
+    hostelId: str
+    roomId: str
+    bedLabel: Optional[str] = None
     semester: str
 
 class AllocationCreate(AllocationBase):
     pass
 
 class AllocationUpdate(BaseModel):
-    academic_year: Optional[str] = None
+    bedLabel: Optional[str] = None
     semester: Optional[str] = None
 
 class Allocation(AllocationBase):
     id: str
-    allocated_at: datetime
+    applicationId: Optional[str] = None
+    allocatedBy: str
+    allocatedAt: datetime
     status: str = "active"  # active, cancelled, completed
 
     class Config:
         from_attributes = True
+
+class BulkAssignmentRequest(BaseModel):
+    semester: str
+    dryRun: bool = True
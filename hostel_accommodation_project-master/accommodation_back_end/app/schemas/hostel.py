@@ -0,0 +1,27 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+
+class HostelBase(BaseModel):
+    name: str
+    gender: str = "mixed"  # male, female, mixed
+    campus: Optional[str] = None
+    isActive: bool = True
+
+class HostelCreate(HostelBase):
+    pass
+
+class HostelUpdate(BaseModel):
+    name: Optional[str] = None
+    gender: Optional[str] = None
+    campus: Optional[str] = None
+    isActive: Optional[bool] = None
+
+class HostelOut(HostelBase):
+    id: str
+    createdBy: Optional[str] = None
+    createdAt: Optional[datetime] = None
+    updatedAt: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
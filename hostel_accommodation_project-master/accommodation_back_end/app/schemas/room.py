@@ -28,3 +28,20 @@ class Room(RoomBase):
 
     class Config:
         from_attributes = True
+
+class RoomOut(BaseModel):
+    # Rooms as stored: those seeded outside the API (frontend/scripts/seed-data.js) lack most fields
+    id: str
+    room_number: Optional[str] = None
+    hostel_id: Optional[str] = None
+    capacity: Optional[int] = None
+    occupied: Optional[int] = 0
+    floor: Optional[int] = None
+    block: Optional[str] = None
+    amenities: Optional[list[str]] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+        extra = "allow"
@@ -13,6 +13,8 @@ class UserCreate(UserBase):
 class UserUpdate(BaseModel):
     full_name: Optional[str] = None
     role: Optional[str] = None
+    gender: Optional[str] = None
+    hostelId: Optional[str] = None
 
 class User(UserBase):
     id: str
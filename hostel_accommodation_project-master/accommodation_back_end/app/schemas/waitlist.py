@@ -0,0 +1,24 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+
+class WaitlistCreate(BaseModel):
+    hostelId: str
+    semester: str
+    studentId: Optional[str] = None  # wardens may enqueue on a student's behalf
+    priority: Optional[int] = None  # defaults to the application's priority flags
+
+class WaitlistEntry(BaseModel):
+    id: str
+    studentId: str
+    hostelId: str
+    gender: Optional[str] = None
+    semester: str
+    priority: int = 0
+    status: str = "waiting"  # waiting, promoted, removed
+    createdAt: datetime
+    allocationId: Optional[str] = None
+    reason: Optional[str] = None
+
+    class Config:
+        from_attributes = True
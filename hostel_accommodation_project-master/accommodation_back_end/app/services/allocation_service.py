@@ -2,12 +2,33 @@ from app.repositories.allocations_repo import AllocationRepository
 from app.repositories.rooms_repo import RoomRepository
 from app.repositories.users_repo import UserRepository
 from app.repositories.applications_repo import ApplicationRepository
+from app.repositories.hostels_repo import HostelRepository
+from app.repositories.loader import get_loader
+from app.services.claims_service import ClaimsService
+from app.services.occupancy_history_service import OccupancyHistoryService
 from app.schemas.allocation import AllocationCreate, AllocationUpdate, Allocation
 from app.schemas.room import RoomUpdate
-from typing import List, Optional
+from typing import Awaitable, Callable, List, Optional
 from fastapi import HTTPException
-from app.core.firebase import db
+from app.core.firebase import db, ALLOCATIONS_INDEX_COLLECTION, ROOM_ROSTER_SUBCOLLECTION
+from app.core.exceptions import RoomFullError
+from app.core.cache import read_cache
+from app.core.events import event_hub
+from app.services.room_inventory import room_inventory
+from app.utils.concurrency import run_blocking
 from google.cloud.firestore_v1 import transactional
+from firebase_admin.exceptions import FirebaseError
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+def student_lock_id(student_id: str, semester: str) -> str:
+    """
+    Id of the allocations_index document that marks a student as allocated
+    for a semester; its existence is the one-active-allocation guarantee
+    """
+    return f"{student_id}_{semester}"
 
 class AllocationService:
     def __init__(self):
@@ -15,14 +36,20 @@ class AllocationService:
         self.room_repo = RoomRepository()
         self.user_repo = UserRepository()
         self.application_repo = ApplicationRepository()
+        self.hostel_repo = HostelRepository()
+        self.claims_service = ClaimsService()
+        self.history_service = OccupancyHistoryService()
+        self.cancel_listeners = []
 
     async def allocate_room(self, allocation: AllocationCreate, allocated_by: str) -> dict:
         """
         Allocate a room to a student with strict business rules enforcement:
         - Room capacity not exceeded
         - Approved application exists first
+        - One active allocation per student per semester, enforced by an
+          allocations_index lock document read and created in the transaction
         - Uses Firestore transactions to prevent double allocation
-        - Updates rooms.occupied correctly
+        - Updates rooms.occupied and the room's roster correctly
         - Hostel gender restrictions
         """
         
@@ -37,22 +64,23 @@ class AllocationService:
         if not approved_app:
             raise ValueError("Student must have an approved application before allocation")
 
-        # Check if student already has an active allocation for this semester
-        existing_allocations = await self.allocation_repo.get_allocations_by_user(allocation.studentId)
-        active_allocation = next(
-            (a for a in existing_allocations 
-             if a.get("status") == "active" and a.get("semester") == allocation.semester),
-            None
-        )
-        if active_allocation:
-            raise ValueError("Student already has an active allocation for this semester")
-
         # Use Firestore transaction to prevent race conditions
         @transactional
         def allocate_in_transaction(transaction):
-            # Get room reference
+            # Concurrent allocations for the same student both read the lock,
+            # so only one of them can commit its creation
+            lock_ref = db.collection(ALLOCATIONS_INDEX_COLLECTION).document(
+                student_lock_id(allocation.studentId, allocation.semester)
+            )
             room_ref = db.collection("rooms").document(allocation.roomId)
-            room_doc = room_ref.get(transaction=transaction)
+            hostel_ref = db.collection("hostels").document(allocation.hostelId)
+
+            # Lock, room and hostel in one round trip
+            docs = {doc.reference.path: doc for doc in transaction.get_all([lock_ref, room_ref, hostel_ref])}
+            lock_doc, room_doc, hostel_doc = docs[lock_ref.path], docs[room_ref.path], docs[hostel_ref.path]
+
+            if lock_doc.exists:
+                raise ValueError("Student already has an active allocation for this semester")
             
             if not room_doc.exists:
                 raise ValueError("Room not found")
@@ -61,12 +89,9 @@ class AllocationService:
             
             # Check room capacity
             if room.get("occupied", 0) >= room.get("capacity", 0):
-                raise ValueError(f"Room {allocation.roomId} is fully occupied")
+                raise RoomFullError(f"Room {allocation.roomId} is fully occupied")
             
             # Check gender restrictions if hostel has gender policy
-            hostel_ref = db.collection("hostels").document(allocation.hostelId)
-            hostel_doc = hostel_ref.get(transaction=transaction)
-            
             if hostel_doc.exists:
                 hostel = hostel_doc.to_dict()
                 if hostel.get("gender") and hostel.get("gender") != "mixed":
@@ -82,6 +107,7 @@ class AllocationService:
                 "applicationId": approved_app.get("id"),
                 "hostelId": allocation.hostelId,
                 "roomId": allocation.roomId,
+                "roomNumber": room.get("room_number"),
                 "bedLabel": allocation.bedLabel,
                 "semester": allocation.semester,
                 "allocatedBy": allocated_by,
@@ -89,11 +115,29 @@ class AllocationService:
                 "status": "active"
             }
             transaction.set(allocation_ref, allocation_data)
+            transaction.set(lock_ref, {
+                "studentId": allocation.studentId,
+                "semester": allocation.semester,
+                "allocationId": allocation_ref.id,
+                "hostelId": allocation.hostelId,
+                "roomId": allocation.roomId,
+                "createdAt": firestore.SERVER_TIMESTAMP
+            })
             
             # Update room occupancy
             transaction.update(room_ref, {
                 "occupied": room.get("occupied", 0) + 1
             })
+
+            # Denormalized occupant entry, so listing a room needs no user lookups
+            transaction.set(room_ref.collection(ROOM_ROSTER_SUBCOLLECTION).document(allocation_ref.id), {
+                "allocationId": allocation_ref.id,
+                "studentId": allocation.studentId,
+                "name": user.get("full_name"),
+                "bedLabel": allocation.bedLabel,
+                "semester": allocation.semester,
+                "allocatedAt": firestore.SERVER_TIMESTAMP
+            })
             
             # Update application status to allocated
             app_ref = db.collection("applications").document(approved_app.get("id"))
@@ -106,18 +150,71 @@ class AllocationService:
         # Execute transaction
         from google.cloud import firestore
         transaction = db.transaction()
-        result = allocate_in_transaction(transaction)
-        
+        result = await run_blocking(allocate_in_transaction, transaction)
+        get_loader().forget(
+            db.collection("rooms").document(allocation.roomId),
+            db.collection("applications").document(approved_app.get("id"))
+        )
+
+        await self._sync_claims(allocation.studentId, {"hostelId": allocation.hostelId})
+        await self._occupancy_changed("allocation.created", result, 1)
         return result
 
+    async def _sync_claims(self, student_id: str, updates: dict) -> None:
+        # The allocation is already committed; scripts/sync_claims.py repairs a claim that was missed
+        try:
+            await self.claims_service.sync_user_claims(student_id, updates)
+        except FirebaseError:
+            logger.exception("custom claims not synced", extra={"studentId": student_id})
+
+    async def _occupancy_changed(self, event_type: str, allocation: dict, delta: int) -> None:
+        # Every worker drops its cached room lists, adjusts its inventory and tells its websocket clients
+        await read_cache.invalidate("rooms")
+        try:
+            # The level is read from the committed room documents, not the inventory
+            await self.history_service.record({allocation.get("roomId"): delta}, event_type)
+        except Exception:
+            logger.exception("occupancy history not recorded", extra={"roomId": allocation.get("roomId")})
+        await room_inventory.occupancy_changed({allocation.get("roomId"): delta})
+        await event_hub.publish({
+            "type": event_type,
+            "hostelId": allocation.get("hostelId"),
+            "roomId": allocation.get("roomId"),
+            "semester": allocation.get("semester")
+        })
+
     async def get_allocation(self, allocation_id: str) -> Optional[dict]:
         return await self.allocation_repo.get_allocation_by_id(allocation_id)
 
     async def get_user_allocations(self, user_id: str) -> List[dict]:
-        return await self.allocation_repo.get_allocations_by_user(user_id)
+        """
+        A student's allocations with room number and hostel name; rooms and
+        hostels for all of them come back in a single batched read
+        """
+        allocations = await self.allocation_repo.get_allocations_by_user(user_id)
+        rooms, hostels = await asyncio.gather(
+            self.room_repo.get_rooms_by_ids([a.get("roomId") for a in allocations if a.get("roomId")]),
+            self.hostel_repo.get_hostels_by_ids([a.get("hostelId") for a in allocations if a.get("hostelId")])
+        )
+        return [
+            {
+                **a,
+                "roomNumber": (rooms.get(a.get("roomId")) or {}).get("room_number"),
+                "hostelName": (hostels.get(a.get("hostelId")) or {}).get("name")
+            }
+            for a in allocations
+        ]
 
     async def get_room_allocations(self, room_id: str) -> List[dict]:
-        return await self.allocation_repo.get_allocations_by_room(room_id)
+        """
+        A room's allocations with each student's name, fetched in one batched read
+        """
+        allocations = await self.allocation_repo.get_allocations_by_room(room_id)
+        students = await self.user_repo.get_users_by_ids([a.get("studentId") for a in allocations if a.get("studentId")])
+        return [
+            {**a, "studentName": (students.get(a.get("studentId")) or {}).get("full_name")}
+            for a in allocations
+        ]
 
     async def get_all_allocations(
         self,
@@ -132,7 +229,58 @@ class AllocationService:
         )
 
     async def update_allocation(self, allocation_id: str, update_data: AllocationUpdate) -> Optional[dict]:
-        return await self.allocation_repo.update_allocation(allocation_id, update_data)
+        allocation = await self.allocation_repo.get_allocation_by_id(allocation_id)
+        if not allocation:
+            return None
+        if (
+            update_data.semester is not None
+            and update_data.semester != allocation.get("semester")
+            and allocation.get("status") == "active"
+        ):
+            await self.move_student_lock(allocation_id, allocation, update_data.semester)
+        updated = await self.allocation_repo.update_allocation(allocation_id, update_data)
+
+        roster_fields = {
+            field: value for field, value in (("bedLabel", update_data.bedLabel), ("semester", update_data.semester))
+            if value is not None and value != allocation.get(field)
+        }
+        if roster_fields and allocation.get("status") == "active":
+            await self.room_repo.update_roster_entry(allocation["roomId"], allocation_id, roster_fields)
+        return updated
+
+    async def move_student_lock(self, allocation_id: str, allocation: dict, semester: str) -> None:
+        """
+        Re-key an active allocation's allocations_index lock to a new semester,
+        refusing if the student is already allocated for that semester
+        """
+        index = db.collection(ALLOCATIONS_INDEX_COLLECTION)
+
+        @transactional
+        def move_in_transaction(transaction):
+            old_ref = index.document(student_lock_id(allocation["studentId"], allocation["semester"]))
+            new_ref = index.document(student_lock_id(allocation["studentId"], semester))
+            old_doc = old_ref.get(transaction=transaction)
+            if new_ref.get(transaction=transaction).exists:
+                raise ValueError("Student already has an active allocation for this semester")
+
+            lock = old_doc.to_dict() if old_doc.exists else {
+                "studentId": allocation["studentId"],
+                "allocationId": allocation_id,
+                "hostelId": allocation.get("hostelId"),
+                "roomId": allocation.get("roomId")
+            }
+            transaction.set(new_ref, {**lock, "semester": semester})
+            if old_doc.exists:
+                transaction.delete(old_ref)
+
+        await run_blocking(move_in_transaction, db.transaction())
+
+    def add_cancel_listener(self, listener: Callable[[dict], Awaitable[None]]) -> None:
+        """
+        Register a coroutine called with the cancelled allocation once its
+        bed has been released (e.g. to promote the next waitlisted student)
+        """
+        self.cancel_listeners.append(listener)
 
     async def cancel_allocation(self, allocation_id: str, cancelled_by: str) -> bool:
         """
@@ -145,8 +293,21 @@ class AllocationService:
         # Use transaction to ensure consistency
         @transactional
         def cancel_in_transaction(transaction):
-            # Update allocation status
+            # Firestore transactions need every read before the first write;
+            # all three come back in one round trip
             allocation_ref = db.collection("allocations").document(allocation_id)
+            room_ref = db.collection("rooms").document(allocation["roomId"])
+            lock_ref = db.collection(ALLOCATIONS_INDEX_COLLECTION).document(
+                student_lock_id(allocation["studentId"], allocation["semester"])
+            )
+            docs = {doc.reference.path: doc for doc in transaction.get_all([allocation_ref, room_ref, lock_ref])}
+            allocation_doc, room_doc, lock_doc = docs[allocation_ref.path], docs[room_ref.path], docs[lock_ref.path]
+
+            # Gone since it was read (archived by a rollover, say): nothing to cancel
+            if not allocation_doc.exists or allocation_doc.to_dict().get("status") != "active":
+                return False
+
+            # Update allocation status
             transaction.update(allocation_ref, {
                 "status": "cancelled",
                 "cancelledBy": cancelled_by,
@@ -154,36 +315,52 @@ class AllocationService:
             })
             
             # Update room occupancy
-            room_ref = db.collection("rooms").document(allocation["roomId"])
-            room_doc = room_ref.get(transaction=transaction)
             if room_doc.exists:
                 room = room_doc.to_dict()
                 new_occupied = max(0, room.get("occupied", 0) - 1)
                 transaction.update(room_ref, {"occupied": new_occupied})
+                transaction.delete(room_ref.collection(ROOM_ROSTER_SUBCOLLECTION).document(allocation_id))
+
+            # Free the student for another allocation this semester
+            if lock_doc.exists and lock_doc.to_dict().get("allocationId") == allocation_id:
+                transaction.delete(lock_ref)
             
             return True
         
         from google.cloud import firestore
         transaction = db.transaction()
-        return cancel_in_transaction(transaction)
+        if not await run_blocking(cancel_in_transaction, transaction):
+            # Already cancelled or completed: no bed was released this time
+            return True
+        get_loader().forget(
+            db.collection("allocations").document(allocation_id),
+            db.collection("rooms").document(allocation["roomId"])
+        )
+
+        await self._sync_claims(allocation["studentId"], {"hostelId": None})
+        await self._occupancy_changed("allocation.cancelled", allocation, -1)
+        for listener in self.cancel_listeners:
+            await listener({**allocation, "id": allocation_id})
+        return True
 
     async def get_hostel_occupancy(self, hostel_id: str) -> Optional[dict]:
         """
         Get occupancy statistics for a hostel
         """
-        rooms = await self.room_repo.get_rooms_by_hostel(hostel_id)
+        table = await room_inventory.get_table()
+        totals = table.totals(table.mask(hostel_id=hostel_id))
         
-        if not rooms:
+        if not totals["rooms"]:
             return None
         
-        total_capacity = sum(room.get("capacity", 0) for room in rooms)
-        total_occupied = sum(room.get("occupied", 0) for room in rooms)
+        total_capacity = totals["capacity"]
+        total_occupied = totals["occupied"]
         total_available = total_capacity - total_occupied
         occupancy_rate = (total_occupied / total_capacity * 100) if total_capacity > 0 else 0
         
         return {
             "hostelId": hostel_id,
-            "totalRooms": len(rooms),
+            "totalRooms": totals["rooms"],
             "totalCapacity": total_capacity,
             "totalOccupied": total_occupied,
             "totalAvailable": total_available,
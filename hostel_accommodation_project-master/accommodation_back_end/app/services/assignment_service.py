@@ -0,0 +1,79 @@
+from app.repositories.applications_repo import ApplicationRepository
+from app.repositories.hostels_repo import HostelRepository
+from app.repositories.rooms_repo import RoomRepository
+from app.repositories.users_repo import UserRepository
+from app.services.allocation_service import AllocationService
+from app.services.assignment_solver import assign
+from app.schemas.allocation import AllocationCreate
+from typing import Awaitable, Callable
+import asyncio
+
+class AssignmentService:
+    def __init__(self, allocation_service: AllocationService):
+        self.application_repo = ApplicationRepository()
+        self.hostel_repo = HostelRepository()
+        self.room_repo = RoomRepository()
+        self.user_repo = UserRepository()
+        self.allocation_service = allocation_service
+
+    async def plan(self, semester: str) -> dict:
+        """
+        Compute the best bed for every approved application of a semester
+        without writing anything
+        """
+        applications = await self.application_repo.get_applications_by_status("approved", semester=semester)
+        rooms = await self.room_repo.get_all_rooms()
+        hostels = {h["id"]: h for h in await self.hostel_repo.get_hostels(is_active=True)}
+        # Gender comes from the profile, the same source allocate_room checks
+        genders = {u["id"]: u.get("gender") for u in await self.user_repo.get_users_by_role("student")}
+        for application in applications:
+            application["gender"] = genders.get(application.get("studentId"))
+
+        # Rooms in inactive hostels take no new students
+        rooms = [room for room in rooms if room.get("hostel_id") in hostels]
+
+        # New beds skip the labels current occupants hold; only rooms with
+        # both occupants and free beds need their roster
+        partly_full = [
+            room["id"] for room in rooms
+            if 0 < room.get("occupied", 0) < room.get("capacity", 0)
+        ]
+        rosters = await asyncio.gather(*(self.room_repo.get_roster(room_id) for room_id in partly_full))
+        taken_beds = {
+            room_id: {entry.get("bedLabel") for entry in roster}
+            for room_id, roster in zip(partly_full, rosters)
+        }
+        return assign(applications, rooms, hostels, taken_beds)
+
+    async def bulk_assign(self, semester: str, allocated_by: str, dry_run: bool = True,
+                          progress: Callable[..., Awaitable[None]] = None) -> dict:
+        """
+        Plan and, unless dry_run, apply the assignment. Each placement goes
+        through allocate_room so its transaction still guards capacity; any
+        placement it rejects is reported under "failed". progress, if given,
+        is awaited after each placement (see app/core/jobs.py).
+        """
+        plan = await self.plan(semester)
+        result = {"semester": semester, "dryRun": dry_run, **plan, "failed": []}
+        if dry_run:
+            return result
+
+        applied = []
+        for assignment in plan["assignments"]:
+            allocation = AllocationCreate(
+                studentId=assignment["studentId"],
+                hostelId=assignment["hostelId"],
+                roomId=assignment["roomId"],
+                bedLabel=assignment["bedLabel"],
+                semester=semester
+            )
+            try:
+                await self.allocation_service.allocate_room(allocation, allocated_by)
+                applied.append(assignment)
+            except ValueError as e:
+                result["failed"].append({**assignment, "reason": str(e)})
+            if progress is not None:
+                await progress(len(applied) + len(result["failed"]), len(plan["assignments"]), f"{len(applied)} placed")
+
+        result["assignments"] = applied
+        return result
@@ -0,0 +1,273 @@
+"""
+Bulk room assignment as a min-cost flow over NumPy arrays.
+
+Rooms with the same hostel/floor/block/amenities are collapsed into classes
+whose capacity is their free beds, so the network is students -> classes
+rather than students -> beds. Students are added one at a time along a
+shortest augmenting path (Hungarian style), which may shuffle already placed
+students between classes; an "unassigned" class priced above any possible
+score total makes the result place as many students as capacity allows and
+then maximise total preference satisfaction.
+"""
+import numpy as np
+from typing import List, Optional
+
+# Preference weights
+HOSTEL_RANK_WEIGHTS = [4.0, 3.0, 2.0, 1.0]  # 1st, 2nd, 3rd, 4th+ hostel choice
+FLOOR_WEIGHT = 2.0
+BLOCK_WEIGHT = 2.0
+AMENITY_WEIGHT = 1.0
+# Priority students (disability, final year) win beds over any preference score
+PRIORITY_WEIGHT = 100.0
+
+INFEASIBLE = np.inf
+
+def _room_class_key(room: dict) -> tuple:
+    return (
+        room.get("hostel_id"),
+        room.get("floor"),
+        room.get("block"),
+        tuple(sorted(room.get("amenities") or [])),
+    )
+
+def _is_priority(application: dict) -> bool:
+    flags = application.get("priorityFlags") or {}
+    return any(bool(v) for v in flags.values())
+
+def build_room_classes(rooms: List[dict]) -> tuple:
+    """
+    Group rooms with identical attributes. Returns (class_keys, free_beds, members)
+    where members[k] lists the rooms of class k with their free bed count.
+    """
+    index = {}
+    keys, free, members = [], [], []
+    for room in rooms:
+        if room.get("isActive") is False:
+            continue
+        available = room.get("capacity", 0) - room.get("occupied", 0)
+        if available <= 0:
+            continue
+        key = _room_class_key(room)
+        if key not in index:
+            index[key] = len(keys)
+            keys.append(key)
+            free.append(0)
+            members.append([])
+        k = index[key]
+        free[k] += available
+        members[k].append((room, available))
+    return keys, np.asarray(free, dtype=np.int64), members
+
+def score_matrix(applications: List[dict], class_keys: List[tuple], hostels: dict) -> np.ndarray:
+    """
+    Score every application against every room class. Gender-infeasible
+    pairs are INFEASIBLE; feasible pairs score by hostel rank, floor, block
+    and amenity matches, plus PRIORITY_WEIGHT for priority students.
+    """
+    n, c = len(applications), len(class_keys)
+    scores = np.zeros((n, c), dtype=np.float64)
+    if n == 0 or c == 0:
+        return scores
+
+    class_hostels = [key[0] for key in class_keys]
+    hostel_ids = sorted({h for h in class_hostels if h is not None})
+    hostel_col = {h: i for i, h in enumerate(hostel_ids)}
+    class_hostel_idx = np.array([hostel_col.get(h, -1) for h in class_hostels])
+    class_floor = np.array([np.nan if key[1] is None else key[1] for key in class_keys], dtype=np.float64)
+    class_block = np.array(["" if key[2] is None else str(key[2]) for key in class_keys])
+    amenity_names = sorted({a for key in class_keys for a in key[3]})
+    amenity_col = {a: i for i, a in enumerate(amenity_names)}
+    class_amenities = np.zeros((c, len(amenity_names)), dtype=np.float64)
+    for k, key in enumerate(class_keys):
+        for a in key[3]:
+            class_amenities[k, amenity_col[a]] = 1.0
+
+    hostel_gender = np.array([(hostels.get(h) or {}).get("gender") or "mixed" for h in hostel_ids] + ["mixed"])
+
+    # Per-application preference arrays
+    rank_scores = np.zeros((n, len(hostel_ids) + 1), dtype=np.float64)
+    want_floor = np.full(n, np.nan)
+    want_block = np.full(n, "", dtype=object)
+    want_amenities = np.zeros((n, len(amenity_names)), dtype=np.float64)
+    genders = np.empty(n, dtype=object)
+    priority = np.zeros(n, dtype=np.float64)
+
+    for i, application in enumerate(applications):
+        prefs = application.get("preferences") or {}
+        for rank, hostel_id in enumerate(prefs.get("hostelPreferred") or []):
+            col = hostel_col.get(hostel_id)
+            if col is not None and rank_scores[i, col] == 0:
+                rank_scores[i, col] = HOSTEL_RANK_WEIGHTS[min(rank, len(HOSTEL_RANK_WEIGHTS) - 1)]
+        if prefs.get("floor") is not None:
+            want_floor[i] = prefs["floor"]
+        if prefs.get("block") is not None:
+            want_block[i] = str(prefs["block"])
+        for a in prefs.get("amenities") or []:
+            col = amenity_col.get(a)
+            if col is not None:
+                want_amenities[i, col] = 1.0
+        genders[i] = application.get("gender")
+        priority[i] = PRIORITY_WEIGHT if _is_priority(application) else 0.0
+
+    scores += rank_scores[:, class_hostel_idx]
+    scores += FLOOR_WEIGHT * (want_floor[:, None] == class_floor[None, :])
+    scores += BLOCK_WEIGHT * ((want_block[:, None] == class_block[None, :]) & (want_block[:, None] != ""))
+    scores += AMENITY_WEIGHT * (want_amenities @ class_amenities.T)
+    scores += priority[:, None]
+
+    class_gender = hostel_gender[class_hostel_idx]
+    allowed = (class_gender[None, :] == "mixed") | (class_gender[None, :] == genders[:, None].astype(str))
+    scores[~allowed] = INFEASIBLE
+    return scores
+
+def solve_assignment(scores: np.ndarray, capacity: np.ndarray) -> np.ndarray:
+    """
+    Maximise total score subject to class capacities, placing as many rows
+    as possible. scores[i, k] is INFEASIBLE (np.inf) where row i may not use
+    class k. Returns the class index per row, -1 for unassigned rows.
+    """
+    n, c = scores.shape
+    placed = np.full(n, -1, dtype=np.int64)
+    if n == 0 or c == 0:
+        return placed
+
+    feasible = np.isfinite(scores)
+    finite_scores = scores[feasible]
+    spread = (finite_scores.max() - finite_scores.min() + 1.0) if finite_scores.size else 1.0
+    # Leaving a row unassigned costs more than any reshuffle of the others can gain
+    unassigned_cost = (n + 1) * spread
+
+    dummy = c
+    cost = np.full((n, c + 1), np.inf)
+    cost[:, :c] = np.where(feasible, -scores, np.inf)
+    cost[:, dummy] = unassigned_cost
+    capacity_left = np.append(capacity.astype(np.int64), n)
+
+    # move[k, j]: cheapest cost change of moving one current member of k to j
+    move = np.full((c + 1, c + 1), np.inf)
+    mover = np.full((c + 1, c + 1), -1, dtype=np.int64)
+    members = [[] for _ in range(c + 1)]
+
+    def rebuild_row(k):
+        if not members[k]:
+            move[k] = np.inf
+            mover[k] = -1
+            return
+        rows = np.asarray(members[k])
+        delta = cost[rows] - cost[rows, k][:, None]
+        best = np.argmin(delta, axis=0)
+        move[k] = delta[best, np.arange(c + 1)]
+        mover[k] = rows[best]
+        move[k, k] = np.inf
+
+    def add_to_row(k, i):
+        delta = cost[i] - cost[i, k]
+        delta[k] = np.inf
+        better = delta < move[k]
+        move[k, better] = delta[better]
+        mover[k, better] = i
+
+    def shortest_to_free():
+        # Bellman-Ford towards any class with a free bed (the dummy always has one)
+        dist = np.where(capacity_left > 0, 0.0, np.inf)
+        nxt = np.full(c + 1, -1, dtype=np.int64)
+        for _ in range(c + 1):
+            candidate = move + dist[None, :]
+            best = np.argmin(candidate, axis=1)
+            value = candidate[np.arange(c + 1), best]
+            better = value < dist - 1e-9
+            if not better.any():
+                break
+            dist[better] = value[better]
+            nxt[better] = best[better]
+        return dist, nxt
+
+    dist, nxt = shortest_to_free()
+    for i in range(n):
+        k = int(np.argmin(cost[i] + dist))
+
+        # Follow the path, bumping one member of each full class along to the next
+        student, chain = i, []
+        while capacity_left[k] == 0:
+            target = int(nxt[k])
+            bumped = int(mover[k, target])
+            members[k].remove(bumped)
+            chain.append(k)
+            members[k].append(student)
+            placed[student] = k
+            student, k = bumped, target
+        members[k].append(student)
+        placed[student] = k
+        capacity_left[k] -= 1
+
+        for changed in chain:
+            rebuild_row(changed)
+        add_to_row(k, student)
+        if chain or capacity_left[k] == 0:
+            dist, nxt = shortest_to_free()
+
+    placed[placed == dummy] = -1
+    return placed
+
+def free_bed_labels(taken: set, count: int) -> List[str]:
+    """
+    The first count "Bed N" labels not in taken. After a cancellation the
+    free bed is not necessarily the last one, so labels cannot be counted
+    on from occupied.
+    """
+    labels = []
+    n = 1
+    while len(labels) < count:
+        label = f"Bed {n}"
+        if label not in taken:
+            labels.append(label)
+        n += 1
+    return labels
+
+def assign(applications: List[dict], rooms: List[dict], hostels: dict, taken_beds: Optional[dict] = None) -> dict:
+    """
+    Compute a capacity- and gender-feasible assignment of approved applications
+    to beds that maximises preference satisfaction.
+
+    applications: dicts with id, studentId, gender, preferences, priorityFlags
+    rooms: room documents (id, hostel_id, capacity, occupied, floor, block, amenities)
+    hostels: hostel documents keyed by id (used for the gender policy)
+    taken_beds: bed labels in use, as sets keyed by room id (from the rosters)
+
+    Returns {"assignments": [...], "unassigned": [...], "totalScore": float}.
+    """
+    class_keys, free_beds, members = build_room_classes(rooms)
+    scores = score_matrix(applications, class_keys, hostels)
+    placed = solve_assignment(scores, free_beds)
+
+    # Hand out concrete beds class by class, in room order
+    beds_by_class = []
+    for k in range(len(class_keys)):
+        beds = []
+        for room, available in members[k]:
+            taken = (taken_beds or {}).get(room.get("id"), set())
+            beds.extend((room, label) for label in free_bed_labels(taken, available))
+        beds_by_class.append(beds)
+
+    assignments = []
+    unassigned = []
+    total_score = 0.0
+    class_cursor = [0] * len(class_keys)
+    for i, application in enumerate(applications):
+        k = placed[i]
+        if k < 0:
+            unassigned.append(application.get("id"))
+            continue
+        room, bed_label = beds_by_class[k][class_cursor[k]]
+        class_cursor[k] += 1
+        total_score += float(scores[i, k])
+        assignments.append({
+            "applicationId": application.get("id"),
+            "studentId": application.get("studentId"),
+            "hostelId": room.get("hostel_id"),
+            "roomId": room.get("id"),
+            "bedLabel": bed_label,
+            "score": float(scores[i, k])
+        })
+
+    return {"assignments": assignments, "unassigned": unassigned, "totalScore": round(total_score, 2)}
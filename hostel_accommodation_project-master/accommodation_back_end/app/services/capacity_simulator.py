@@ -0,0 +1,265 @@
+"""
+Semester what-if capacity simulation, vectorized across Monte Carlo runs.
+
+Replays allocate_room's rules against the bed inventory for a stream of
+applications: the application must be approved, a student gets at most one
+allocation per semester, the hostel's gender policy must admit the student
+(unset or "mixed" admits everyone) and the room must have a free bed. Beds
+within a hostel are interchangeable under those rules, so the state is the
+free beds per hostel; rooms are collapsed with RoomTable.hostel_totals.
+
+Every run processes its own stream in arrival order, and all runs advance
+one arrival per step, so each step is a handful of NumPy operations over a
+(runs x hostels) array. Each applicant is tried against their preferred
+hostels in order, then (unless preferred_only) any hostel that admits them.
+
+Streams come from SyntheticStream (gender mix, approval, duplicate and
+preference rates) or HistoricalStream (a bootstrap of a past semester's
+applications, with arrival times following its submission curve).
+"""
+from app.services.room_inventory import RoomTable
+from datetime import datetime
+from typing import Dict, List, Optional
+import numpy as np
+
+GENDERS = ["male", "female"]
+OTHER_GENDER = len(GENDERS)
+REASONS = ["not_approved", "duplicate", "gender", "full"]
+NOT_APPROVED, DUPLICATE, GENDER, FULL = range(len(REASONS))
+FILL_MILESTONES = [0.5, 0.9, 1.0]
+PERCENTILES = [5, 50, 95]
+PREFERENCE_POOL = 1 << 16
+
+def _gender_code(gender: Optional[str]) -> int:
+    return GENDERS.index(gender) if gender in GENDERS else OTHER_GENDER
+
+def hostel_inventory(table: RoomTable, hostels: Dict[str, dict], keep_occupied: bool = False) -> dict:
+    """
+    Free beds and gender policy per active hostel. By default every bed
+    counts as free, as after a semester rollover; keep_occupied starts from
+    the current occupancy instead.
+    """
+    totals = table.hostel_totals(table.mask(active_only=True))
+    ids = [h for h in totals if h in hostels and hostels[h].get("isActive", True) is not False]
+    beds = np.array([totals[h]["free"] if keep_occupied else totals[h]["capacity"] for h in ids], dtype=np.int64)
+    # admits[g, h]: may a student of gender code g take a bed in hostel h
+    admits = np.zeros((len(GENDERS) + 1, len(ids)), dtype=bool)
+    for col, hostel_id in enumerate(ids):
+        policy = hostels[hostel_id].get("gender")
+        if not policy or policy == "mixed":
+            admits[:, col] = True
+        elif policy in GENDERS:
+            admits[GENDERS.index(policy), col] = True
+    return {"hostelIds": ids, "beds": beds, "admits": admits}
+
+class SyntheticStream:
+    """
+    Applicants drawn independently per run: gender by female_share and
+    other_share (the rest male), `preferences` distinct hostels drawn by
+    popularity, arrivals uniform over `days`.
+    """
+
+    def __init__(self, intake: int, hostel_count: int, days: float = 30.0, female_share: float = 0.5,
+                 other_share: float = 0.0, approval_rate: float = 1.0, duplicate_rate: float = 0.0,
+                 preferences: int = 3, popularity: np.ndarray = None):
+        self.intake = intake
+        self.days = days
+        self.female_share = female_share
+        self.other_share = other_share
+        self.approval_rate = approval_rate
+        self.duplicate_rate = duplicate_rate
+        self.preferences = min(preferences, hostel_count)
+        weights = np.ones(hostel_count) if popularity is None else np.asarray(popularity, dtype=np.float64)
+        self.popularity = weights / weights.sum() if weights.sum() > 0 else np.full(hostel_count, 1 / max(hostel_count, 1))
+
+    def arrivals(self, rng: np.random.Generator, runs: int) -> np.ndarray:
+        if self.preferences:
+            # Gumbel top-k: k distinct hostels weighted by popularity. Drawn once
+            # into a pool and resampled per step, which is far cheaper than
+            # len(popularity) Gumbel draws per applicant.
+            keys = np.log(self.popularity + 1e-300)[None, :] + rng.gumbel(size=(PREFERENCE_POOL, len(self.popularity)))
+            self._pool = np.argsort(-keys, axis=1)[:, :self.preferences]
+        # Sorted uniform arrivals for every run: order statistics via cumulative exponentials
+        gaps = rng.exponential(size=(runs, self.intake + 1))
+        spacing = np.cumsum(gaps, axis=1)
+        return (spacing[:, :-1] / spacing[:, -1:] * self.days).astype(np.float32)
+
+    def draw(self, rng: np.random.Generator, runs: int, step: int) -> tuple:
+        """
+        (gender codes, preference hostel indices [runs, k] with -1 padding, approved, duplicate-of step or -1)
+        """
+        u = rng.random(runs)
+        gender = np.where(u < self.female_share, 1, np.where(u < self.female_share + self.other_share, OTHER_GENDER, 0))
+        if self.preferences:
+            prefs = self._pool[rng.integers(0, len(self._pool), size=runs)]
+        else:
+            prefs = np.full((runs, 0), -1)
+        approved = rng.random(runs) < self.approval_rate
+        duplicate_of = np.full(runs, -1)
+        if step > 0 and self.duplicate_rate > 0:
+            repeat = rng.random(runs) < self.duplicate_rate
+            duplicate_of[repeat] = rng.integers(0, step, size=int(repeat.sum()))
+        return gender, prefs, approved, duplicate_of
+
+class HistoricalStream:
+    """
+    Bootstrap of a past semester: each arrival is a past application drawn
+    with replacement (its gender, preferences and outcome), arriving at the
+    matching point of that semester's submission curve. Pending applications
+    are approved at the semester's observed approval rate, and students who
+    applied more than once set the duplicate rate.
+    """
+
+    def __init__(self, applications: List[dict], genders: Dict[str, str], hostel_ids: List[str],
+                 intake: int = None, preferences: int = 3):
+        columns = {h: i for i, h in enumerate(hostel_ids)}
+        if not applications:
+            raise ValueError("No historical applications to replay")
+
+        applications = sorted(applications, key=lambda a: _timestamp(a.get("submittedAt") or a.get("createdAt")))
+        self.intake = intake or len(applications)
+        self.gender = np.array([_gender_code(genders.get(a.get("studentId"))) for a in applications])
+        self.prefs = np.full((len(applications), preferences), -1)
+        for i, application in enumerate(applications):
+            wanted = [columns[h] for h in ((application.get("preferences") or {}).get("hostelPreferred") or []) if h in columns]
+            wanted = list(dict.fromkeys(wanted))[:preferences]
+            self.prefs[i, :len(wanted)] = wanted
+
+        status = np.array([a.get("status") for a in applications])
+        decided_yes = np.isin(status, ["approved", "allocated"])
+        decided = decided_yes | (status == "rejected")
+        self.approval_rate = float(decided_yes.sum() / decided.sum()) if decided.any() else 1.0
+        # 1 approved, 0 rejected, NaN still pending: drawn at approval_rate
+        self.outcome = np.where(decided_yes, 1.0, np.where(decided, 0.0, np.nan))
+
+        students = [a.get("studentId") for a in applications]
+        self.duplicate_rate = 1 - len(set(students)) / len(students)
+
+        times = np.array([_timestamp(a.get("submittedAt") or a.get("createdAt")) for a in applications], dtype=np.float64)
+        times = (times - times[0]) / 86400.0
+        self.curve = times
+        self.days = float(times[-1]) if len(times) else 0.0
+
+    def arrivals(self, rng: np.random.Generator, runs: int) -> np.ndarray:
+        # The i-th of `intake` arrivals lands at the same quantile of the past submission curve
+        quantiles = (np.arange(self.intake) + 0.5) / self.intake
+        at = np.interp(quantiles, np.linspace(0, 1, len(self.curve)), self.curve)
+        return np.broadcast_to(at.astype(np.float32), (runs, self.intake))
+
+    def draw(self, rng: np.random.Generator, runs: int, step: int) -> tuple:
+        picked = rng.integers(0, len(self.gender), size=runs)
+        outcome = self.outcome[picked]
+        approved = np.where(np.isnan(outcome), rng.random(runs) < self.approval_rate, outcome == 1.0)
+        duplicate_of = np.full(runs, -1)
+        if step > 0 and self.duplicate_rate > 0:
+            repeat = rng.random(runs) < self.duplicate_rate
+            duplicate_of[repeat] = rng.integers(0, step, size=int(repeat.sum()))
+        return self.gender[picked], self.prefs[picked], approved, duplicate_of
+
+def _timestamp(value) -> float:
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, str):
+        return datetime.fromisoformat(value).timestamp()
+    return 0.0
+
+def simulate(inventory: dict, stream, runs: int = 1000, preferred_only: bool = False, seed: int = None) -> dict:
+    """
+    Run `runs` independent replays of `stream` against `inventory`
+    (from hostel_inventory) and summarise them
+    """
+    rng = np.random.default_rng(seed)
+    beds = inventory["beds"]
+    admits = inventory["admits"]
+    hostel_count = len(beds)
+    total_beds = int(beds.sum())
+    intake = stream.intake
+
+    free = np.broadcast_to(beds, (runs, hostel_count)).copy()
+    rows = np.arange(runs)
+    # A repeat request belongs to the student of the arrival it repeats
+    student = np.zeros((runs, intake), dtype=np.int32)
+    allocated = np.zeros((runs, intake), dtype=bool)   # per student, indexed by first arrival
+    rejected = np.zeros((runs, len(REASONS)), dtype=np.int64)
+    placed_count = np.zeros(runs, dtype=np.int64)
+    milestones = np.array([int(np.ceil(m * total_beds)) for m in FILL_MILESTONES])
+    fill_day = np.full((runs, len(milestones)), np.nan)
+    arrivals = stream.arrivals(rng, runs)
+
+    for step in range(intake):
+        gender, prefs, approved, duplicate_of = stream.draw(rng, runs, step)
+        allowed = admits[gender]                      # (runs, hostels)
+        open_beds = free > 0
+
+        repeat = duplicate_of >= 0
+        student[:, step] = step
+        student[repeat, step] = student[rows[repeat], duplicate_of[repeat]]
+        already = allocated[rows, student[:, step]]
+
+        choice = np.full(runs, -1)
+        for rank in range(prefs.shape[1]):
+            hostel = prefs[:, rank]
+            valid = hostel >= 0
+            column = np.where(valid, hostel, 0)
+            take = (choice < 0) & valid & allowed[rows, column] & open_beds[rows, column]
+            choice[take] = column[take]
+        if not preferred_only:
+            # Fall back to the first hostel that admits the student and has a bed
+            fallback = allowed & open_beds
+            anywhere = fallback.any(axis=1)
+            need = (choice < 0) & anywhere
+            choice[need] = fallback[need].argmax(axis=1)
+
+        eligible = approved & ~already
+        placed = eligible & (choice >= 0)
+        free[rows[placed], choice[placed]] -= 1
+        allocated[rows[placed], student[placed, step]] = True
+        placed_count += placed
+
+        # One reason per rejection, in the order allocate_room checks them
+        rejected[:, NOT_APPROVED] += ~approved
+        rejected[:, DUPLICATE] += approved & already
+        unplaced = eligible & (choice < 0)
+        if preferred_only and prefs.shape[1]:
+            considered = prefs >= 0
+            any_admits = (allowed[rows[:, None], np.where(considered, prefs, 0)] & considered).any(axis=1)
+        else:
+            any_admits = allowed.any(axis=1)
+        rejected[:, GENDER] += unplaced & ~any_admits
+        rejected[:, FULL] += unplaced & any_admits
+
+        reached = (placed_count[:, None] >= milestones[None, :]) & np.isnan(fill_day) & placed[:, None]
+        if reached.any():
+            fill_day[reached] = np.broadcast_to(arrivals[:, step][:, None], fill_day.shape)[reached]
+
+    used = beds[None, :] - free
+    fill_rate = placed_count / total_beds if total_beds else np.zeros(runs)
+    hostel_fill = np.where(beds > 0, used / np.maximum(beds, 1), 0.0)
+
+    def spread(values: np.ndarray) -> dict:
+        return {f"p{p}": round(float(v), 4) for p, v in zip(PERCENTILES, np.percentile(values, PERCENTILES))}
+
+    fill_times = {}
+    for m, milestone in enumerate(FILL_MILESTONES):
+        days = fill_day[:, m]
+        reached_runs = ~np.isnan(days)
+        fill_times[f"{int(milestone * 100)}%"] = {
+            "runsReaching": round(float(reached_runs.mean()), 4),
+            "days": spread(days[reached_runs]) if reached_runs.any() else None,
+        }
+
+    return {
+        "runs": runs,
+        "intake": intake,
+        "totalBeds": total_beds,
+        "placed": spread(placed_count),
+        "fillRate": spread(fill_rate),
+        # Share of runs where no eligible applicant was turned away for lack of a bed
+        "probabilityAllPlaced": round(float((rejected[:, GENDER] + rejected[:, FULL] == 0).mean()), 4),
+        "rejections": {reason: spread(rejected[:, r]) for r, reason in enumerate(REASONS)},
+        "timeToFill": fill_times,
+        "hostels": [
+            {"hostelId": hostel_id, "beds": int(beds[h]), "fillRate": spread(hostel_fill[:, h])}
+            for h, hostel_id in enumerate(inventory["hostelIds"])
+        ],
+    }
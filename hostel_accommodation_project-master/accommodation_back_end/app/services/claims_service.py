@@ -0,0 +1,35 @@
+from firebase_admin import auth
+from app.utils.constants import PROFILE_CLAIMS
+from typing import Optional
+
+class ClaimsService:
+    async def sync_user_claims(self, uid: str, updates: dict) -> bool:
+        """
+        Merge profile fields into the user's Firebase custom claims.
+        Only PROFILE_CLAIMS are touched; a None value removes the claim.
+        Returns False when the claims were already up to date.
+        New claims reach the client on its next ID token refresh.
+        """
+        current = auth.get_user(uid).custom_claims or {}
+        claims = dict(current)
+        for field in PROFILE_CLAIMS:
+            if field not in updates:
+                continue
+            if updates[field] is None:
+                claims.pop(field, None)
+            else:
+                claims[field] = updates[field]
+
+        if claims == current:
+            return False
+
+        auth.set_custom_user_claims(uid, claims)
+        return True
+
+    async def sync_from_profile(self, uid: str, profile: Optional[dict]) -> bool:
+        """
+        Rewrite the claims from a full user profile (used by the backfill job)
+        """
+        if not profile:
+            return False
+        return await self.sync_user_claims(uid, {field: profile.get(field) for field in PROFILE_CLAIMS})
@@ -0,0 +1,128 @@
+from app.repositories.allocations_repo import AllocationRepository
+from app.repositories.applications_repo import ApplicationRepository
+from app.repositories.hostels_repo import HostelRepository
+from app.repositories.rooms_repo import RoomRepository
+from app.repositories.users_repo import UserRepository
+from app.repositories.waitlist_repo import WaitlistRepository
+from app.core.cache import read_cache
+from app.services.room_inventory import room_inventory
+from collections import defaultdict
+import asyncio
+
+# The frontend files new applications as "pending"
+PENDING_STATUSES = ["pending", "submitted", "under_review"]
+DECIDED_STATUSES = ["approved", "allocated", "rejected"]
+
+class DashboardService:
+    """
+    Builds each role's dashboard in one request: independent reads run
+    concurrently (repositories hand their round trips to worker threads)
+    and shared data (rooms, hostels) is fetched once.
+    """
+
+    def __init__(self):
+        self.allocation_repo = AllocationRepository()
+        self.application_repo = ApplicationRepository()
+        self.hostel_repo = HostelRepository()
+        self.room_repo = RoomRepository()
+        self.user_repo = UserRepository()
+        self.waitlist_repo = WaitlistRepository()
+
+    async def get_student_dashboard(self, uid: str) -> dict:
+        profile, applications, allocations, waitlist, hostels, inventory = await asyncio.gather(
+            self.user_repo.get_user_by_id(uid),
+            self.application_repo.get_applications_by_student(uid),
+            self.allocation_repo.get_allocations_by_user(uid),
+            self.waitlist_repo.get_entries_by_student(uid),
+            read_cache.get(("hostels", None, True), lambda: self.hostel_repo.get_hostels(is_active=True)),
+            room_inventory.get_table(),
+        )
+
+        # Free beds per hostel come from the in-memory inventory, not a room list
+        available = {hostel_id: totals["free"] for hostel_id, totals in inventory.hostel_totals().items()}
+
+        allocation = next((a for a in allocations if a.get("status") == "active"), None)
+        hostel_names = {h["id"]: h.get("name") for h in hostels}
+        if allocation:
+            # Capacity and occupancy from the inventory; the room number is stored on the
+            # allocation, so only allocations made before it was cost a room read
+            room = inventory.get(allocation.get("roomId")) or {}
+            room_number = allocation.get("roomNumber")
+            if room_number is None:
+                room_number = (await self.room_repo.get_room_by_id(allocation.get("roomId")) or {}).get("room_number")
+            allocation = {
+                **allocation,
+                "hostelName": hostel_names.get(allocation.get("hostelId")),
+                "roomNumber": room_number,
+                "capacity": room.get("capacity"),
+                "occupied": room.get("occupied"),
+            }
+
+        return {
+            "role": "student",
+            "profile": profile,
+            "applications": applications,
+            "allocation": allocation,
+            "waitlist": [e for e in waitlist if e.get("status") == "waiting"],
+            "hostels": [
+                {"id": h["id"], "name": h.get("name"), "gender": h.get("gender"), "availableBeds": available.get(h["id"], 0)}
+                for h in hostels
+            ],
+        }
+
+    async def get_warden_dashboard(self) -> dict:
+        rooms, hostels, pending, student_count, *decided = await asyncio.gather(
+            read_cache.get(("rooms", None), self.room_repo.get_all_rooms),
+            read_cache.get(("hostels", None, None), self.hostel_repo.get_hostels),
+            self.application_repo.get_applications_by_statuses(PENDING_STATUSES),
+            self.user_repo.count_users_by_role("student"),
+            *(self.application_repo.count_applications_by_status(status) for status in DECIDED_STATUSES),
+        )
+
+        # One pass over the rooms feeds both the room list and the occupancy figures
+        by_hostel = defaultdict(lambda: {"rooms": 0, "capacity": 0, "occupied": 0})
+        room_list = []
+        for room in rooms:
+            capacity, occupied = room.get("capacity", 0), room.get("occupied", 0)
+            totals = by_hostel[room.get("hostel_id")]
+            totals["rooms"] += 1
+            totals["capacity"] += capacity
+            totals["occupied"] += occupied
+            room_list.append({
+                "id": room.get("id"),
+                "hostelId": room.get("hostel_id"),
+                "roomNumber": room.get("room_number"),
+                "capacity": capacity,
+                "occupied": occupied,
+            })
+
+        occupancy = []
+        for hostel in hostels:
+            totals = by_hostel.get(hostel["id"], {"rooms": 0, "capacity": 0, "occupied": 0})
+            rate = (totals["occupied"] / totals["capacity"] * 100) if totals["capacity"] > 0 else 0
+            occupancy.append({
+                "hostelId": hostel["id"],
+                "name": hostel.get("name"),
+                "gender": hostel.get("gender"),
+                "isActive": hostel.get("isActive", True),
+                "totalRooms": totals["rooms"],
+                "totalCapacity": totals["capacity"],
+                "totalOccupied": totals["occupied"],
+                "occupancyRate": round(rate, 2),
+            })
+
+        total_capacity = sum(t["capacity"] for t in by_hostel.values())
+        total_occupied = sum(t["occupied"] for t in by_hostel.values())
+        return {
+            "role": "warden",
+            "stats": {
+                "totalStudents": student_count,
+                "allocated": total_occupied,
+                "availableBeds": total_capacity - total_occupied,
+                "pendingApplications": len(pending),
+            },
+            "applicationCounts": {"pending": len(pending), **dict(zip(DECIDED_STATUSES, decided))},
+            "occupancy": occupancy,
+            "rooms": room_list,
+            "pendingApplications": pending,
+        }
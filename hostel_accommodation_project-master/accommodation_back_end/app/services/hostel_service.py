@@ -0,0 +1,45 @@
+from app.repositories.hostels_repo import HostelRepository
+from app.schemas.hostel import HostelCreate, HostelUpdate, HostelOut
+from app.core.cache import read_cache
+from app.core.responses import prevalidate
+from app.services.room_inventory import room_inventory
+from typing import List, Optional
+
+class HostelService:
+    def __init__(self):
+        self.hostel_repo = HostelRepository()
+
+    async def create_hostel(self, hostel: HostelCreate, created_by: str) -> dict:
+        created = await self.hostel_repo.create_hostel(hostel, created_by)
+        await read_cache.invalidate("hostels")
+        return created
+
+    async def get_hostel(self, hostel_id: str) -> Optional[dict]:
+        return await self.hostel_repo.get_hostel_by_id(hostel_id)
+
+    async def get_hostels(self, gender: Optional[str] = None, is_active: Optional[bool] = None) -> List[dict]:
+        return await read_cache.get(
+            ("hostels", gender, is_active),
+            lambda: self.hostel_repo.get_hostels(gender=gender, is_active=is_active)
+        )
+
+    async def get_hostel_list(self, gender: Optional[str] = None, is_active: Optional[bool] = None) -> List[dict]:
+        """
+        get_hostels validated as HostelOut once per load, for FastJSONResponse
+        """
+        async def load():
+            return prevalidate(HostelOut, await self.get_hostels(gender=gender, is_active=is_active))
+        return await read_cache.get(("hostels", gender, is_active, "out"), load)
+
+    async def update_hostel(self, hostel_id: str, update_data: HostelUpdate) -> Optional[dict]:
+        updated = await self.hostel_repo.update_hostel(hostel_id, update_data)
+        await read_cache.invalidate("hostels")
+        return updated
+
+    async def delete_hostel(self, hostel_id: str) -> bool:
+        """
+        Deactivate a hostel rather than deleting it, so allocation history stays valid
+        """
+        deactivated = await self.hostel_repo.deactivate_hostel(hostel_id)
+        await read_cache.invalidate("hostels")
+        return deactivated
@@ -0,0 +1,155 @@
+"""
+Per-hostel occupancy over time, for trend charts.
+
+Every allocation, cancellation and rollover appends an event to
+occupancy_events (hostel, change, occupancy after it) and folds it into an
+hourly and a daily bucket in occupancy_buckets in the same write. A bucket
+holds the occupancy at its latest change, the lowest and highest level
+during the bucket, and how many beds were taken and released. Range
+queries read only buckets: one document per hour or day, never the
+allocations collection.
+
+Levels are summed from the hostel's room documents in the transaction that
+writes the event and buckets, after the change was committed, so every
+worker records the level Firestore holds rather than its own view of it.
+The room inventory (app/services/room_inventory.py) only maps rooms to
+hostels.
+
+Storage stays bounded: events are kept for OCCUPANCY_EVENTS_RETENTION_DAYS,
+hourly buckets for OCCUPANCY_HOURLY_RETENTION_DAYS and daily buckets for
+OCCUPANCY_DAILY_RETENTION_DAYS. Each document carries its expireAt, for a
+Firestore TTL policy; compact() deletes expired documents itself, run as
+the occupancy_compaction job.
+"""
+from app.core.config import (
+    OCCUPANCY_DAILY_RETENTION_DAYS, OCCUPANCY_EVENTS_RETENTION_DAYS, OCCUPANCY_HISTORY_MAX_POINTS,
+    OCCUPANCY_HOURLY_RETENTION_DAYS
+)
+from app.core.firebase import OCCUPANCY_EVENTS_COLLECTION, OCCUPANCY_BUCKETS_COLLECTION
+from app.repositories.occupancy_history_repo import OccupancyHistoryRepository
+from app.repositories.rooms_repo import RoomRepository
+from app.services.room_inventory import room_inventory
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, List
+import time
+
+RESOLUTIONS = {"hour": timedelta(hours=1), "day": timedelta(days=1)}
+RETENTION = {
+    "hour": timedelta(days=OCCUPANCY_HOURLY_RETENTION_DAYS),
+    "day": timedelta(days=OCCUPANCY_DAILY_RETENTION_DAYS),
+}
+
+def bucket_start(at: datetime, resolution: str) -> datetime:
+    at = at.astimezone(timezone.utc)
+    if resolution == "hour":
+        return at.replace(minute=0, second=0, microsecond=0)
+    return at.replace(hour=0, minute=0, second=0, microsecond=0)
+
+def _utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+class OccupancyHistoryService:
+    def __init__(self):
+        self.history_repo = OccupancyHistoryRepository()
+        self.room_repo = RoomRepository()
+
+    async def record(self, deltas: Dict[str, int], reason: str, at: datetime = None) -> None:
+        """
+        Record occupancy changes given per room ({room_id: +1/-1/...}),
+        once they are committed to the room documents
+        """
+        deltas = {room_id: delta for room_id, delta in deltas.items() if room_id and delta}
+        table = await room_inventory.get_table()
+        hostels = {room_id: table.get(room_id)["hostel_id"] for room_id in deltas if room_id in table}
+        unknown = [room_id for room_id in deltas if room_id not in hostels]
+        if unknown:
+            # Created on another worker since this one's inventory was loaded
+            rooms = await self.room_repo.get_rooms_by_ids(unknown)
+            hostels.update({room_id: room.get("hostel_id") for room_id, room in rooms.items()})
+
+        by_hostel = defaultdict(lambda: [0, 0])   # hostel -> [allocated, released]
+        for room_id, delta in deltas.items():
+            if hostels.get(room_id) is not None:
+                by_hostel[hostels[room_id]][0 if delta > 0 else 1] += abs(delta)
+        if not by_hostel:
+            return
+
+        at = at or datetime.now(timezone.utc)
+        changes = []
+        for hostel_id, (allocated, released) in by_hostel.items():
+            changes.append({
+                "hostelId": hostel_id,
+                "at": at,
+                "reason": reason,
+                "allocated": allocated,
+                "released": released,
+                "eventExpireAt": at + timedelta(days=OCCUPANCY_EVENTS_RETENTION_DAYS),
+                "buckets": [
+                    {"resolution": resolution, "start": start, "expireAt": start + RETENTION[resolution]}
+                    for resolution, start in ((r, bucket_start(at, r)) for r in RESOLUTIONS)
+                ],
+            })
+        await self.history_repo.record(changes)
+
+    async def get_history(self, hostel_id: str, resolution: str, start: datetime, end: datetime) -> dict:
+        """
+        One point per bucket from start to end. Buckets without changes carry
+        the level forward from the last bucket before them.
+        """
+        if resolution not in RESOLUTIONS:
+            raise ValueError(f"resolution must be one of {', '.join(RESOLUTIONS)}")
+        step = RESOLUTIONS[resolution]
+        start, end = _utc(start), _utc(end)
+        if end <= start:
+            raise ValueError("end must be after start")
+        start = bucket_start(start, resolution)
+        if (end - start) / step > OCCUPANCY_HISTORY_MAX_POINTS:
+            raise ValueError(f"At most {OCCUPANCY_HISTORY_MAX_POINTS} points per query; use a shorter range or daily resolution")
+
+        stored = {_utc(b["start"]): b for b in await self.history_repo.get_buckets(hostel_id, resolution, start, end)}
+        previous = await self.history_repo.get_bucket_before(hostel_id, resolution, start)
+        level = previous.get("occupied") if previous else None
+        capacity = previous.get("capacity") if previous else None
+
+        points = []
+        cursor = start
+        while cursor < end:
+            bucket = stored.get(cursor)
+            if bucket is not None:
+                level, capacity = bucket.get("occupied"), bucket.get("capacity")
+                point = {
+                    "start": cursor,
+                    "occupied": level,
+                    "min": bucket.get("min", level),
+                    "max": bucket.get("max", level),
+                    "capacity": capacity,
+                    "allocated": bucket.get("allocated", 0),
+                    "released": bucket.get("released", 0),
+                }
+            else:
+                point = {"start": cursor, "occupied": level, "min": level, "max": level, "capacity": capacity,
+                         "allocated": 0, "released": 0}
+            point["occupancyRate"] = round(level / capacity * 100, 2) if level is not None and capacity else None
+            points.append(point)
+            cursor += step
+
+        return {"hostelId": hostel_id, "resolution": resolution, "start": start, "end": end, "points": points}
+
+    async def compact(self, progress: Callable[..., Awaitable[None]] = None) -> dict:
+        """
+        Delete events and buckets past their retention
+        """
+        started = time.perf_counter()
+        now = datetime.now(timezone.utc)
+        deleted = {}
+        for collection in (OCCUPANCY_EVENTS_COLLECTION, OCCUPANCY_BUCKETS_COLLECTION):
+            deleted[collection] = 0
+            while True:
+                count = await self.history_repo.delete_expired(collection, now)
+                deleted[collection] += count
+                if progress is not None:
+                    await progress(sum(deleted.values()), None, f"{deleted[collection]} expired {collection} deleted")
+                if not count:
+                    break
+        return {"deleted": deleted, "elapsedSeconds": round(time.perf_counter() - started, 3)}
@@ -0,0 +1,252 @@
+from firebase_admin import firestore
+from firebase_admin.exceptions import FirebaseError
+from google.cloud.firestore_v1 import transactional
+from google.cloud.firestore_v1.field_path import FieldPath
+from app.core.firebase import (
+    db,
+    ALLOCATIONS_COLLECTION,
+    ALLOCATION_ARCHIVES_COLLECTION,
+    ALLOCATIONS_INDEX_COLLECTION,
+    ROLLOVER_CHECKPOINTS_COLLECTION,
+    ROOMS_COLLECTION,
+    ROOM_ROSTER_SUBCOLLECTION,
+)
+from app.core.config import ROLLOVER_LEASE_SECONDS
+from app.core.exceptions import RolloverInProgressError
+from app.services.allocation_service import student_lock_id
+from app.services.claims_service import ClaimsService
+from app.core.cache import read_cache
+from app.services.room_inventory import room_inventory
+from app.services.occupancy_history_service import OccupancyHistoryService
+from app.utils.concurrency import run_blocking
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, List
+import logging
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# Each archived allocation costs up to four writes (archive set, live delete,
+# allocations_index lock delete, room roster delete), plus one occupancy update
+# per room and the checkpoint, all under Firestore's 500-write cap.
+DEFAULT_BATCH_SIZE = 95
+
+class RolloverService:
+    def __init__(self):
+        self.allocations = db.collection(ALLOCATIONS_COLLECTION)
+        self.rooms = db.collection(ROOMS_COLLECTION)
+        self.checkpoints = db.collection(ROLLOVER_CHECKPOINTS_COLLECTION)
+        self.index = db.collection(ALLOCATIONS_INDEX_COLLECTION)
+        self.claims_service = ClaimsService()
+        self.history_service = OccupancyHistoryService()
+
+    def archive_collection(self, semester: str):
+        return db.collection(ALLOCATION_ARCHIVES_COLLECTION).document(semester).collection("allocations")
+
+    async def get_checkpoint(self, semester: str) -> dict:
+        doc = await run_blocking(self.checkpoints.document(semester).get)
+        return doc.to_dict() if doc.exists else {}
+
+    async def rollover_semester(self, semester: str, batch_size: int = DEFAULT_BATCH_SIZE, restart: bool = False,
+                                progress: Callable[..., Awaitable[None]] = None) -> dict:
+        """
+        Close out a semester: mark its active allocations completed, move every
+        allocation for the semester into allocation_archives/{semester}/allocations
+        and release the beds they held.
+
+        A run holds a lease on the semester's checkpoint, renewed with every
+        batch; while another run holds it, RolloverInProgressError is raised.
+        Each batch re-reads its allocations, archives the documents, deletes
+        them from the live collection, decrements rooms.occupied and advances
+        the checkpoint in one transaction, so an interrupted run resumes
+        exactly where it stopped and no allocation releases its bed twice.
+        progress, if given, is awaited after each batch (see app/core/jobs.py).
+        """
+        if batch_size < 1 or batch_size > DEFAULT_BATCH_SIZE:
+            raise ValueError(f"batch_size must be between 1 and {DEFAULT_BATCH_SIZE}")
+
+        owner = uuid.uuid4().hex
+        checkpoint = await run_blocking(self._acquire_lease, semester, owner, restart)
+        if checkpoint.get("status") == "completed":
+            return checkpoint
+
+        try:
+            return await self._run(semester, owner, checkpoint, batch_size, progress)
+        except BaseException:
+            # Let a retry start at once instead of waiting out the lease
+            await self._release_lease(semester, owner)
+            raise
+
+    async def _run(self, semester: str, owner: str, checkpoint: dict, batch_size: int,
+                   progress: Callable[..., Awaitable[None]]) -> dict:
+        started = time.perf_counter()
+        moved_this_run = 0
+        total = None
+        if progress is not None:
+            remaining = (await run_blocking(self.allocations.where("semester", "==", semester).count().get))[0][0].value
+            total = checkpoint["moved"] + remaining
+
+        while True:
+            # Archived documents leave the live collection, so the next page
+            # always starts at the front of what is left for this semester.
+            query = (
+                self.allocations.where("semester", "==", semester)
+                .order_by(FieldPath.document_id())
+                .limit(batch_size)
+            )
+            refs = [doc.reference for doc in await run_blocking(query.get)]
+            if not refs:
+                break
+
+            checkpoint, released, students, moved = await run_blocking(self._archive_batch, semester, owner, refs)
+            moved_this_run += moved
+            if released:
+                await read_cache.invalidate("rooms")
+                deltas = {room_id: -count for room_id, count in released.items()}
+                try:
+                    await self.history_service.record(deltas, "rollover")
+                except Exception:
+                    logger.exception("occupancy history not recorded", extra={"semester": semester})
+                await room_inventory.occupancy_changed(deltas)
+
+            for student_id in students:
+                if student_id:
+                    # The batch is committed; one missing Auth account must not stop the rollover
+                    try:
+                        await self.claims_service.sync_user_claims(student_id, {"hostelId": None})
+                    except FirebaseError:
+                        logger.exception("custom claims not synced", extra={"studentId": student_id})
+            if progress is not None:
+                await progress(checkpoint["moved"], total, f"{checkpoint['completed']} allocations completed")
+
+        elapsed = time.perf_counter() - started
+        result = {
+            "semester": semester,
+            "status": "completed",
+            "moved": checkpoint["moved"],
+            "completed": checkpoint["completed"],
+            "movedThisRun": moved_this_run,
+            "elapsedSeconds": round(elapsed, 3),
+            "docsPerSecond": round(moved_this_run / elapsed, 1) if elapsed > 0 else 0.0,
+            "updatedAt": datetime.utcnow()
+        }
+        await run_blocking(self._finish, semester, owner, result)
+        return result
+
+    def _read_checkpoint(self, transaction, semester: str, owner: str, extra_refs: List = ()) -> tuple:
+        """
+        The checkpoint (and extra_refs' snapshots by path), provided owner holds the lease
+        """
+        checkpoint_ref = self.checkpoints.document(semester)
+        snapshots = {doc.reference.path: doc for doc in transaction.get_all([checkpoint_ref, *extra_refs])}
+        checkpoint_doc = snapshots[checkpoint_ref.path]
+        checkpoint = checkpoint_doc.to_dict() if checkpoint_doc.exists else {}
+        if checkpoint.get("leaseOwner") != owner:
+            raise RolloverInProgressError(f"Another run has taken over the rollover of {semester}")
+        return checkpoint_ref, checkpoint, snapshots
+
+    def _lease_until(self) -> datetime:
+        return datetime.now(timezone.utc) + timedelta(seconds=ROLLOVER_LEASE_SECONDS)
+
+    def _acquire_lease(self, semester: str, owner: str, restart: bool) -> dict:
+        checkpoint_ref = self.checkpoints.document(semester)
+
+        @transactional
+        def acquire(transaction):
+            [doc] = transaction.get_all([checkpoint_ref])
+            checkpoint = doc.to_dict() if doc.exists else {}
+            expires = checkpoint.get("leaseExpiresAt")
+            if checkpoint.get("leaseOwner") and expires is not None and expires > datetime.now(timezone.utc):
+                raise RolloverInProgressError(f"A rollover of {semester} is already running")
+            if checkpoint.get("status") == "completed" and not restart:
+                return checkpoint
+
+            previous = {} if restart else checkpoint
+            checkpoint = {
+                "semester": semester,
+                "status": "running",
+                "moved": previous.get("moved", 0),
+                "completed": previous.get("completed", 0),
+                "lastDocId": previous.get("lastDocId"),
+                "leaseOwner": owner,
+                "leaseExpiresAt": self._lease_until(),
+                "updatedAt": datetime.utcnow()
+            }
+            transaction.set(checkpoint_ref, checkpoint)
+            return checkpoint
+
+        return acquire(db.transaction())
+
+    def _archive_batch(self, semester: str, owner: str, refs: List) -> tuple:
+        """
+        Archive the allocations at refs that still exist; returns
+        (checkpoint, beds released per room, students completed, documents moved)
+        """
+        archive = self.archive_collection(semester)
+
+        @transactional
+        def archive_batch(transaction):
+            checkpoint_ref, checkpoint, snapshots = self._read_checkpoint(transaction, semester, owner, refs)
+            released = Counter()
+            students = []
+            moved = 0
+            for ref in refs:
+                doc = snapshots[ref.path]
+                if not doc.exists:
+                    # Archived since the page was read: its bed is already released
+                    continue
+                allocation = doc.to_dict()
+                if allocation.get("status") == "active":
+                    allocation["status"] = "completed"
+                    allocation["completedAt"] = firestore.SERVER_TIMESTAMP
+                    released[allocation.get("roomId")] += 1
+                    students.append(allocation.get("studentId"))
+                    if allocation.get("studentId"):
+                        transaction.delete(self.index.document(student_lock_id(allocation["studentId"], semester)))
+                    if allocation.get("roomId"):
+                        transaction.delete(self.rooms.document(allocation["roomId"]).collection(ROOM_ROSTER_SUBCOLLECTION).document(ref.id))
+                allocation["archivedAt"] = firestore.SERVER_TIMESTAMP
+                transaction.set(archive.document(ref.id), allocation)
+                transaction.delete(ref)
+                moved += 1
+
+            for room_id, count in released.items():
+                if room_id:
+                    transaction.update(self.rooms.document(room_id), {"occupied": firestore.Increment(-count)})
+
+            checkpoint = {
+                **checkpoint,
+                "moved": checkpoint.get("moved", 0) + moved,
+                "completed": checkpoint.get("completed", 0) + len(students),
+                "lastDocId": refs[-1].id,
+                "leaseExpiresAt": self._lease_until(),
+                "updatedAt": datetime.utcnow()
+            }
+            transaction.set(checkpoint_ref, checkpoint)
+            return checkpoint, released, students, moved
+
+        return archive_batch(db.transaction())
+
+    def _finish(self, semester: str, owner: str, result: dict) -> None:
+        @transactional
+        def finish(transaction):
+            checkpoint_ref, _, _ = self._read_checkpoint(transaction, semester, owner)
+            # Written without the lease fields, which frees the semester
+            transaction.set(checkpoint_ref, result)
+
+        finish(db.transaction())
+
+    async def _release_lease(self, semester: str, owner: str) -> None:
+        @transactional
+        def release(transaction):
+            checkpoint_ref, _, _ = self._read_checkpoint(transaction, semester, owner)
+            transaction.update(checkpoint_ref, {"leaseOwner": firestore.DELETE_FIELD, "leaseExpiresAt": firestore.DELETE_FIELD})
+
+        try:
+            await run_blocking(release, db.transaction())
+        except RolloverInProgressError:
+            pass
+        except Exception:
+            logger.exception("rollover lease not released", extra={"semester": semester})
@@ -0,0 +1,269 @@
+"""
+Compact, columnar in-memory room inventory.
+
+RoomTable keeps one NumPy column per attribute (hostel, capacity, occupied,
+floor, block, active) instead of a dict per room, so occupancy aggregates
+and filters are vectorized: per-hostel totals are a bincount and a filter
+is a boolean mask. Hostel ids and blocks are stored as small integer codes.
+
+RoomInventory holds each worker's RoomTable. It is loaded from Firestore on
+first use (or at startup) and kept in step by change messages over pubsub:
+room saves and deletes, and occupancy deltas from allocations and rollover.
+Deltas commute, so their arrival order does not matter; max_age bounds the
+drift if a message is lost, after which the table is reloaded.
+"""
+from app.core.config import INVENTORY_MAX_AGE_SECONDS
+from app.core.pubsub import pubsub, PubSub
+from typing import Dict, List, Optional
+import numpy as np
+import time
+
+NO_FLOOR = np.iinfo(np.int16).min
+NO_BLOCK = -1
+
+class RoomTable:
+    COLUMNS = ("hostel", "capacity", "occupied", "floor", "block", "active")
+
+    def __init__(self, size_hint: int = 0):
+        allocated = max(16, size_hint)
+        self.size = 0
+        self.ids = []
+        self.rows = {}
+        self.hostel_ids = []
+        self.hostel_codes = {}
+        self.blocks = []
+        self.block_codes = {}
+        self.hostel = np.zeros(allocated, dtype=np.int32)
+        self.capacity = np.zeros(allocated, dtype=np.int32)
+        self.occupied = np.zeros(allocated, dtype=np.int32)
+        self.floor = np.full(allocated, NO_FLOOR, dtype=np.int16)
+        self.block = np.full(allocated, NO_BLOCK, dtype=np.int32)
+        self.active = np.ones(allocated, dtype=bool)
+
+    @classmethod
+    def from_rooms(cls, rooms: List[dict]) -> "RoomTable":
+        table = cls(len(rooms))
+        for room in rooms:
+            table.upsert(room)
+        return table
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __contains__(self, room_id: str) -> bool:
+        return room_id in self.rows
+
+    @property
+    def nbytes(self) -> int:
+        # Column storage only; the id list and code maps are shared strings
+        return sum(getattr(self, name)[:self.size].nbytes for name in self.COLUMNS)
+
+    def _code(self, values: list, codes: dict, value) -> int:
+        if value not in codes:
+            codes[value] = len(values)
+            values.append(value)
+        return codes[value]
+
+    def _grow(self) -> None:
+        for name in self.COLUMNS:
+            column = getattr(self, name)
+            grown = np.empty(len(column) * 2, dtype=column.dtype)
+            grown[:len(column)] = column
+            setattr(self, name, grown)
+
+    def upsert(self, room: dict) -> None:
+        """
+        Add a room, or update the fields present in room for an existing one
+        """
+        room_id = room["id"]
+        row = self.rows.get(room_id)
+        if row is None:
+            if self.size == len(self.capacity):
+                self._grow()
+            row = self.size
+            self.size += 1
+            self.ids.append(room_id)
+            self.rows[room_id] = row
+            self.hostel[row] = self._code(self.hostel_ids, self.hostel_codes, room.get("hostel_id"))
+            self.capacity[row] = 0
+            self.occupied[row] = 0
+            self.floor[row] = NO_FLOOR
+            self.block[row] = NO_BLOCK
+            self.active[row] = True
+
+        if "hostel_id" in room:
+            self.hostel[row] = self._code(self.hostel_ids, self.hostel_codes, room["hostel_id"])
+        if "capacity" in room:
+            self.capacity[row] = room["capacity"] or 0
+        if "occupied" in room:
+            self.occupied[row] = room["occupied"] or 0
+        if "floor" in room:
+            self.floor[row] = NO_FLOOR if room["floor"] is None else room["floor"]
+        if "block" in room:
+            self.block[row] = NO_BLOCK if room["block"] is None else self._code(self.blocks, self.block_codes, room["block"])
+        if "isActive" in room:
+            self.active[row] = room["isActive"] is not False
+
+    def remove(self, room_id: str) -> bool:
+        row = self.rows.pop(room_id, None)
+        if row is None:
+            return False
+        # Move the last row into the hole so the columns stay dense
+        last = self.size - 1
+        if row != last:
+            moved = self.ids[last]
+            self.ids[row] = moved
+            self.rows[moved] = row
+            for name in self.COLUMNS:
+                column = getattr(self, name)
+                column[row] = column[last]
+        self.ids.pop()
+        self.size = last
+        return True
+
+    def add_occupied(self, deltas: Dict[str, int]) -> List[str]:
+        """
+        Apply occupancy deltas; returns the room ids this table does not know
+        """
+        unknown = []
+        for room_id, delta in deltas.items():
+            row = self.rows.get(room_id)
+            if row is None:
+                unknown.append(room_id)
+            else:
+                self.occupied[row] = max(0, int(self.occupied[row]) + delta)
+        return unknown
+
+    def get(self, room_id: str) -> Optional[dict]:
+        row = self.rows.get(room_id)
+        if row is None:
+            return None
+        return {
+            "id": room_id,
+            "hostel_id": self.hostel_ids[self.hostel[row]],
+            "capacity": int(self.capacity[row]),
+            "occupied": int(self.occupied[row]),
+            "floor": None if self.floor[row] == NO_FLOOR else int(self.floor[row]),
+            "block": None if self.block[row] == NO_BLOCK else self.blocks[self.block[row]],
+            "isActive": bool(self.active[row]),
+        }
+
+    def free_beds(self) -> np.ndarray:
+        return np.maximum(self.capacity[:self.size] - self.occupied[:self.size], 0)
+
+    def mask(self, hostel_id: str = None, floor: int = None, block: str = None,
+             min_free: int = None, active_only: bool = False) -> np.ndarray:
+        """
+        Boolean row mask for rooms matching every given filter
+        """
+        n = self.size
+        selected = np.ones(n, dtype=bool)
+        if hostel_id is not None:
+            selected &= self.hostel[:n] == self.hostel_codes.get(hostel_id, -1)
+        if floor is not None:
+            selected &= self.floor[:n] == floor
+        if block is not None:
+            selected &= self.block[:n] == self.block_codes.get(block, -2)
+        if min_free is not None:
+            selected &= self.free_beds() >= min_free
+        if active_only:
+            selected &= self.active[:n]
+        return selected
+
+    def select(self, **filters) -> List[str]:
+        return [self.ids[row] for row in np.flatnonzero(self.mask(**filters))]
+
+    def totals(self, mask: np.ndarray = None) -> dict:
+        n = self.size
+        capacity, occupied = self.capacity[:n], self.occupied[:n]
+        if mask is not None:
+            capacity, occupied = capacity[mask], occupied[mask]
+        return {"rooms": len(capacity), "capacity": int(capacity.sum()), "occupied": int(occupied.sum())}
+
+    def hostel_totals(self, mask: np.ndarray = None) -> Dict[str, dict]:
+        """
+        {hostel_id: {"rooms", "capacity", "occupied", "free"}} for hostels with
+        at least one (selected) room; free never counts an overfull room below zero
+        """
+        n = self.size
+        hostel = self.hostel[:n]
+        weights = np.ones(n, dtype=np.int64) if mask is None else mask.astype(np.int64)
+        slots = len(self.hostel_ids)
+        rooms = np.bincount(hostel, weights=weights, minlength=slots)
+        capacity = np.bincount(hostel, weights=self.capacity[:n] * weights, minlength=slots)
+        occupied = np.bincount(hostel, weights=self.occupied[:n] * weights, minlength=slots)
+        free = np.bincount(hostel, weights=self.free_beds() * weights, minlength=slots)
+        return {
+            self.hostel_ids[code]: {
+                "rooms": int(rooms[code]),
+                "capacity": int(capacity[code]),
+                "occupied": int(occupied[code]),
+                "free": int(free[code]),
+            }
+            for code in np.flatnonzero(rooms)
+        }
+
+class RoomInventory:
+    """
+    Per-worker RoomTable, loaded from Firestore and synchronised over pubsub.
+    Writers call room_saved / room_deleted / occupancy_changed after their
+    Firestore write; every worker applies the change to its own table.
+    """
+    CHANNEL = "inventory"
+
+    def __init__(self, broker: PubSub, max_age: float = INVENTORY_MAX_AGE_SECONDS):
+        self.broker = broker
+        self.max_age = max_age
+        self.table = None
+        self.expires_at = 0.0
+        self.generation = 0
+        self.room_repo = None
+        broker.subscribe(self.CHANNEL, self._on_change)
+
+    async def load(self) -> int:
+        if self.room_repo is None:
+            # Imported late: the repository needs the Firestore client
+            from app.repositories.rooms_repo import RoomRepository
+            self.room_repo = RoomRepository()
+
+        generation = self.generation
+        table = RoomTable.from_rooms(await self.room_repo.get_all_rooms())
+        self.table = table
+        # A change that raced the load may be missing from it: reload on next use
+        self.expires_at = time.monotonic() + self.max_age if self.generation == generation else 0.0
+        return len(table)
+
+    async def get_table(self) -> RoomTable:
+        """
+        The current table; treat it as read-only
+        """
+        if self.table is None or time.monotonic() >= self.expires_at:
+            await self.load()
+        return self.table
+
+    async def room_saved(self, room: dict) -> None:
+        fields = ("id", "hostel_id", "capacity", "occupied", "floor", "block", "isActive")
+        await self.broker.publish(self.CHANNEL, {"op": "upsert", "room": {k: room[k] for k in fields if k in room}})
+
+    async def room_deleted(self, room_id: str) -> None:
+        await self.broker.publish(self.CHANNEL, {"op": "remove", "id": room_id})
+
+    async def occupancy_changed(self, deltas: Dict[str, int]) -> None:
+        deltas = {room_id: delta for room_id, delta in deltas.items() if room_id and delta}
+        if deltas:
+            await self.broker.publish(self.CHANNEL, {"op": "occupancy", "deltas": deltas})
+
+    async def _on_change(self, change: dict) -> None:
+        self.generation += 1
+        table = self.table
+        if table is None:
+            return
+        if change["op"] == "upsert":
+            table.upsert(change["room"])
+        elif change["op"] == "remove":
+            table.remove(change["id"])
+        elif table.add_occupied(change["deltas"]):
+            # A room this worker has not seen yet: pick it up with a reload
+            self.expires_at = 0.0
+
+room_inventory = RoomInventory(pubsub)
@@ -1,5 +1,8 @@
 from app.repositories.rooms_repo import RoomRepository
-from app.schemas.room import RoomCreate, RoomUpdate
+from app.schemas.room import RoomCreate, RoomUpdate, RoomOut
+from app.core.cache import read_cache
+from app.core.responses import prevalidate
+from app.services.room_inventory import room_inventory
 from typing import List, Optional
 
 class RoomService:
@@ -7,22 +10,52 @@ class RoomService:
         self.room_repo = RoomRepository()
 
     async def create_room(self, room: RoomCreate) -> dict:
-        return await self.room_repo.create_room(room)
+        created = await self.room_repo.create_room(room)
+        await read_cache.invalidate("rooms")
+        await room_inventory.room_saved(created)
+        return created
 
     async def get_room(self, room_id: str) -> Optional[dict]:
         return await self.room_repo.get_room_by_id(room_id)
 
     async def get_rooms_by_hostel(self, hostel_id: str) -> List[dict]:
-        return await self.room_repo.get_rooms_by_hostel(hostel_id)
+        return await read_cache.get(("rooms", hostel_id), lambda: self.room_repo.get_rooms_by_hostel(hostel_id))
 
     async def update_room(self, room_id: str, update_data: RoomUpdate) -> Optional[dict]:
-        return await self.room_repo.update_room(room_id, update_data)
+        updated = await self.room_repo.update_room(room_id, update_data)
+        await read_cache.invalidate("rooms")
+        if updated:
+            await room_inventory.room_saved(updated)
+        return updated
 
     async def update_room_occupancy(self, room_id: str, new_occupied: int) -> bool:
-        return await self.room_repo.update_room_occupancy(room_id, new_occupied)
+        updated = await self.room_repo.update_room_occupancy(room_id, new_occupied)
+        await read_cache.invalidate("rooms")
+        if updated:
+            await room_inventory.room_saved({"id": room_id, "occupied": new_occupied})
+        return updated
 
     async def delete_room(self, room_id: str) -> bool:
-        return await self.room_repo.delete_room(room_id)
+        deleted = await self.room_repo.delete_room(room_id)
+        await read_cache.invalidate("rooms")
+        if deleted:
+            await room_inventory.room_deleted(room_id)
+        return deleted
+
+    async def get_room_roster(self, room_id: str) -> List[dict]:
+        """
+        Current occupants of a room (student, name, bed) from its roster
+        subcollection, kept in step by the allocate/cancel transactions
+        """
+        return await self.room_repo.get_roster(room_id)
 
     async def get_all_rooms(self) -> List[dict]:
-        return await self.room_repo.get_all_rooms()
+        return await read_cache.get(("rooms", None), self.room_repo.get_all_rooms)
+
+    async def get_room_list(self) -> List[dict]:
+        """
+        All rooms validated as RoomOut once per load, for FastJSONResponse
+        """
+        async def load():
+            return prevalidate(RoomOut, await self.room_repo.get_all_rooms())
+        return await read_cache.get(("rooms", None, "out"), load)
@@ -1,10 +1,21 @@
 from app.repositories.users_repo import UserRepository
+from app.repositories.allocations_repo import AllocationRepository
+from app.repositories.rooms_repo import RoomRepository
+from app.services.claims_service import ClaimsService
+from app.utils.constants import PROFILE_CLAIMS
 from app.schemas.user import UserCreate, UserUpdate
+from firebase_admin.exceptions import FirebaseError
 from typing import List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
 
 class UserService:
     def __init__(self):
         self.user_repo = UserRepository()
+        self.allocation_repo = AllocationRepository()
+        self.room_repo = RoomRepository()
+        self.claims_service = ClaimsService()
 
     async def create_user(self, user: UserCreate) -> dict:
         return await self.user_repo.create_user(user)
@@ -16,7 +27,27 @@ class UserService:
         return await self.user_repo.get_user_by_email(email)
 
     async def update_user(self, user_id: str, update_data: UserUpdate) -> Optional[dict]:
-        return await self.user_repo.update_user(user_id, update_data)
+        """
+        Update a user profile and push role/gender/hostel changes into the
+        token's custom claims so auth checks never need a Firestore read.
+        A name change is copied to the student's room roster entries.
+        """
+        user = await self.user_repo.update_user(user_id, update_data)
+        if not user:
+            return None
+
+        changed = {k: v for k, v in update_data.dict().items() if k in PROFILE_CLAIMS and v is not None}
+        if changed:
+            # The profile is already saved; scripts/sync_claims.py repairs a claim that was missed
+            try:
+                await self.claims_service.sync_user_claims(user_id, changed)
+            except FirebaseError:
+                logger.exception("custom claims not synced", extra={"userId": user_id})
+
+        if update_data.full_name is not None:
+            for lock in await self.allocation_repo.get_student_locks(user_id):
+                await self.room_repo.update_roster_entry(lock["roomId"], lock["allocationId"], {"name": update_data.full_name})
+        return user
 
     async def delete_user(self, user_id: str) -> bool:
         return await self.user_repo.delete_user(user_id)
@@ -0,0 +1,195 @@
+from app.repositories.waitlist_repo import WaitlistRepository
+from app.repositories.applications_repo import ApplicationRepository
+from app.repositories.hostels_repo import HostelRepository
+from app.repositories.users_repo import UserRepository
+from app.services.allocation_service import AllocationService
+from app.schemas.allocation import AllocationCreate
+from app.schemas.waitlist import WaitlistCreate
+from app.core.exceptions import RoomFullError
+from app.core.pubsub import pubsub
+from datetime import datetime
+from typing import List, Optional
+import asyncio
+import heapq
+import logging
+
+logger = logging.getLogger(__name__)
+
+class WaitlistService:
+    """
+    Per (semester, hostel, gender) priority queues of students waiting for a bed.
+
+    Firestore holds the entries; the heaps are an in-memory index over the
+    waiting ones, rebuilt by load() at startup. Entries that leave the queue
+    are dropped from self.entries and skipped lazily when they reach the top.
+    Every change to the index is broadcast over pubsub, so each worker's
+    copy stays in step whichever worker handled the request.
+    """
+    CHANNEL = "waitlist"
+
+    def __init__(self, allocation_service: AllocationService):
+        self.waitlist_repo = WaitlistRepository()
+        self.application_repo = ApplicationRepository()
+        self.hostel_repo = HostelRepository()
+        self.user_repo = UserRepository()
+        self.allocation_service = allocation_service
+        self.heaps = {}
+        self.entries = {}
+        allocation_service.add_cancel_listener(self.promote_for_allocation)
+        pubsub.subscribe(self.CHANNEL, self._on_change)
+
+    def _push(self, entry: dict) -> None:
+        key = (entry["semester"], entry["hostelId"], entry.get("gender"))
+        # Higher priority first, then first come first served
+        heapq.heappush(self.heaps.setdefault(key, []), (-entry.get("priority", 0), entry["createdAt"].timestamp(), entry["id"]))
+        self.entries[entry["id"]] = entry
+
+    async def _on_change(self, change: dict) -> None:
+        if change["op"] == "push":
+            entry = change["entry"]
+            self.entries.pop(entry["id"], None)
+            self._push({**entry, "createdAt": datetime.fromisoformat(entry["createdAt"])})
+        else:
+            self.entries.pop(change["id"], None)
+
+    async def _broadcast_push(self, entry: dict) -> None:
+        await pubsub.publish(self.CHANNEL, {"op": "push", "entry": entry})
+
+    async def _broadcast_drop(self, entry_id: str) -> None:
+        await pubsub.publish(self.CHANNEL, {"op": "drop", "id": entry_id})
+
+    def _is_live(self, item: tuple) -> bool:
+        # A re-joined student leaves a stale heap item behind under the same id
+        entry = self.entries.get(item[2])
+        return entry is not None and entry["createdAt"].timestamp() == item[1]
+
+    def _head(self, key: tuple) -> Optional[tuple]:
+        heap = self.heaps.get(key)
+        while heap and not self._is_live(heap[0]):
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+    async def load(self) -> int:
+        """
+        Rebuild the in-memory queues from the waiting entries in Firestore
+        """
+        self.heaps = {}
+        self.entries = {}
+        for entry in await self.waitlist_repo.get_waiting_entries():
+            self._push(entry)
+        return len(self.entries)
+
+    async def join(self, request: WaitlistCreate, student_id: str) -> dict:
+        applications = await self.application_repo.get_applications_by_student(student_id)
+        application = next(
+            (a for a in applications if a.get("semester") == request.semester and a.get("status") == "approved"),
+            None
+        )
+        if not application:
+            raise ValueError("Student must have an approved application before joining the waitlist")
+
+        # Hostel and profile resolve in one batched read
+        hostel, user = await asyncio.gather(
+            self.hostel_repo.get_hostel_by_id(request.hostelId),
+            self.user_repo.get_user_by_id(student_id)
+        )
+        if not hostel:
+            raise ValueError("Hostel not found")
+        user = user or {}
+        if hostel.get("gender") and hostel.get("gender") != "mixed" and user.get("gender") != hostel.get("gender"):
+            raise ValueError(f"Gender mismatch: This hostel is for {hostel.get('gender')} students only")
+
+        priority = request.priority
+        if priority is None:
+            priority = sum(1 for flag in (application.get("priorityFlags") or {}).values() if flag)
+
+        # Re-joining replaces the student's previous entry for the semester
+        entry = await self.waitlist_repo.create_entry({
+            "studentId": student_id,
+            "applicationId": application.get("id"),
+            "hostelId": request.hostelId,
+            "gender": user.get("gender"),
+            "semester": request.semester,
+            "priority": priority
+        })
+        await self._broadcast_push(entry)
+        return entry
+
+    async def leave(self, entry_id: str) -> bool:
+        entry = await self.waitlist_repo.get_entry_by_id(entry_id)
+        if not entry or entry.get("status") != "waiting":
+            return False
+        await self.waitlist_repo.update_status(entry_id, "removed", reason="Left the waitlist")
+        await self._broadcast_drop(entry_id)
+        return True
+
+    async def get_entry(self, entry_id: str) -> Optional[dict]:
+        return await self.waitlist_repo.get_entry_by_id(entry_id)
+
+    async def get_student_entries(self, student_id: str) -> List[dict]:
+        return await self.waitlist_repo.get_entries_by_student(student_id)
+
+    async def get_queue(self, semester: str, hostel_id: str) -> List[dict]:
+        """
+        Waiting entries for a hostel in promotion order
+        """
+        queued = []
+        for key, heap in self.heaps.items():
+            if key[0] == semester and key[1] == hostel_id:
+                queued.extend(item for item in heap if self._is_live(item))
+        return [self.entries[item[2]] for item in sorted(queued)]
+
+    async def promote_for_allocation(self, allocation: dict) -> Optional[dict]:
+        """
+        Give a freed bed to the best waiting student for that hostel, trying
+        the next one whenever allocate_room rejects a candidate
+        """
+        hostel = await self.hostel_repo.get_hostel_by_id(allocation["hostelId"])
+        if not hostel or hostel.get("isActive") is False:
+            return None
+        gender = hostel.get("gender") or "mixed"
+
+        while True:
+            keys = [
+                key for key in self.heaps
+                if key[0] == allocation["semester"] and key[1] == allocation["hostelId"]
+                and (gender == "mixed" or key[2] == gender)
+            ]
+            heads = [(head, key) for head, key in ((self._head(key), key) for key in keys) if head]
+            if not heads:
+                return None
+
+            _, key = min(heads)
+            _, _, entry_id = heapq.heappop(self.heaps[key])
+            entry = self.entries.pop(entry_id)
+            await self._broadcast_drop(entry_id)
+
+            try:
+                result = await self.allocation_service.allocate_room(
+                    AllocationCreate(
+                        studentId=entry["studentId"],
+                        hostelId=allocation["hostelId"],
+                        roomId=allocation["roomId"],
+                        bedLabel=allocation.get("bedLabel"),
+                        semester=allocation["semester"]
+                    ),
+                    "waitlist"
+                )
+            except RoomFullError:
+                # Someone else took the bed first; the student keeps their place
+                await self._broadcast_push(entry)
+                return None
+            except ValueError as e:
+                # Another worker may have promoted this student a moment earlier
+                current = await self.waitlist_repo.get_entry_by_id(entry_id)
+                if current and current.get("status") == "waiting":
+                    await self.waitlist_repo.update_status(entry_id, "removed", reason=str(e))
+                continue
+            except Exception:
+                # The entry is still waiting in Firestore; put it back rather than lose it
+                await self._broadcast_push(entry)
+                logger.exception("waitlist promotion failed", extra={"entryId": entry_id})
+                return None
+
+            await self.waitlist_repo.update_status(entry_id, "promoted", allocationId=result["id"])
+            return result
@@ -0,0 +1,13 @@
+import asyncio
+
+async def run_blocking(fn, *args, **kwargs):
+    """
+    Run a synchronous Firestore call on a worker thread.
+
+    Repository methods are async but the Firestore client is synchronous:
+    a round trip made inside a coroutine blocks the event loop, and
+    asyncio.gather over such coroutines runs them one after another. Only
+    the blocking call goes to the thread; the coroutine, and the caches,
+    document loader and pubsub it touches, stay on the event loop.
+    """
+    return await asyncio.to_thread(fn, *args, **kwargs)
@@ -0,0 +1,7 @@
+# Hard-coded constants shared across the backend
+
+ROLES = ["student", "warden", "admin"]
+
+# Profile fields mirrored into Firebase custom claims so they can be read
+# straight from a verified ID token
+PROFILE_CLAIMS = ["role", "gender", "hostelId"]
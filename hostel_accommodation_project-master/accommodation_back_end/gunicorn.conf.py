@@ -0,0 +1,25 @@
+"""
+Multi-worker deployment:
+
+    cd accommodation_back_end && gunicorn -c gunicorn.conf.py app.main:app
+
+WEB_CONCURRENCY sets the worker count (default: one per CPU). Workers keep
+their read caches, waitlist queues and websocket clients in step over
+app/core/pubsub.py; with several workers on one host the Unix-socket backend
+is used unless PUBSUB_BACKEND is set (use "firestore" across hosts).
+"""
+import multiprocessing
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = "uvicorn.workers.UvicornWorker"
+keepalive = 5
+graceful_timeout = 30
+
+# Each worker builds its own Firestore client after the fork: gRPC channels
+# must not be shared across processes
+preload_app = False
+
+# Read by every worker, since the config runs in the master before forking
+os.environ.setdefault("PUBSUB_BACKEND", "unix" if workers > 1 else "local")
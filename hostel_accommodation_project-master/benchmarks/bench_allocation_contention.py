@@ -0,0 +1,174 @@
+"""
+Contention harness for AllocationService.allocate_room.
+
+    python benchmarks/bench_allocation_contention.py [--concurrency 32] [--capacity 4] [--rounds 5] [--latency-ms 2]
+
+Two scenarios, each fired as N concurrent calls on one event loop (their
+transactions run on worker threads, as in the app):
+
+- one room:    N different students race for the beds of a single room
+- one student: a single student is allocated to N different rooms at once
+
+After every round it checks the invariants allocate_room promises: a room's
+occupied counter never exceeds its capacity and always equals its active
+allocations and roster entries, and a student holds at most one active
+allocation per semester. Reports outcomes, throughput and the transaction
+abort rate, and exits non-zero if an invariant was violated.
+
+Runs against the in-memory stand-in (with simulated round-trip latency so
+the calls interleave) or, when FIRESTORE_EMULATOR_HOST is set, the emulator.
+Custom-claims sync goes to Firebase Auth and is not under test, so it is
+replaced by a no-op recorder.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from firestore_backend import install
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--concurrency", type=int, default=32)
+parser.add_argument("--capacity", type=int, default=4)
+parser.add_argument("--rounds", type=int, default=5)
+parser.add_argument("--latency-ms", type=float, default=2.0)
+args = parser.parse_args()
+
+backend, db = install(latency=args.latency_ms / 1000)
+
+from app.core.exceptions import RoomFullError
+from app.schemas.allocation import AllocationCreate
+from app.services.allocation_service import AllocationService
+
+class RecordingClaims:
+    def __init__(self):
+        self.calls = 0
+
+    async def sync_user_claims(self, uid: str, updates: dict) -> bool:
+        self.calls += 1
+        return True
+
+def seed(prefix: str, semester: str, students: int, rooms: int, capacity: int) -> None:
+    db.collection("hostels").document(f"{prefix}-H").set({"name": "Bench Hostel", "gender": "mixed", "isActive": True})
+    for j in range(rooms):
+        room_id = f"{prefix}-R{j}"
+        db.collection("rooms").document(room_id).set({
+            "id": room_id, "hostel_id": f"{prefix}-H", "room_number": str(j), "capacity": capacity, "occupied": 0
+        })
+    for i in range(students):
+        student_id = f"{prefix}-S{i}"
+        db.collection("users").document(student_id).set({"id": student_id, "role": "student", "gender": "female"})
+        db.collection("applications").document(f"{prefix}-A{i}").set(
+            {"studentId": student_id, "semester": semester, "status": "approved"}
+        )
+
+def classify(error: Exception) -> str:
+    if isinstance(error, RoomFullError):
+        return "room full"
+    message = str(error)
+    if "attempts" in message:
+        return "retries exhausted"
+    if "already has an active allocation" in message:
+        return "duplicate rejected"
+    return f"rejected: {message[:40]}"
+
+async def attempt(service: AllocationService, request: AllocationCreate) -> str:
+    try:
+        await service.allocate_room(request, "bench")
+        return "allocated"
+    except ValueError as e:
+        return classify(e)
+
+def check(prefix: str, semester: str, rooms: int) -> list:
+    """
+    Invariant violations for one round's rooms and students
+    """
+    active = [
+        doc.to_dict() for doc in db.collection("allocations").where("semester", "==", semester).stream()
+        if doc.to_dict().get("status") == "active"
+    ]
+    violations = []
+    per_room = Counter(a["roomId"] for a in active)
+    for j in range(rooms):
+        room = db.collection("rooms").document(f"{prefix}-R{j}").get().to_dict()
+        if room["occupied"] > room["capacity"]:
+            violations.append(f"room {prefix}-R{j}: occupied {room['occupied']} > capacity {room['capacity']}")
+        if room["occupied"] != per_room[f"{prefix}-R{j}"]:
+            violations.append(f"room {prefix}-R{j}: occupied {room['occupied']} != {per_room[f'{prefix}-R{j}']} active allocations")
+        roster = len(list(db.collection("rooms").document(f"{prefix}-R{j}").collection("roster").stream()))
+        if roster != room["occupied"]:
+            violations.append(f"room {prefix}-R{j}: roster lists {roster} occupants, occupied is {room['occupied']}")
+    for student_id, count in Counter(a["studentId"] for a in active).items():
+        if count > 1:
+            violations.append(f"student {student_id}: {count} active allocations for {semester}")
+    return violations
+
+async def run_round(service: AllocationService, scenario: str, round_no: int) -> tuple:
+    n = args.concurrency
+    prefix = f"{scenario.replace(' ', '')}{round_no}-{int(time.time() * 1000) % 100000}"
+    semester = f"bench-{prefix}"
+    if scenario == "one room":
+        seed(prefix, semester, students=n, rooms=1, capacity=args.capacity)
+        requests = [
+            AllocationCreate(studentId=f"{prefix}-S{i}", hostelId=f"{prefix}-H", roomId=f"{prefix}-R0", semester=semester)
+            for i in range(n)
+        ]
+    else:
+        seed(prefix, semester, students=1, rooms=n, capacity=args.capacity)
+        requests = [
+            AllocationCreate(studentId=f"{prefix}-S0", hostelId=f"{prefix}-H", roomId=f"{prefix}-R{j}", semester=semester)
+            for j in range(n)
+        ]
+
+    stats_before = dict(getattr(db, "stats", {}))
+    started = time.perf_counter()
+    outcomes = await asyncio.gather(*(attempt(service, request) for request in requests))
+    elapsed = time.perf_counter() - started
+    stats = getattr(db, "stats", None)
+    aborts = commits = None
+    if stats is not None:
+        aborts = stats["aborts"] - stats_before["aborts"]
+        commits = stats["commits"] - stats_before["commits"]
+    return Counter(outcomes), elapsed, aborts, commits, check(prefix, semester, len(requests) if scenario == "one student" else 1)
+
+async def main() -> int:
+    # One worker thread per concurrent call, so every call is in flight at once
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=args.concurrency))
+    service = AllocationService()
+    service.claims_service = RecordingClaims()
+
+    print(f"backend: {backend}; {args.concurrency} concurrent calls, room capacity {args.capacity}, {args.rounds} rounds")
+    failed = False
+    for scenario in ("one room", "one student"):
+        outcomes, elapsed, aborts, commits, violations = Counter(), 0.0, 0, 0, []
+        for round_no in range(args.rounds):
+            round_outcomes, round_elapsed, round_aborts, round_commits, round_violations = await run_round(service, scenario, round_no)
+            outcomes += round_outcomes
+            elapsed += round_elapsed
+            if round_aborts is not None:
+                aborts += round_aborts
+                commits += round_commits
+            violations.extend(round_violations)
+
+        calls = sum(outcomes.values())
+        abort_rate = f"{aborts / (aborts + commits) * 100:.1f}% of commit attempts aborted" if aborts + commits else "abort rate n/a"
+        print(f"\n[{scenario}] {calls} calls in {elapsed:.2f}s: {calls / elapsed:,.0f} calls/s, "
+              f"{outcomes['allocated'] / elapsed:,.0f} allocations/s, {abort_rate}")
+        for outcome, count in outcomes.most_common():
+            print(f"  {outcome:<28} {count:>6}")
+        if violations:
+            failed = True
+            print(f"  INVARIANT VIOLATIONS ({len(violations)}):")
+            for violation in violations[:10]:
+                print(f"    {violation}")
+        else:
+            print("  invariants held")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
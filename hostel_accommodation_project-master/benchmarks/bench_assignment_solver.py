@@ -0,0 +1,79 @@
+"""
+Bulk assignment solver on a synthetic intake.
+
+    python benchmarks/bench_assignment_solver.py [students] [rooms]
+
+Defaults to 10,000 approved applications against 3,000 rooms of 4 beds.
+Pure NumPy; no Firestore access.
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "accommodation_back_end"))
+
+from app.services.assignment_solver import assign
+
+AMENITIES = ["wifi", "desk", "ensuite", "balcony"]
+BLOCKS = [chr(ord("A") + i) for i in range(24)]
+
+def synthetic_inventory(room_count, seed=7):
+    # Twelve hostels of two blocks each; amenities are fitted per block
+    rng = random.Random(seed)
+    hostels = {f"H{i}": {"gender": gender} for i, gender in enumerate(["male"] * 4 + ["female"] * 6 + ["mixed"] * 2)}
+    hostel_ids = list(hostels)
+    block_amenities = {
+        (h, block): rng.sample(AMENITIES, rng.randint(0, 2))
+        for i, h in enumerate(hostel_ids) for block in BLOCKS[2 * i:2 * i + 2]
+    }
+    rooms = []
+    for r in range(room_count):
+        h = r % len(hostel_ids)
+        block = BLOCKS[2 * h + (r // len(hostel_ids)) % 2]
+        rooms.append({
+            "id": f"room{r}",
+            "hostel_id": hostel_ids[h],
+            "capacity": 4,
+            "occupied": rng.choice([0, 0, 0, 1, 2]),
+            "floor": rng.randint(0, 3),
+            "block": block,
+            "amenities": block_amenities[(hostel_ids[h], block)],
+        })
+    return rooms, hostels
+
+def synthetic_applications(count, hostels, seed=11):
+    rng = random.Random(seed)
+    hostel_ids = list(hostels)
+    applications = []
+    for i in range(count):
+        gender = rng.choice(["male", "female"])
+        eligible = [h for h in hostel_ids if hostels[h]["gender"] in (gender, "mixed")]
+        applications.append({
+            "id": f"app{i}",
+            "studentId": f"student{i}",
+            "gender": gender,
+            "preferences": {
+                "hostelPreferred": rng.sample(eligible, 3),
+                "floor": rng.choice([None, 0, 1, 2, 3]),
+                "block": rng.choice([None] + BLOCKS),
+                "amenities": rng.sample(AMENITIES, rng.randint(0, 2)),
+            },
+            "priorityFlags": {"disability": rng.random() < 0.02, "finalYear": rng.random() < 0.1},
+        })
+    return applications
+
+if __name__ == "__main__":
+    students = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    room_count = int(sys.argv[2]) if len(sys.argv) > 2 else 3000
+    rooms, hostels = synthetic_inventory(room_count)
+    applications = synthetic_applications(students, hostels)
+
+    start = time.perf_counter()
+    result = assign(applications, rooms, hostels)
+    elapsed = time.perf_counter() - start
+
+    beds = sum(room["capacity"] - room["occupied"] for room in rooms)
+    print(f"{students} applications, {room_count} rooms ({beds} free beds)")
+    print(f"assigned {len(result['assignments'])}, unassigned {len(result['unassigned'])}, "
+          f"total score {result['totalScore']} in {elapsed:.2f}s")
@@ -0,0 +1,129 @@
+"""
+Monte Carlo capacity simulation (app/services/capacity_simulator.py).
+
+    python benchmarks/bench_capacity_simulator.py [--rooms 2000] [--hostels 20] [--runs 2000]
+
+Builds a campus of single-gender and mixed hostels, then simulates an
+intake larger than the beds with a synthetic stream and a bootstrap of a
+synthetic past semester, the latter also with students held to their
+preferred hostels. Checks the invariants a replay of allocate_room
+must keep in every run (never more students placed than beds, no hostel
+over capacity, gender rejections only for students held to preferences)
+and reports runs per second against a plain per-run Python loop.
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "accommodation_back_end"))
+
+from app.services.capacity_simulator import HistoricalStream, SyntheticStream, hostel_inventory, simulate
+from app.services.room_inventory import RoomTable
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--rooms", type=int, default=2000)
+parser.add_argument("--hostels", type=int, default=20)
+parser.add_argument("--runs", type=int, default=2000)
+args = parser.parse_args()
+
+def campus(rooms: int, hostels: int):
+    table = RoomTable.from_rooms([
+        {"id": f"R{r}", "hostel_id": f"H{r % hostels}", "capacity": 2 + r % 3, "occupied": r % 2, "floor": r % 5, "block": "AB"[r % 2]}
+        for r in range(rooms)
+    ])
+    policies = ["male", "female", "mixed"]
+    return table, {f"H{h}": {"id": f"H{h}", "gender": policies[h % 3], "isActive": True} for h in range(hostels)}
+
+def python_loop(inventory: dict, stream: SyntheticStream, runs: int, seed: int) -> list:
+    # The obvious per-run replay, for comparison
+    rng = np.random.default_rng(seed)
+    placed = []
+    for _ in range(runs):
+        free = inventory["beds"].tolist()
+        count = 0
+        for _ in range(stream.intake):
+            gender = 1 if rng.random() < stream.female_share else 0
+            prefs = rng.choice(len(free), size=stream.preferences, replace=False, p=stream.popularity)
+            options = list(prefs) + list(range(len(free)))
+            hostel = next((h for h in options if inventory["admits"][gender, h] and free[h] > 0), None)
+            if hostel is not None:
+                free[hostel] -= 1
+                count += 1
+        placed.append(count)
+    return placed
+
+def past_semester(intake: int, hostels: int) -> tuple:
+    rng = np.random.default_rng(7)
+    opened = datetime(2026, 1, 5, tzinfo=timezone.utc)
+    genders, applications = {}, []
+    for a in range(intake):
+        # A few students apply twice
+        student = f"S{rng.integers(0, a) if a and rng.random() < 0.03 else a}"
+        genders[student] = ["male", "female"][int(student[1:]) % 2]
+        applications.append({
+            "studentId": student,
+            "status": rng.choice(["approved", "allocated", "rejected", "pending"], p=[0.5, 0.3, 0.1, 0.1]),
+            "submittedAt": opened + timedelta(days=float(rng.beta(1.2, 4) * 40)),
+            "preferences": {"hostelPreferred": [f"H{h}" for h in rng.choice(hostels, size=2, replace=False)]},
+        })
+    return applications, genders
+
+def check(report: dict, label: str, preferred_only: bool = False) -> None:
+    assert report["placed"]["p95"] <= report["totalBeds"], f"{label}: placed more students than beds"
+    for hostel in report["hostels"]:
+        assert hostel["fillRate"]["p95"] <= 1.0, f"{label}: {hostel['hostelId']} over capacity"
+    # Every gender has some hostel, so only students held to their preferences can be refused on gender
+    gender = report["rejections"]["gender"]
+    if preferred_only:
+        assert gender["p50"] > 0, f"{label}: no gender rejections with single-gender preferences"
+    else:
+        assert gender["p95"] == 0, f"{label}: gender rejections {gender['p95']} with a fallback available"
+
+def show(label: str, report: dict, seconds: float) -> None:
+    fill = report["fillRate"]
+    print(f"  {label:<11} {report['runs']:,} runs x {report['intake']:,} applications in {seconds:6.2f} s"
+          f"   fill p5/p50/p95 {fill['p5']:.1%} / {fill['p50']:.1%} / {fill['p95']:.1%}")
+    print(f"              rejected p50: " + ", ".join(f"{r} {s['p50']:,.0f}" for r, s in report["rejections"].items()))
+    for milestone, time_to_fill in report["timeToFill"].items():
+        days = time_to_fill["days"]
+        print(f"              {milestone:>4} full: {time_to_fill['runsReaching']:.0%} of runs" + (f", day {days['p50']:.1f} (p50)" if days else ""))
+
+if __name__ == "__main__":
+    table, hostels = campus(args.rooms, args.hostels)
+    inventory = hostel_inventory(table, hostels)
+    beds = int(inventory["beds"].sum())
+    intake = int(beds * 1.1)
+    print(f"{args.hostels} hostels, {beds:,} beds, intake {intake:,}")
+
+    stream = SyntheticStream(intake, args.hostels, female_share=0.55, approval_rate=0.9, duplicate_rate=0.03,
+                             popularity=inventory["beds"])
+    started = time.perf_counter()
+    report = simulate(inventory, stream, runs=args.runs, seed=1)
+    vectorized = time.perf_counter() - started
+    check(report, "synthetic")
+    show("synthetic", report, vectorized)
+
+    applications, genders = past_semester(intake, args.hostels)
+    history = HistoricalStream(applications, genders, inventory["hostelIds"])
+    started = time.perf_counter()
+    report = simulate(inventory, history, runs=args.runs, seed=2)
+    check(report, "historical")
+    show("historical", report, time.perf_counter() - started)
+
+    started = time.perf_counter()
+    report = simulate(inventory, history, runs=args.runs, preferred_only=True, seed=2)
+    check(report, "preferred", preferred_only=True)
+    show("preferred", report, time.perf_counter() - started)
+
+    sample = max(args.runs // 100, 5)
+    plain = SyntheticStream(intake, args.hostels, female_share=0.55, popularity=inventory["beds"])
+    started = time.perf_counter()
+    python_loop(inventory, plain, sample, seed=3)
+    per_run = (time.perf_counter() - started) / sample
+    print(f"  per-run Python loop: {per_run * 1000:.1f} ms/run, {per_run * args.runs:.1f} s for {args.runs:,} runs"
+          f"   vectorized x{per_run * args.runs / vectorized:.0f}")
+    print("invariants held")
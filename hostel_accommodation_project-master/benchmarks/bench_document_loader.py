@@ -0,0 +1,90 @@
+"""
+Round trips saved by batched document reads (app/repositories/loader.py).
+
+    python benchmarks/bench_document_loader.py [--related 20] [--latency-ms 5]
+
+For a student with N past allocations and a room with N allocations,
+compares one point read per related document (the old pattern) with the
+loader's single get_all, and reports round trips per allocate/cancel call.
+Uses the in-memory stand-in with simulated latency (or the emulator).
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from firestore_backend import install
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--related", type=int, default=20)
+parser.add_argument("--latency-ms", type=float, default=5.0)
+args = parser.parse_args()
+
+backend, db = install(latency=args.latency_ms / 1000)
+
+from app.schemas.allocation import AllocationCreate
+from app.services.allocation_service import AllocationService
+
+class NoClaims:
+    async def sync_user_claims(self, uid: str, updates: dict) -> bool:
+        return True
+
+def seed(n: int) -> None:
+    for h in range(n):
+        db.collection("hostels").document(f"H{h}").set({"name": f"Hostel {h}", "gender": "mixed", "isActive": True})
+        db.collection("rooms").document(f"R{h}").set({"id": f"R{h}", "hostel_id": f"H{h}", "room_number": str(h), "capacity": n + 1, "occupied": 0})
+    for i in range(n):
+        db.collection("users").document(f"S{i}").set({"id": f"S{i}", "full_name": f"Student {i}", "gender": "female"})
+        # S0's history spans every room; room R0 has seen every student
+        db.collection("allocations").document(f"past-S0-{i}").set(
+            {"studentId": "S0", "roomId": f"R{i}", "hostelId": f"H{i}", "semester": f"old-{i}", "status": "completed"}
+        )
+        db.collection("allocations").document(f"past-R0-{i}").set(
+            {"studentId": f"S{i}", "roomId": "R0", "hostelId": "H0", "semester": f"older-{i}", "status": "completed"}
+        )
+    db.collection("applications").document("A-new").set({"studentId": f"S{n - 1}", "status": "approved", "semester": "now"})
+
+def counted(label: str, fn) -> None:
+    before = db.stats["round_trips"] if hasattr(db, "stats") else None
+    started = time.perf_counter()
+    asyncio.run(fn())
+    elapsed = (time.perf_counter() - started) * 1000
+    trips = f"{db.stats['round_trips'] - before:>4} round trips" if before is not None else "round trips n/a"
+    print(f"  {label:<44} {trips} {elapsed:8.1f} ms")
+
+async def student_per_document(service):
+    for a in await service.allocation_repo.get_allocations_by_user("S0"):
+        db.collection("rooms").document(a["roomId"]).get()
+        db.collection("hostels").document(a["hostelId"]).get()
+
+async def room_per_document(service):
+    for a in await service.allocation_repo.get_allocations_by_room("R0"):
+        db.collection("users").document(a["studentId"]).get()
+
+if __name__ == "__main__":
+    n = args.related
+    seed(n)
+    service = AllocationService()
+    service.claims_service = NoClaims()
+    print(f"backend: {backend}; {n} related documents")
+
+    print(f"student with {n} allocations (+ room and hostel each)")
+    counted("one read per room/hostel", lambda: student_per_document(service))
+    counted("get_user_allocations (batched)", lambda: service.get_user_allocations("S0"))
+
+    print(f"room with {n} allocations (+ student each)")
+    counted("one read per student", lambda: room_per_document(service))
+    counted("get_room_allocations (batched)", lambda: service.get_room_allocations("R0"))
+
+    print("allocation writes")
+    request = AllocationCreate(studentId=f"S{n - 1}", hostelId="H1", roomId="R1", semester="now")
+    created = {}
+
+    async def allocate():
+        created.update(await service.allocate_room(request, "bench"))
+
+    counted("allocate_room", allocate)
+    counted("cancel_allocation", lambda: service.cancel_allocation(created["id"], "bench"))
@@ -0,0 +1,110 @@
+"""
+Deadlines and circuit breaker against a fault-injecting Firestore stand-in
+(app/core/firestore_client.py, FaultPlan in benchmarks/memory_firestore.py).
+
+    python benchmarks/bench_firestore_faults.py [--requests 40] [--deadline-ms 300] [--stall-s 3]
+
+Serves GET /api/rooms/{id} from the in-memory store through the same guard
+the real client uses, and walks it through four phases: healthy, an outage
+where every round trip stalls, recovery, and a flaky spell where a share of
+round trips fail. Reports status codes and latency per phase, and what one
+request costs during the outage without a guard. Checks that the outage
+answers 503 with Retry-After, that the breaker opens after its threshold
+and fails fast, that a probe closes it once Firestore is back, and that
+retries within the deadline absorb the flaky errors.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--requests", type=int, default=40)
+parser.add_argument("--deadline-ms", type=float, default=300.0)
+parser.add_argument("--stall-s", type=float, default=3.0)
+parser.add_argument("--failures", type=int, default=5, help="Breaker threshold")
+parser.add_argument("--reset-s", type=float, default=1.0, help="Breaker open interval")
+parser.add_argument("--error-rate", type=float, default=0.2, help="Failed round trips in the flaky phase")
+args = parser.parse_args()
+
+from firestore_backend import install
+
+backend, db = install(latency=0.002)
+
+from app.core.firestore_client import CircuitBreaker, FirestoreGuard, default_deadlines, firestore_unavailable_handler
+from app.core.exceptions import FirestoreUnavailableError
+from memory_firestore import FaultPlan
+from app.api.deps import get_current_user
+from app.api.routes import rooms
+from app.repositories.loader import DocumentLoaderMiddleware
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+guard = FirestoreGuard(
+    CircuitBreaker(failures=args.failures, reset_seconds=args.reset_s),
+    {rpc: args.deadline_ms / 1000 for rpc in default_deadlines()}
+)
+faults = FaultPlan(stall=args.stall_s, seed=1)
+
+app = FastAPI()
+app.add_middleware(DocumentLoaderMiddleware)
+app.include_router(rooms.router, prefix="/api/rooms")
+app.add_exception_handler(FirestoreUnavailableError, firestore_unavailable_handler)
+app.dependency_overrides[get_current_user] = lambda: {"uid": "bench", "role": "admin"}
+
+def phase(client: TestClient, label: str, count: int) -> list:
+    results = []
+    for i in range(count):
+        started = time.perf_counter()
+        response = client.get(f"/api/rooms/R{i % 50}")
+        results.append((response.status_code, (time.perf_counter() - started) * 1000, response.headers.get("retry-after")))
+    codes = {}
+    for status, _, _ in results:
+        codes[status] = codes.get(status, 0) + 1
+    slowest = max(ms for _, ms, _ in results)
+    total = sum(ms for _, ms, _ in results)
+    print(f"  {label:<9} {', '.join(f'{n} x {s}' for s, n in sorted(codes.items())):<20} "
+          f"total {total / 1000:6.2f} s   slowest {slowest:7.1f} ms   breaker {guard.breaker.state}")
+    return results
+
+if __name__ == "__main__":
+    db._apply([("set", f"rooms/R{r}", {"id": f"R{r}", "hostel_id": "H0", "room_number": str(r), "capacity": 2, "occupied": 0})
+               for r in range(50)])
+    db.guard, db.faults = guard, faults
+    print(f"{backend}, deadline {args.deadline_ms:.0f} ms, breaker opens after {args.failures} failures for {args.reset_s} s")
+
+    with TestClient(app) as client:
+        healthy = phase(client, "healthy", args.requests)
+        assert all(status == 200 for status, _, _ in healthy), "healthy phase failed"
+
+        faults.down = True
+        outage = phase(client, "outage", args.requests)
+        assert all(status == 503 for status, _, _ in outage), "outage did not answer 503"
+        assert all(retry_after for _, _, retry_after in outage), "503 without Retry-After"
+        waited = [ms for _, ms, _ in outage if ms >= args.deadline_ms * 0.9]
+        assert len(waited) == args.failures, f"{len(waited)} requests waited out the deadline, expected {args.failures}"
+        fast = [ms for _, ms, _ in outage[args.failures:]]
+        print(f"            {len(waited)} waited out the deadline, the other {len(fast)} failed fast "
+              f"(mean {sum(fast) / max(len(fast), 1):.1f} ms)")
+
+        faults.down = False
+        time.sleep(args.reset_s)
+        recovered = phase(client, "recovery", args.requests)
+        assert all(status == 200 for status, _, _ in recovered) and guard.breaker.state == "closed", "did not recover"
+
+        faults.error_rate = args.error_rate
+        flaky = phase(client, "flaky", args.requests)
+        ok = sum(status == 200 for status, _, _ in flaky)
+        print(f"            {faults.error_rate:.0%} of round trips failed; retries within the deadline served {ok}/{len(flaky)}")
+        assert ok >= len(flaky) * 0.9, "retries did not absorb the flaky errors"
+        faults.error_rate = 0.0
+
+        # The same outage without a guard: nothing bounds the wait
+        db.guard, faults.down = None, True
+        started = time.perf_counter()
+        status = client.get("/api/rooms/R1").status_code
+        print(f"  unguarded outage: one request took {time.perf_counter() - started:.2f} s ({status}); "
+              f"{args.requests} would take ~{args.requests * args.stall_s:.0f} s")
+    print("invariants held")
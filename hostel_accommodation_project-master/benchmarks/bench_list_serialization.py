@@ -0,0 +1,171 @@
+"""
+Cost of serving large lists: FastAPI's pydantic response path against the
+orjson fast path (app/core/responses.py).
+
+    python benchmarks/bench_list_serialization.py [--rooms 10000] [--allocations 10000] [--rounds 20]
+
+Seeds the in-memory stand-in (no simulated latency) and calls the list
+endpoints through the app's routers, next to the same endpoints declared
+the old way (response_model validated and serialized per request):
+
+- GET /api/rooms/          List[dict], List[RoomOut], prevalidated RoomOut + orjson
+- GET /api/allocations/    List[dict], orjson
+- GET /api/hostels/        List[HostelOut], prevalidated HostelOut + orjson
+
+Reads are identical on both sides: rooms and hostels come from the read
+cache, allocations are queried on every request, so their read dominates
+and is shown alone. "encode only" times just the response body for
+documents already loaded: pydantic validation plus JSONResponse (what
+FastAPI does for response_model=List[dict]) against FastJSONResponse.
+Checks that both paths send the same JSON and exits non-zero otherwise.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from datetime import timedelta, timezone
+from typing import List
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from firestore_backend import install
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--rooms", type=int, default=10000)
+parser.add_argument("--allocations", type=int, default=10000)
+parser.add_argument("--hostels", type=int, default=200)
+parser.add_argument("--rounds", type=int, default=20)
+args = parser.parse_args()
+
+backend, db = install(latency=0.0)
+
+from fastapi import APIRouter, Depends, FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+from google.api_core.datetime_helpers import DatetimeWithNanoseconds
+from app.api import deps
+from app.api.routes import allocations, hostels, rooms
+from app.core.responses import FastJSONResponse
+from app.schemas.hostel import HostelOut
+from app.schemas.room import RoomOut
+from app.services.allocation_service import AllocationService
+from app.services.hostel_service import HostelService
+from app.services.room_service import RoomService
+from pydantic import TypeAdapter
+
+WARDEN = {"uid": "bench-warden", "role": "warden"}
+
+def seed() -> None:
+    # Firestore hands timestamps back as DatetimeWithNanoseconds
+    at = DatetimeWithNanoseconds(2026, 8, 1, 9, 30, tzinfo=timezone.utc)
+    for h in range(args.hostels):
+        db.collection("hostels").document(f"H{h}").set({
+            "name": f"Hostel {h}", "gender": ("male", "female", "mixed")[h % 3], "campus": "Main",
+            "isActive": True, "createdBy": "admin", "createdAt": at, "updatedAt": at
+        })
+    for j in range(args.rooms):
+        db.collection("rooms").document(f"R{j}").set({
+            "id": f"R{j}", "hostel_id": f"H{j % args.hostels}", "room_number": str(j), "capacity": 4,
+            "occupied": j % 5 if j % 5 < 4 else 4, "floor": j % 6, "block": "ABCD"[j % 4],
+            "amenities": ["wifi", "desk"] if j % 2 else ["wifi"], "created_at": at, "updated_at": at
+        })
+    for i in range(args.allocations):
+        db.collection("allocations").document(f"A{i}").set({
+            "studentId": f"S{i}", "hostelId": f"H{i % args.hostels}", "roomId": f"R{i % args.rooms}",
+            "bedLabel": "AB"[i % 2], "semester": "2026-1", "status": "active", "allocatedBy": "bench-warden",
+            "allocatedAt": DatetimeWithNanoseconds.fromtimestamp((at + timedelta(minutes=i)).timestamp(), timezone.utc)
+        })
+
+def baseline_router() -> APIRouter:
+    """
+    The list endpoints as FastAPI serves a returned list
+    """
+    router = APIRouter()
+
+    @router.get("/rooms/", response_model=List[dict])
+    async def rooms_dict(service: RoomService = Depends(deps.get_room_service)):
+        return await service.get_all_rooms()
+
+    @router.get("/rooms/typed", response_model=List[RoomOut])
+    async def rooms_typed(service: RoomService = Depends(deps.get_room_service)):
+        return await service.get_all_rooms()
+
+    @router.get("/allocations/", response_model=List[dict])
+    async def allocations_dict(service: AllocationService = Depends(deps.get_allocation_service)):
+        return await service.get_all_allocations()
+
+    @router.get("/hostels/", response_model=List[HostelOut])
+    async def hostels_typed(service: HostelService = Depends(deps.get_hostel_service)):
+        return await service.get_hostels()
+
+    return router
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    app.include_router(rooms.router, prefix="/api/rooms")
+    app.include_router(allocations.router, prefix="/api/allocations")
+    app.include_router(hostels.router, prefix="/api/hostels")
+    app.include_router(baseline_router(), prefix="/baseline")
+    for dependency in (deps.get_current_user, deps.require_warden):
+        app.dependency_overrides[dependency] = lambda: WARDEN
+    return app
+
+def encode_only(docs: List[dict]) -> None:
+    adapter = TypeAdapter(List[dict])
+    timings = {}
+    for label, encode in [
+        ("pydantic + json", lambda: JSONResponse(adapter.dump_python(adapter.validate_python(docs), mode="json")).body),
+        ("orjson", lambda: FastJSONResponse(docs).body),
+    ]:
+        started = time.perf_counter()
+        for _ in range(args.rounds):
+            encode()
+        timings[label] = (time.perf_counter() - started) / args.rounds * 1000
+    print(f"  encode only: pydantic + json {timings['pydantic + json']:.1f} ms, orjson {timings['orjson']:.1f} ms"
+          f"   {timings['pydantic + json'] / timings['orjson']:5.1f}x faster")
+
+def measure(client: TestClient, url: str):
+    response = client.get(url)
+    assert response.status_code == 200, (url, response.status_code, response.text[:200])
+    started = time.perf_counter()
+    for _ in range(args.rounds):
+        client.get(url)
+    elapsed = (time.perf_counter() - started) / args.rounds * 1000
+    return elapsed, response
+
+if __name__ == "__main__":
+    seed()
+    client = TestClient(build_app())
+    print(f"backend: {backend}; {args.rooms} rooms, {args.allocations} allocations, {args.hostels} hostels, "
+          f"{args.rounds} rounds\n")
+
+    cases = [
+        ("rooms", [("List[dict]", "/baseline/rooms/"), ("List[RoomOut]", "/baseline/rooms/typed")], "/api/rooms/"),
+        ("allocations", [("List[dict]", "/baseline/allocations/")], "/api/allocations/"),
+        ("hostels", [("List[HostelOut]", "/baseline/hostels/")], "/api/hostels/"),
+    ]
+    mismatches = 0
+    for name, baselines, fast_url in cases:
+        fast_ms, fast = measure(client, fast_url)
+        print(f"[{name}] {len(fast.json())} items, {len(fast.content) / 1024:.0f} KiB")
+        if name == "allocations":
+            service = AllocationService()
+            started = time.perf_counter()
+            for _ in range(args.rounds):
+                docs = asyncio.run(service.get_all_allocations())
+            print(f"  {'(read only)':<22} {(time.perf_counter() - started) / args.rounds * 1000:8.1f} ms")
+            encode_only(docs)
+        for label, url in baselines:
+            ms, response = measure(client, url)
+            print(f"  {label:<22} {ms:8.1f} ms/request   fast path {ms / fast_ms:5.1f}x faster")
+            # List[dict] sends rooms as stored, without RoomOut's defaults
+            if label != "List[dict]" or name == "allocations":
+                expected = sorted(response.json(), key=lambda item: item["id"])
+                if sorted(fast.json(), key=lambda item: item["id"]) != expected:
+                    mismatches += 1
+                    print(f"  !! fast path output differs from {label}")
+        print(f"  {'fast path':<22} {fast_ms:8.1f} ms/request\n")
+
+    print("outputs match" if not mismatches else f"{mismatches} output mismatches")
+    sys.exit(1 if mismatches else 0)
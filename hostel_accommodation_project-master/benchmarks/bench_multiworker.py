@@ -0,0 +1,138 @@
+"""
+Read throughput of the hostel and room list endpoints from 1 to N gunicorn
+workers, using accommodation_back_end/gunicorn.conf.py.
+
+    python benchmarks/bench_multiworker.py [--max-workers N] [--seconds 5] [--clients C]
+
+Every worker serves the real routers over its own seeded in-memory store
+(auth is overridden with a fixed warden), so the numbers measure the app
+tier: routing, the shared read cache and JSON encoding. The same C
+keep-alive client processes drive every run; on a host with fewer cores
+than workers + clients the curve flattens early.
+"""
+import argparse
+import http.client
+import multiprocessing
+import os
+import signal
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BACKEND = os.path.join(HERE, "..", "accommodation_back_end")
+READ_PATHS = ["/api/hostels/", "/api/rooms/", "/api/hostels/?is_active=true"]
+
+def create_app():
+    """
+    gunicorn factory: one hostel list and 600 rooms per worker
+    """
+    sys.path.insert(0, HERE)
+    from firestore_backend import install
+    _, db = install()
+
+    from fastapi import FastAPI
+    from app.api.deps import get_current_user
+    from app.api.routes import hostels, rooms
+    from app.core.pubsub import pubsub
+
+    for h in range(12):
+        db.collection("hostels").document(f"H{h}").set({
+            "id": f"H{h}", "name": f"Hostel {h}", "gender": ["male", "female", "mixed"][h % 3], "campus": "Main", "isActive": True
+        })
+    for r in range(600):
+        db.collection("rooms").document(f"R{r}").set({
+            "id": f"R{r}", "hostel_id": f"H{r % 12}", "room_number": str(100 + r), "capacity": 4,
+            "occupied": r % 5, "floor": r % 4, "block": "AB"[r % 2], "amenities": ["wifi", "desk"]
+        })
+
+    app = FastAPI()
+    app.include_router(hostels.router, prefix="/api/hostels")
+    app.include_router(rooms.router, prefix="/api/rooms")
+    app.dependency_overrides[get_current_user] = lambda: {"uid": "bench", "role": "warden", "email": None, "gender": None, "hostelId": None}
+
+    @app.on_event("startup")
+    async def start_pubsub():
+        await pubsub.start()
+
+    @app.on_event("shutdown")
+    async def stop_pubsub():
+        await pubsub.stop()
+
+    @app.get("/health")
+    def health():
+        return {"status": "ok"}
+
+    return app
+
+def client(port: int, seconds: float, results) -> None:
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    done = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        conn.request("GET", READ_PATHS[done % len(READ_PATHS)])
+        response = conn.getresponse()
+        response.read()
+        if response.status != 200:
+            raise RuntimeError(f"{response.status} from {READ_PATHS[done % len(READ_PATHS)]}")
+        done += 1
+    results.put(done)
+
+def wait_ready(port: int, timeout: float = 30) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/health")
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("gunicorn did not come up")
+
+def run(workers: int, port: int, seconds: float, clients: int) -> float:
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py",
+         "--workers", str(workers), "--bind", f"127.0.0.1:{port}",
+         "--pythonpath", f"{HERE},{os.path.abspath(BACKEND)}", "--log-level", "warning",
+         "bench_multiworker:create_app()"],
+        cwd=BACKEND,
+        env={**os.environ, "WEB_CONCURRENCY": str(workers)},
+        stdout=subprocess.DEVNULL,
+    )
+    try:
+        wait_ready(port)
+        # Fill every worker's read cache before timing
+        for _ in range(workers * 20):
+            conn = http.client.HTTPConnection("127.0.0.1", port)
+            for path in READ_PATHS:
+                conn.request("GET", path)
+                conn.getresponse().read()
+
+        results = multiprocessing.Queue()
+        procs = [multiprocessing.Process(target=client, args=(port, seconds, results)) for _ in range(clients)]
+        started = time.perf_counter()
+        for proc in procs:
+            proc.start()
+        total = sum(results.get() for _ in procs)
+        for proc in procs:
+            proc.join()
+        return total / (time.perf_counter() - started)
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=30)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count())
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--clients", type=int, default=None)
+    args = parser.parse_args()
+    clients = args.clients or max(2, 2 * args.max_workers)
+
+    print(f"{os.cpu_count()} CPUs, {clients} keep-alive clients, {args.seconds:.0f}s per run")
+    baseline = None
+    for workers in range(1, args.max_workers + 1):
+        rate = run(workers, 8700 + workers, args.seconds, clients)
+        baseline = baseline or rate
+        print(f"{workers:>2} workers {rate:>9,.0f} req/s   x{rate / baseline:4.2f}   {rate / baseline / workers * 100:5.1f}% efficiency")
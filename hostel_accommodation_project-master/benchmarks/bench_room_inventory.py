@@ -0,0 +1,96 @@
+"""
+Memory and aggregate speed of the columnar RoomTable
+(app/services/room_inventory.py) against the list of room dicts it replaces.
+
+    python benchmarks/bench_room_inventory.py [--rooms 50000] [--hostels 40] [--repeat 20]
+
+Room ids are created up front and shared by both representations, so the
+memory figures compare only what each one adds on top of them.
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "accommodation_back_end"))
+
+from app.services.room_inventory import RoomTable
+
+def make_rooms(n: int, hostels: int, ids: list) -> list:
+    return [
+        {
+            "id": ids[r], "hostel_id": f"hostel-{r % hostels}", "room_number": str(100 + r % 900),
+            "capacity": 2 + r % 3, "occupied": r % 4 if r % 4 <= 2 + r % 3 else 0,
+            "floor": r % 6, "block": "ABCD"[r % 4], "isActive": r % 50 != 0,
+        }
+        for r in range(n)
+    ]
+
+def measured(build):
+    tracemalloc.start()
+    value = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return value, size
+
+def timed(fn, repeat: int) -> tuple:
+    result = fn()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return result, (time.perf_counter() - started) / repeat * 1000
+
+def dict_hostel_totals(rooms: list) -> dict:
+    totals = defaultdict(lambda: {"rooms": 0, "capacity": 0, "occupied": 0, "free": 0})
+    for room in rooms:
+        capacity, occupied = room.get("capacity", 0), room.get("occupied", 0)
+        t = totals[room.get("hostel_id")]
+        t["rooms"] += 1
+        t["capacity"] += capacity
+        t["occupied"] += occupied
+        t["free"] += max(0, capacity - occupied)
+    return dict(totals)
+
+def dict_one_hostel(rooms: list, hostel_id: str) -> dict:
+    selected = [room for room in rooms if room.get("hostel_id") == hostel_id]
+    return {
+        "rooms": len(selected),
+        "capacity": sum(room.get("capacity", 0) for room in selected),
+        "occupied": sum(room.get("occupied", 0) for room in selected),
+    }
+
+def dict_filter(rooms: list) -> list:
+    return [
+        room["id"] for room in rooms
+        if room.get("hostel_id") == "hostel-3" and room.get("floor") == 3 and room.get("block") == "D"
+        and room.get("capacity", 0) - room.get("occupied", 0) >= 1 and room.get("isActive") is not False
+    ]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rooms", type=int, default=50000)
+    parser.add_argument("--hostels", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    ids = [f"room-{r:07d}" for r in range(args.rooms)]
+    rooms, dict_bytes = measured(lambda: make_rooms(args.rooms, args.hostels, ids))
+    table, table_bytes = measured(lambda: RoomTable.from_rooms(rooms))
+
+    print(f"{args.rooms:,} rooms in {args.hostels} hostels")
+    print(f"  memory     list of dicts {dict_bytes / 2**20:8.2f} MiB   RoomTable {table_bytes / 2**20:6.2f} MiB"
+          f" (columns {table.nbytes / 2**20:.2f} MiB)   x{dict_bytes / table_bytes:.1f} smaller")
+
+    cases = [
+        ("per-hostel totals", lambda: dict_hostel_totals(rooms), table.hostel_totals),
+        ("one hostel totals", lambda: dict_one_hostel(rooms, "hostel-7"), lambda: table.totals(table.mask(hostel_id="hostel-7"))),
+        ("filter hostel/floor/block/free", lambda: dict_filter(rooms),
+         lambda: table.select(hostel_id="hostel-3", floor=3, block="D", min_free=1, active_only=True)),
+    ]
+    for label, with_dicts, with_table in cases:
+        expected, dict_ms = timed(with_dicts, args.repeat)
+        got, table_ms = timed(with_table, args.repeat)
+        assert expected == got, f"{label}: results differ"
+        print(f"  {label:<32} dicts {dict_ms:8.2f} ms   RoomTable {table_ms:7.3f} ms   x{dict_ms / table_ms:6.1f}")
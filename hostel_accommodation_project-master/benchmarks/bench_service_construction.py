@@ -0,0 +1,54 @@
+"""
+Per-request cost of resolving the allocation service dependency.
+
+Compares the old pattern (``AllocationService()`` built inside every handler,
+four repositories and four collection refs per call) with the cached provider
+in ``app.api.deps``. Collection refs are built client-side, so no Firestore
+traffic happens. Uses the in-memory stand-in unless FIRESTORE_EMULATOR_HOST
+is set (see firestore_backend.py):
+
+    python benchmarks/bench_service_construction.py
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from firestore_backend import install
+
+install()
+
+from app.api.deps import get_allocation_service
+from app.services.allocation_service import AllocationService
+
+REQUESTS = 20000
+
+def measure(label, resolve):
+    resolve()  # warm up imports and the provider cache
+
+    # Hold on to every result so the snapshot diff counts what each request allocates
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    kept = [resolve() for _ in range(1000)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    diff = [stat for stat in after.compare_to(before, "filename") if stat.count_diff > 0]
+    blocks = sum(stat.count_diff for stat in diff)
+    size = sum(stat.size_diff for stat in diff)
+    del kept
+
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        resolve()
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"{label:<26} {blocks / 1000:>8.1f} allocs/request "
+        f"{size / 1000:>9.0f} B/request {elapsed / REQUESTS * 1e6:>9.2f} us/request"
+    )
+
+if __name__ == "__main__":
+    measure("per-request construction", AllocationService)
+    measure("cached provider", get_allocation_service)
@@ -0,0 +1,98 @@
+"""
+Offline snapshot export and load (app/core/snapshot.py).
+
+    python benchmarks/bench_snapshot.py [--students 10000] [--latency-ms 100]
+
+Seeds an in-memory store with a campus, exports it with one reader per
+collection and with a single reader, then mounts the snapshot and runs
+repository reads against it. Reports size against plain JSON, and that
+writes to the mount are refused. Latency is paid per 1000-document page;
+the stand-in does the rest of its work on the CPU, so the parallel speedup
+here is bounded by the cores available.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from firestore_backend import install, install_snapshot
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--students", type=int, default=10000)
+parser.add_argument("--latency-ms", type=float, default=100.0)
+args = parser.parse_args()
+
+backend, db = install(latency=args.latency_ms / 1000)
+
+from app.core.snapshot import export_snapshot
+from datetime import datetime, timezone
+from google.api_core import exceptions
+
+def seed(students: int) -> None:
+    now = datetime.now(timezone.utc)
+    writes = []
+    for h in range(20):
+        writes.append(("set", f"hostels/H{h}", {"id": f"H{h}", "name": f"Hostel {h}", "gender": ["male", "female"][h % 2], "isActive": True}))
+    rooms = students // 3
+    for r in range(rooms):
+        writes.append(("set", f"rooms/R{r}", {
+            "id": f"R{r}", "hostel_id": f"H{r % 20}", "room_number": str(r), "capacity": 3, "occupied": 2,
+            "floor": r % 5, "block": "AB"[r % 2], "amenities": ["wifi"], "created_at": now,
+        }))
+    for s in range(students):
+        writes.append(("set", f"users/S{s}", {"id": f"S{s}", "full_name": f"Student {s}", "role": "student", "gender": ["male", "female"][s % 2]}))
+        writes.append(("set", f"applications/A{s}", {"studentId": f"S{s}", "status": "approved", "semester": "2026-1", "submittedAt": now}))
+        if s % 3:
+            writes.append(("set", f"allocations/L{s}", {
+                "studentId": f"S{s}", "roomId": f"R{s % rooms}", "hostelId": f"H{s % rooms % 20}",
+                "semester": "2026-1", "status": "active", "allocatedAt": now,
+            }))
+    # Seed in one simulated commit rather than paying latency per document
+    db._apply(writes)
+
+def export_timed(directory: str, workers: int) -> dict:
+    started = time.perf_counter()
+    manifest = export_snapshot(db, directory, workers=workers)
+    manifest["wall"] = time.perf_counter() - started
+    return manifest
+
+if __name__ == "__main__":
+    seed(args.students)
+    total = len(db.documents)
+    raw_bytes = sum(len(json.dumps(data, default=str)) for data in (d for _, d in db.documents.values()))
+    print(f"{backend}: {total:,} documents, {raw_bytes / 2**20:.1f} MiB as plain JSON")
+
+    with tempfile.TemporaryDirectory() as serial_dir, tempfile.TemporaryDirectory() as directory:
+        serial = export_timed(serial_dir, workers=1)
+        parallel = export_timed(directory, workers=None)
+        size = sum(c["bytes"] for c in parallel["collections"].values())
+        print(f"  export, 1 reader                {serial['wall']:7.2f} s")
+        print(f"  export, 1 reader per collection {parallel['wall']:7.2f} s   x{serial['wall'] / parallel['wall']:.1f}")
+        print(f"  snapshot size                   {size / 2**20:7.2f} MiB   x{raw_bytes / size:.1f} smaller than JSON")
+
+        started = time.perf_counter()
+        _, snapshot = install_snapshot(directory)
+        print(f"  load                            {time.perf_counter() - started:7.2f} s   {len(snapshot.documents):,} documents")
+
+        import asyncio
+        from app.repositories.allocations_repo import AllocationRepository
+        from app.repositories.rooms_repo import RoomRepository
+
+        async def analytics():
+            rooms = await RoomRepository().get_all_rooms()
+            active = await AllocationRepository().get_allocations_by_room("R7")
+            return len(rooms), len(active)
+
+        started = time.perf_counter()
+        rooms, in_room = asyncio.run(analytics())
+        print(f"  repository reads on the mount   {time.perf_counter() - started:7.2f} s   {rooms:,} rooms, {in_room} allocations in R7")
+
+        try:
+            snapshot.collection("rooms").document("R1").update({"occupied": 0})
+            sys.exit("write to a read-only snapshot succeeded")
+        except exceptions.PermissionDenied:
+            print("  writes to the mount are refused (PermissionDenied)")
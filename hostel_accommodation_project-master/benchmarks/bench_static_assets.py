@@ -0,0 +1,95 @@
+"""
+Bytes transferred and page load cost for the frontend, before and after
+the static asset pipeline.
+
+    python scripts/build_frontend.py
+    python benchmarks/bench_static_assets.py
+
+"Cold" fetches index.html and every asset it references with an empty
+cache; "warm" repeats the visit the way a browser would: revalidating the
+page with If-None-Match and skipping immutable hashed assets entirely.
+Mounts only the static routes, so no Firestore access is needed.
+"""
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "accommodation_back_end"))
+
+from fastapi import FastAPI, Request
+from fastapi.responses import FileResponse
+from fastapi.staticfiles import StaticFiles
+from fastapi.testclient import TestClient
+from app.core.static_assets import PrecompressedStaticFiles, PageCache
+
+FRONTEND_DIR = os.path.join(os.path.dirname(__file__), "..", "frontend")
+ASSET_REF = re.compile(r'(?:src|href)=["\'](/frontend/[^"\']+|(?!https?:|#|/)[^"\']+\.(?:css|js|png|jpg))["\']')
+ROUNDS = 50
+
+def baseline_app():
+    app = FastAPI()
+    app.mount("/frontend", StaticFiles(directory=FRONTEND_DIR), name="frontend")
+
+    @app.get("/")
+    def home():
+        return FileResponse(os.path.join(FRONTEND_DIR, "index.html"))
+
+    return app
+
+def pipeline_app():
+    app = FastAPI()
+    app.mount("/frontend", PrecompressedStaticFiles(directory=FRONTEND_DIR), name="frontend")
+    pages = PageCache(FRONTEND_DIR)
+
+    @app.get("/")
+    def home(request: Request):
+        return pages.response("index.html", request)
+
+    return app
+
+def asset_urls(html: str) -> list:
+    return [ref if ref.startswith("/") else "/frontend/" + ref for ref in ASSET_REF.findall(html)]
+
+def visit(client, cache: dict) -> int:
+    """
+    Load / and its assets once; returns bytes on the wire. cache maps URL to
+    (etag, immutable) from earlier visits.
+    """
+    transferred = 0
+    headers = {"Accept-Encoding": "br, gzip"}
+    etag, _ = cache.get("/", (None, False))
+    page = client.get("/", headers={**headers, **({"If-None-Match": etag} if etag else {})})
+    transferred += int(page.headers.get("content-length", len(page.content)))
+    if page.status_code == 200:
+        cache["/"] = (page.headers.get("etag"), False)
+        cache["html"] = page.text
+    for url in asset_urls(cache["html"]):
+        etag, immutable = cache.get(url, (None, False))
+        if immutable:
+            continue
+        response = client.get(url, headers={**headers, **({"If-None-Match": etag} if etag else {})})
+        transferred += int(response.headers.get("content-length", len(response.content)))
+        if response.status_code == 200:
+            cache[url] = (response.headers.get("etag"), "immutable" in response.headers.get("cache-control", ""))
+    return transferred
+
+def measure(name: str, app) -> None:
+    client = TestClient(app)
+    cold_bytes = cold_time = warm_bytes = warm_time = 0
+    for _ in range(ROUNDS):
+        cache = {}
+        start = time.perf_counter()
+        cold_bytes = visit(client, cache)
+        cold_time += time.perf_counter() - start
+        start = time.perf_counter()
+        warm_bytes = visit(client, cache)
+        warm_time += time.perf_counter() - start
+    print(f"{name:<10} cold {cold_bytes / 1024:8.1f} KiB {cold_time / ROUNDS * 1000:7.2f} ms"
+          f"   warm {warm_bytes / 1024:8.1f} KiB {warm_time / ROUNDS * 1000:7.2f} ms")
+
+if __name__ == "__main__":
+    if not os.path.isdir(os.path.join(FRONTEND_DIR, "build")):
+        print("frontend/build/ not found; run scripts/build_frontend.py first to measure hashed assets")
+    measure("baseline", baseline_app())
+    measure("pipeline", pipeline_app())
@@ -0,0 +1,56 @@
+"""
+Choose the Firestore backend for a benchmark run.
+
+Call install() before importing any repository or service: they bind
+app.core.firebase.db when they are imported. With FIRESTORE_EMULATOR_HOST
+set (and GCLOUD_PROJECT, e.g. "demo") the real client talks to the local
+emulator; otherwise db is replaced by the in-memory stand-in.
+install_snapshot() serves a read-only snapshot (scripts/snapshot.py) instead,
+so the existing repositories and services run against it unchanged without
+touching live quota; writes raise PermissionDenied.
+"""
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "accommodation_back_end"))
+
+from memory_firestore import MemoryFirestore
+
+logger = logging.getLogger(__name__)
+
+def install(latency: float = 0.0):
+    """
+    Returns (backend name, db)
+    """
+    import app.core.firebase as firebase
+    if os.getenv("FIRESTORE_EMULATOR_HOST") and firebase.db is not None:
+        return f"emulator {os.environ['FIRESTORE_EMULATOR_HOST']}", firebase.db
+
+    firebase.db = MemoryFirestore(latency=latency)
+    return f"in-memory ({latency * 1000:.1f} ms round trips)", firebase.db
+
+def install_snapshot(directory: str, latency: float = 0.0):
+    """
+    Returns (backend name, db) for a mounted read-only snapshot
+    """
+    import app.core.firebase as firebase
+    firebase.db = load_snapshot(directory, latency)
+    return f"snapshot {directory} ({latency * 1000:.1f} ms round trips)", firebase.db
+
+def load_snapshot(directory: str, latency: float = 0.0) -> MemoryFirestore:
+    """
+    A read-only in-memory Firestore holding every collection in the snapshot
+    """
+    from app.core.snapshot import read_collection, read_manifest
+    manifest = read_manifest(directory)
+    store = MemoryFirestore(latency=latency, read_only=True)
+    with ThreadPoolExecutor(max_workers=len(manifest["collections"]) or 1) as pool:
+        loaded = list(pool.map(lambda name: read_collection(directory, name), manifest["collections"]))
+    for documents in loaded:
+        for path, data in documents.items():
+            store.documents[path] = (store.next_version, data)
+            store.next_version += 1
+    logger.info("loaded snapshot %s from %s: %d documents", directory, manifest["createdAt"], len(store.documents))
+    return store
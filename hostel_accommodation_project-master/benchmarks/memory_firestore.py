@@ -0,0 +1,427 @@
+"""
+In-memory stand-in for the Firestore client, for benchmarks, tests and
+local runs without the emulator. Not part of the app: install it with
+firestore_backend.install() or install_snapshot().
+
+Covers the subset of the API this app uses: collections and subcollections,
+document get/set/update/delete, get_all, where/order_by/limit/start_after
+queries, count(),
+batches, field transforms (SERVER_TIMESTAMP, DELETE_FIELD, Increment,
+Maximum, Minimum, ArrayUnion, ArrayRemove) and transactions. Transactions are optimistic:
+reads record the document version and the commit aborts with
+google.api_core.exceptions.Aborted if any of them changed, so the real
+@transactional decorator retries them exactly as it does against Firestore.
+
+latency (seconds) is slept on every simulated round trip, outside the store
+lock, so concurrent callers on threads interleave the way real RPCs do.
+Round trips are reported to the request trace under the name of the RPC the
+real client would send.
+
+Given a FirestoreGuard (app/core/firestore_client.py), round trips run
+under its deadlines and circuit breaker like the real client's RPCs, and a
+FaultPlan makes some of them fail or stall.
+"""
+from google.api_core import exceptions
+from google.cloud.firestore_v1 import transforms
+from app.core.profiling import firestore_rpc
+from datetime import datetime, timezone
+import copy
+import random
+import threading
+import time
+import uuid
+
+DOCUMENT_ID = "__name__"
+
+class FaultPlan:
+    """
+    Faults injected into the stand-in's round trips: error_rate of them fail
+    with ServiceUnavailable, stall_rate of them take `stall` extra seconds
+    (past any shorter deadline), and while `down` every one of them stalls.
+    Attributes can be changed while the store is in use.
+    """
+
+    def __init__(self, error_rate: float = 0.0, stall_rate: float = 0.0, stall: float = 30.0, down: bool = False,
+                 seed: int = None):
+        self.error_rate = error_rate
+        self.stall_rate = stall_rate
+        self.stall = stall
+        self.down = down
+        self.rng = random.Random(seed)
+
+    def draw(self) -> tuple:
+        """
+        (fails, extra delay) for one round trip
+        """
+        if self.down:
+            return False, self.stall
+        stalled = self.rng.random() < self.stall_rate
+        return self.rng.random() < self.error_rate, self.stall if stalled else 0.0
+
+class MemoryFirestore:
+    def __init__(self, latency: float = 0.0, read_only: bool = False, guard=None, faults: FaultPlan = None):
+        self.latency = latency
+        self.guard = guard
+        self.faults = faults
+        # Read-only stores (mounted snapshots) reject every write
+        self.read_only = read_only
+        self.lock = threading.Lock()
+        # path -> (version, data)
+        self.documents = {}
+        self.next_version = 1
+        self.stats = {"round_trips": 0, "reads": 0, "commits": 0, "aborts": 0}
+
+    def _round_trip(self, rpc: str) -> None:
+        self.stats["round_trips"] += 1
+        if self.guard is None:
+            self._respond(rpc)
+        else:
+            self.guard.call(rpc, self._respond, rpc)
+
+    def _respond(self, rpc: str, timeout: float = None, retry=None) -> None:
+        # Same keyword arguments as the GAPIC methods the guard wraps
+        attempt = lambda: self._attempt(rpc, timeout)
+        return retry(attempt)() if retry is not None else attempt()
+
+    def _attempt(self, rpc: str, timeout: float = None) -> None:
+        with firestore_rpc(rpc):
+            fails, delay = self.faults.draw() if self.faults is not None else (False, 0.0)
+            delay += self.latency
+            if timeout is not None and delay > timeout:
+                time.sleep(timeout)
+                raise exceptions.DeadlineExceeded(f"{rpc} missed its {timeout} s deadline")
+            if delay:
+                time.sleep(delay)
+            if fails:
+                raise exceptions.ServiceUnavailable(f"{rpc}: injected fault")
+
+    def collection(self, name: str) -> "MemoryCollection":
+        return MemoryCollection(self, name)
+
+    def transaction(self, max_attempts: int = 5, read_only: bool = False) -> "MemoryTransaction":
+        return MemoryTransaction(self, max_attempts, read_only)
+
+    def batch(self) -> "MemoryWriteBatch":
+        return MemoryWriteBatch(self)
+
+    def get_all(self, references, field_paths=None, transaction: "MemoryTransaction" = None):
+        if transaction is not None:
+            return transaction.get_all(references)
+        found = self._read_many([ref.path for ref in references])
+        return [MemorySnapshot(ref, found[ref.path][1]) for ref in references]
+
+    def _read_many(self, paths: list) -> dict:
+        # One round trip for any number of documents
+        self._round_trip("batch_get_documents")
+        with self.lock:
+            self.stats["reads"] += len(paths)
+            found = {}
+            for path in paths:
+                version, data = self.documents.get(path, (0, None))
+                found[path] = (version, copy.deepcopy(data))
+            return found
+
+    def _read(self, path: str) -> tuple:
+        self._round_trip("batch_get_documents")
+        with self.lock:
+            self.stats["reads"] += 1
+            version, data = self.documents.get(path, (0, None))
+            return version, copy.deepcopy(data)
+
+    def _scan(self, parent: str) -> list:
+        # Direct children of a collection path: parent/doc_id, no deeper.
+        # Stored dicts are replaced, never mutated, on write, so they are
+        # returned uncopied; the query copies only the rows it yields.
+        self._round_trip("run_query")
+        prefix = parent + "/"
+        with self.lock:
+            return [
+                (path, version, data)
+                for path, (version, data) in self.documents.items()
+                if path.startswith(prefix) and "/" not in path[len(prefix):]
+            ]
+
+    def _apply(self, writes: list, expected: dict = None) -> None:
+        """
+        Apply (op, path, data) writes atomically; abort if any path in
+        expected no longer has the version that was read
+        """
+        if self.read_only:
+            raise exceptions.PermissionDenied("This Firestore snapshot is read-only")
+        self._round_trip("commit")
+        with self.lock:
+            for path, version in (expected or {}).items():
+                if self.documents.get(path, (0, None))[0] != version:
+                    self.stats["aborts"] += 1
+                    raise exceptions.Aborted(f"Transaction lock timeout on {path}")
+            staged = {}
+            for op, path, data in writes:
+                current = staged[path] if path in staged else self.documents.get(path, (0, None))[1]
+                if op == "update" and current is None:
+                    raise exceptions.NotFound(f"No document to update: {path}")
+                if op == "delete":
+                    staged[path] = None
+                elif op == "set":
+                    staged[path] = _apply_fields({}, data)
+                elif op == "merge":
+                    staged[path] = _apply_fields(copy.deepcopy(current or {}), data)
+                else:
+                    staged[path] = _apply_fields(copy.deepcopy(current), data)
+            for path, data in staged.items():
+                if data is None:
+                    self.documents.pop(path, None)
+                else:
+                    self.documents[path] = (self.next_version, data)
+                    self.next_version += 1
+            self.stats["commits"] += 1
+
+def _apply_fields(target: dict, fields: dict) -> dict:
+    for key, value in fields.items():
+        parts = key.split(".")
+        parent = target
+        for part in parts[:-1]:
+            parent = parent.setdefault(part, {})
+        name = parts[-1]
+        if value is transforms.DELETE_FIELD:
+            parent.pop(name, None)
+        elif value is transforms.SERVER_TIMESTAMP:
+            parent[name] = datetime.now(timezone.utc)
+        elif isinstance(value, transforms.Increment):
+            parent[name] = (parent.get(name) or 0) + value.value
+        elif isinstance(value, transforms.Maximum):
+            parent[name] = value.value if parent.get(name) is None else max(parent[name], value.value)
+        elif isinstance(value, transforms.Minimum):
+            parent[name] = value.value if parent.get(name) is None else min(parent[name], value.value)
+        elif isinstance(value, transforms.ArrayUnion):
+            existing = list(parent.get(name) or [])
+            parent[name] = existing + [v for v in value.values if v not in existing]
+        elif isinstance(value, transforms.ArrayRemove):
+            parent[name] = [v for v in parent.get(name) or [] if v not in value.values]
+        else:
+            parent[name] = copy.deepcopy(value)
+    return target
+
+def _field(data: dict, path: str, doc_id: str):
+    if path == DOCUMENT_ID:
+        return doc_id
+    value = data
+    for part in path.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return None
+        value = value[part]
+    return value
+
+def _matches(value, op: str, expected) -> bool:
+    if op == "==":
+        return value == expected
+    if op == "!=":
+        return value is not None and value != expected
+    if op == "in":
+        return value in expected
+    if op == "not-in":
+        return value is not None and value not in expected
+    if op == "array-contains":
+        return isinstance(value, list) and expected in value
+    if op == "array-contains-any":
+        return isinstance(value, list) and any(v in value for v in expected)
+    if value is None:
+        return False
+    return {"<": value < expected, "<=": value <= expected, ">": value > expected, ">=": value >= expected}[op]
+
+class MemorySnapshot:
+    def __init__(self, reference: "MemoryDocument", data: dict = None):
+        self.reference = reference
+        self.id = reference.id
+        self._data = data
+
+    @property
+    def exists(self) -> bool:
+        return self._data is not None
+
+    def to_dict(self):
+        return copy.deepcopy(self._data) if self._data is not None else None
+
+    def get(self, field: str):
+        return _field(self._data or {}, field, self.id)
+
+class MemoryDocument:
+    def __init__(self, store: MemoryFirestore, path: str):
+        self.store = store
+        self.path = path
+        self.id = path.rsplit("/", 1)[-1]
+
+    def collection(self, name: str) -> "MemoryCollection":
+        return MemoryCollection(self.store, f"{self.path}/{name}")
+
+    def get(self, transaction: "MemoryTransaction" = None) -> MemorySnapshot:
+        if transaction is not None:
+            return transaction.get(self)
+        return MemorySnapshot(self, self.store._read(self.path)[1])
+
+    def set(self, data: dict, merge: bool = False) -> None:
+        self.store._apply([("merge" if merge else "set", self.path, data)])
+
+    def update(self, data: dict) -> None:
+        self.store._apply([("update", self.path, data)])
+
+    def delete(self) -> None:
+        self.store._apply([("delete", self.path, None)])
+
+class MemoryQuery:
+    def __init__(self, store: MemoryFirestore, parent: str, filters=(), orders=(), limit_to=None, after=None):
+        self.store = store
+        self.parent = parent
+        self.filters = list(filters)
+        self.orders = list(orders)
+        self.limit_to = limit_to
+        self.after = after
+
+    def _copy(self, **changes) -> "MemoryQuery":
+        fields = {"filters": self.filters, "orders": self.orders, "limit_to": self.limit_to, "after": self.after, **changes}
+        return MemoryQuery(self.store, self.parent, **fields)
+
+    def where(self, field: str = None, op: str = None, value=None, filter=None) -> "MemoryQuery":
+        if filter is not None:
+            field, op, value = filter.field_path, filter.op_string, filter.value
+        return self._copy(filters=self.filters + [(field, op, value)])
+
+    def order_by(self, field: str, direction: str = "ASCENDING") -> "MemoryQuery":
+        return self._copy(orders=self.orders + [(field, direction == "DESCENDING")])
+
+    def limit(self, count: int) -> "MemoryQuery":
+        return self._copy(limit_to=count)
+
+    def start_after(self, snapshot: "MemorySnapshot") -> "MemoryQuery":
+        # Snapshot cursors only, which is what paging code passes
+        return self._copy(after=snapshot.reference.path)
+
+    def _results(self) -> list:
+        rows = []
+        for path, version, data in self.store._scan(self.parent):
+            doc_id = path.rsplit("/", 1)[-1]
+            if all(_matches(_field(data, f, doc_id), op, v) for f, op, v in self.filters):
+                rows.append((path, version, data))
+        for field, descending in reversed(self.orders or [(DOCUMENT_ID, False)]):
+            if field == DOCUMENT_ID:
+                # Siblings share a parent, so path order is document id order
+                rows.sort(key=lambda row: row[0], reverse=descending)
+                continue
+            rows.sort(key=lambda row: (_field(row[2], field, row[0].rsplit("/", 1)[-1]) is None,
+                                       _field(row[2], field, row[0].rsplit("/", 1)[-1])), reverse=descending)
+        if self.after is not None:
+            paths = [row[0] for row in rows]
+            if self.after in paths:
+                rows = rows[paths.index(self.after) + 1:]
+            else:
+                # Cursor document no longer matches: fall back to document order
+                rows = [row for row in rows if row[0] > self.after]
+        rows = rows[:self.limit_to] if self.limit_to is not None else rows
+        with self.store.lock:
+            self.store.stats["reads"] += len(rows)
+        return [(path, version, copy.deepcopy(data)) for path, version, data in rows]
+
+    def stream(self, transaction: "MemoryTransaction" = None):
+        for path, version, data in self._results():
+            if transaction is not None:
+                transaction.read_versions.setdefault(path, version)
+            yield MemorySnapshot(MemoryDocument(self.store, path), data)
+
+    def get(self, transaction: "MemoryTransaction" = None) -> list:
+        return list(self.stream(transaction))
+
+    def count(self) -> "MemoryCount":
+        return MemoryCount(self)
+
+class MemoryCount:
+    def __init__(self, query: MemoryQuery):
+        self.query = query
+
+    def get(self) -> list:
+        # Mirrors the AggregationResult shape: result[0][0].value
+        return [[type("AggregationResult", (), {"alias": "count", "value": len(self.query._results())})()]]
+
+class MemoryCollection(MemoryQuery):
+    def __init__(self, store: MemoryFirestore, path: str):
+        super().__init__(store, path)
+        self.id = path.rsplit("/", 1)[-1]
+
+    def document(self, document_id: str = None) -> MemoryDocument:
+        return MemoryDocument(self.store, f"{self.parent}/{document_id or uuid.uuid4().hex[:20]}")
+
+    def add(self, data: dict) -> tuple:
+        ref = self.document()
+        ref.set(data)
+        return datetime.now(timezone.utc), ref
+
+class MemoryWriteBatch:
+    def __init__(self, store: MemoryFirestore):
+        self.store = store
+        self.writes = []
+
+    def set(self, reference: MemoryDocument, data: dict, merge: bool = False) -> None:
+        self.writes.append(("merge" if merge else "set", reference.path, data))
+
+    def update(self, reference: MemoryDocument, data: dict) -> None:
+        self.writes.append(("update", reference.path, data))
+
+    def delete(self, reference: MemoryDocument) -> None:
+        self.writes.append(("delete", reference.path, None))
+
+    def commit(self) -> list:
+        if len(self.writes) > 500:
+            raise exceptions.InvalidArgument("maximum 500 writes allowed per request")
+        self.store._apply(self.writes)
+        self.writes = []
+        return []
+
+class MemoryTransaction(MemoryWriteBatch):
+    """
+    Implements the private hooks google.cloud.firestore_v1.transactional
+    drives (_begin, _commit, _rollback, _clean_up), so service code runs unchanged.
+    """
+
+    def __init__(self, store: MemoryFirestore, max_attempts: int = 5, read_only: bool = False):
+        super().__init__(store)
+        self._max_attempts = max_attempts
+        self._read_only = read_only
+        self._id = None
+        self.read_versions = {}
+
+    @property
+    def in_progress(self) -> bool:
+        return self._id is not None
+
+    def _begin(self, retry_id=None) -> None:
+        self._id = uuid.uuid4().bytes
+
+    def _clean_up(self) -> None:
+        self.writes = []
+        self.read_versions = {}
+        self._id = None
+
+    def _rollback(self) -> None:
+        self._clean_up()
+
+    def _commit(self) -> list:
+        try:
+            self.store._apply(self.writes, self.read_versions)
+        finally:
+            self._clean_up()
+        return []
+
+    def get_all(self, references) -> list:
+        if self.writes:
+            raise exceptions.InvalidArgument("Firestore transactions require all reads to be executed before all writes.")
+        found = self.store._read_many([ref.path for ref in references])
+        for path, (version, _) in found.items():
+            self.read_versions.setdefault(path, version)
+        return [MemorySnapshot(ref, found[ref.path][1]) for ref in references]
+
+    def get(self, reference) -> MemorySnapshot:
+        if isinstance(reference, MemoryQuery):
+            return reference.stream(transaction=self)
+        if self.writes:
+            raise exceptions.InvalidArgument("Firestore transactions require all reads to be executed before all writes.")
+        version, data = self.store._read(reference.path)
+        self.read_versions.setdefault(reference.path, version)
+        return MemorySnapshot(reference, data)
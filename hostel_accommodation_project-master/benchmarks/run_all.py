@@ -0,0 +1,33 @@
+"""
+Run every benchmarks/bench_*.py with its defaults and report which failed.
+
+    python benchmarks/run_all.py [name-filter]
+
+A benchmark fails when it exits non-zero; the correctness harnesses (e.g.
+bench_allocation_contention) do so when an invariant is violated.
+"""
+import glob
+import os
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+if __name__ == "__main__":
+    name_filter = sys.argv[1] if len(sys.argv) > 1 else ""
+    scripts = [path for path in sorted(glob.glob(os.path.join(HERE, "bench_*.py"))) if name_filter in os.path.basename(path)]
+    failed = []
+    for path in scripts:
+        name = os.path.basename(path)
+        print(f"== {name}", flush=True)
+        started = time.perf_counter()
+        code = subprocess.call([sys.executable, path], cwd=os.path.dirname(HERE))
+        print(f"-- {name}: {'ok' if code == 0 else f'FAILED (exit {code})'} in {time.perf_counter() - started:.1f}s\n", flush=True)
+        if code != 0:
+            failed.append(name)
+
+    print(f"{len(scripts) - len(failed)}/{len(scripts)} benchmarks passed")
+    if failed:
+        print("Failed: " + ", ".join(failed))
+        sys.exit(1)
@@ -210,6 +210,18 @@ class AuthManager {
         return { success: true };
     }
 
+    // ID token for the backend API; only present when signed in through Firebase Auth
+    async getIdToken() {
+        const current = window.firebaseAuth && window.firebaseAuth.currentUser;
+        if (!current) return null;
+        try {
+            return await current.getIdToken();
+        } catch (error) {
+            console.warn('Could not get ID token:', error.message);
+            return null;
+        }
+    }
+
     async getUserProfile(uid) {
         if (this.useFirestore) {
             try {
@@ -474,7 +474,31 @@ class HostelApp {
         `;
     }
 
-    setupStudentListeners(studentId) {
+    // The whole dashboard in one request; null when there is no API session
+    async fetchDashboard() {
+        const token = await authManager.getIdToken();
+        if (!token) return null;
+        try {
+            const response = await fetch('/api/dashboard/', {
+                headers: { 'Authorization': `Bearer ${token}` }
+            });
+            if (!response.ok) return null;
+            return await response.json();
+        } catch (error) {
+            console.warn('Dashboard API unavailable, using Firestore listeners:', error.message);
+            return null;
+        }
+    }
+
+    async setupStudentListeners(studentId) {
+        const dashboard = await this.fetchDashboard();
+        if (dashboard) {
+            this.updateStudentAppStatus(dashboard.applications || []);
+            const alloc = dashboard.allocation;
+            this.updateStudentRoomStatus(alloc ? [{ ...alloc, roomCapacity: alloc.capacity }] : []);
+            return;
+        }
+
         if (!window.firebaseService || !window.firebaseDb) {
             this.updateStudentAppStatus([]);
             this.updateStudentRoomStatus([]);
@@ -794,7 +818,16 @@ class HostelApp {
         }, 4000);
     }
 
-    setupWardenDashboardListeners() {
+    async setupWardenDashboardListeners() {
+        const dashboard = await this.fetchDashboard();
+        // A one-off snapshot, unlike the listeners: refreshed after each approve/reject
+        this.wardenDashboardSnapshot = !!dashboard;
+        if (dashboard) {
+            this.updateWardenStats(dashboard.applicationCounts || {});
+            this.updateWardenPendingApps(dashboard.pendingApplications || []);
+            return;
+        }
+
         if (!window.firebaseService || !window.firebaseDb) {
             const listEl = document.getElementById('warden-pending-apps-list');
             if (listEl) listEl.innerHTML = '<p style="color: var(--text-secondary); text-align: center; padding: 2rem;">No Firestore connection. Data unavailable.</p>';
@@ -802,54 +835,59 @@ class HostelApp {
         }
 
         window.firebaseService.listenToAllApplications((apps) => {
-            const pending = apps.filter(a => a.status === 'pending').length;
-            const approved = apps.filter(a => a.status === 'approved').length;
-            const allocated = apps.filter(a => a.status === 'allocated').length;
-            const rejected = apps.filter(a => a.status === 'rejected').length;
-
-            const el = (id) => document.getElementById(id);
-            if (el('stat-pending')) el('stat-pending').textContent = pending;
-            if (el('stat-approved')) el('stat-approved').textContent = approved;
-            if (el('stat-allocated')) el('stat-allocated').textContent = allocated;
-            if (el('stat-rejected')) el('stat-rejected').textContent = rejected;
+            const counts = {};
+            apps.forEach(a => { counts[a.status] = (counts[a.status] || 0) + 1; });
+            this.updateWardenStats(counts);
         });
 
         window.firebaseService.listenToPendingApplications((apps) => {
-            const countEl = document.getElementById('warden-pending-count');
-            const listEl = document.getElementById('warden-pending-apps-list');
-            if (!listEl) return;
+            this.updateWardenPendingApps(apps);
+        });
+    }
 
-            if (countEl) countEl.textContent = apps.length;
+    updateWardenStats(counts) {
+        const el = (id) => document.getElementById(id);
+        if (el('stat-pending')) el('stat-pending').textContent = counts.pending || 0;
+        if (el('stat-approved')) el('stat-approved').textContent = counts.approved || 0;
+        if (el('stat-allocated')) el('stat-allocated').textContent = counts.allocated || 0;
+        if (el('stat-rejected')) el('stat-rejected').textContent = counts.rejected || 0;
+    }
 
-            if (apps.length === 0) {
-                listEl.innerHTML = '<p style="color: var(--text-secondary); text-align: center; padding: 2rem;"><i class="fas fa-check-circle" style="color: var(--accent-green);"></i> No pending applications</p>';
-                return;
-            }
+    updateWardenPendingApps(apps) {
+        const countEl = document.getElementById('warden-pending-count');
+        const listEl = document.getElementById('warden-pending-apps-list');
+        if (!listEl) return;
 
-            listEl.innerHTML = apps.map(a => `
-                <div style="padding: 1rem; border-bottom: 1px solid var(--border-color); background: var(--bg-secondary); border-radius: 8px; margin-bottom: 0.5rem;">
-                    <div style="display: flex; justify-content: space-between; align-items: start; margin-bottom: 0.5rem;">
-                        <div>
-                            <p style="font-weight: 600; color: var(--text-primary); margin: 0;">${a.studentName || 'Unknown Student'}</p>
-                            <p style="font-size: 0.85rem; color: var(--text-secondary); margin: 0.25rem 0 0 0;">
-                                <i class="fas fa-id-card"></i> ${a.studentId || ''} &bull;
-                                <i class="fas fa-venus-mars"></i> ${a.gender || 'N/A'}
-                                ${a.specialConditions ? ` &bull; <i class="fas fa-exclamation-circle" style="color: var(--accent-orange);"></i> Special conditions` : ''}
-                            </p>
-                        </div>
-                        <span style="background: var(--accent-orange); color: white; padding: 0.15rem 0.5rem; border-radius: 12px; font-size: 0.75rem;">Pending</span>
-                    </div>
-                    <div style="display: flex; gap: 0.5rem; margin-top: 0.75rem;">
-                        <button class="btn btn-sm" style="flex: 1; background: var(--accent-green); color: white; border: none; padding: 0.5rem; border-radius: 6px; cursor: pointer;" onclick="app.handleApproveApplication('${a.id}', '${a.studentId}')">
-                            <i class="fas fa-check"></i> Approve
-                        </button>
-                        <button class="btn btn-sm" style="flex: 1; background: var(--primary-red); color: white; border: none; padding: 0.5rem; border-radius: 6px; cursor: pointer;" onclick="app.handleRejectApplication('${a.id}', '${a.studentId}')">
-                            <i class="fas fa-times"></i> Reject
-                        </button>
+        if (countEl) countEl.textContent = apps.length;
+
+        if (apps.length === 0) {
+            listEl.innerHTML = '<p style="color: var(--text-secondary); text-align: center; padding: 2rem;"><i class="fas fa-check-circle" style="color: var(--accent-green);"></i> No pending applications</p>';
+            return;
+        }
+
+        listEl.innerHTML = apps.map(a => `
+            <div style="padding: 1rem; border-bottom: 1px solid var(--border-color); background: var(--bg-secondary); border-radius: 8px; margin-bottom: 0.5rem;">
+                <div style="display: flex; justify-content: space-between; align-items: start; margin-bottom: 0.5rem;">
+                    <div>
+                        <p style="font-weight: 600; color: var(--text-primary); margin: 0;">${a.studentName || 'Unknown Student'}</p>
+                        <p style="font-size: 0.85rem; color: var(--text-secondary); margin: 0.25rem 0 0 0;">
+                            <i class="fas fa-id-card"></i> ${a.studentId || ''} &bull;
+                            <i class="fas fa-venus-mars"></i> ${a.gender || 'N/A'}
+                            ${a.specialConditions ? ` &bull; <i class="fas fa-exclamation-circle" style="color: var(--accent-orange);"></i> Special conditions` : ''}
+                        </p>
                     </div>
+                    <span style="background: var(--accent-orange); color: white; padding: 0.15rem 0.5rem; border-radius: 12px; font-size: 0.75rem;">Pending</span>
                 </div>
-            `).join('');
-        });
+                <div style="display: flex; gap: 0.5rem; margin-top: 0.75rem;">
+                    <button class="btn btn-sm" style="flex: 1; background: var(--accent-green); color: white; border: none; padding: 0.5rem; border-radius: 6px; cursor: pointer;" onclick="app.handleApproveApplication('${a.id}', '${a.studentId}')">
+                        <i class="fas fa-check"></i> Approve
+                    </button>
+                    <button class="btn btn-sm" style="flex: 1; background: var(--primary-red); color: white; border: none; padding: 0.5rem; border-radius: 6px; cursor: pointer;" onclick="app.handleRejectApplication('${a.id}', '${a.studentId}')">
+                        <i class="fas fa-times"></i> Reject
+                    </button>
+                </div>
+            </div>
+        `).join('');
     }
 
     // ========================
@@ -1509,6 +1547,7 @@ class HostelApp {
             try {
                 await window.firebaseService.approveApplication(applicationId, this.currentUser?.id || '', studentId);
                 this.showToast('Application approved!', 'success');
+                if (this.wardenDashboardSnapshot && document.getElementById('warden-pending-apps-list')) this.setupWardenDashboardListeners();
             } catch (error) {
                 this.showToast('Failed to approve: ' + error.message, 'error');
             }
@@ -1523,6 +1562,7 @@ class HostelApp {
             try {
                 await window.firebaseService.rejectApplication(applicationId, this.currentUser?.id || '', reason, studentId);
                 this.showToast('Application rejected.', 'warning');
+                if (this.wardenDashboardSnapshot && document.getElementById('warden-pending-apps-list')) this.setupWardenDashboardListeners();
             } catch (error) {
                 this.showToast('Failed to reject: ' + error.message, 'error');
             }
@@ -0,0 +1,80 @@
+"""
+Backfill allocations_index lock documents from existing active allocations.
+
+allocate_room now relies on allocations_index/{studentId}_{semester} to
+enforce one active allocation per student per semester. Run this once after
+deploying that change (it is idempotent) so students allocated before it
+are covered too:
+
+    python scripts/backfill_allocation_index.py [--dry-run]
+
+Students that already hold several active allocations for a semester are
+locked to the earliest one and listed for a warden to resolve.
+"""
+import argparse
+import asyncio
+import os
+import sys
+from collections import defaultdict
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "accommodation_back_end"))
+
+from app.core.firebase import db, ALLOCATIONS_COLLECTION, ALLOCATIONS_INDEX_COLLECTION
+from app.services.allocation_service import student_lock_id
+
+# Firestore caps a batched write at 500 operations
+BATCH_SIZE = 500
+
+def allocated_at(allocation: dict):
+    # Missing timestamps sort last; the id keeps the order deterministic
+    value = allocation.get("allocatedAt")
+    return (value is None, value.timestamp() if value is not None else 0, allocation["id"])
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--dry-run", action="store_true", help="Report what would be written without writing")
+    args = parser.parse_args()
+
+    by_student = defaultdict(list)
+    for doc in db.collection(ALLOCATIONS_COLLECTION).where("status", "==", "active").stream():
+        allocation = {**doc.to_dict(), "id": doc.id}
+        if allocation.get("studentId") and allocation.get("semester"):
+            by_student[(allocation["studentId"], allocation["semester"])].append(allocation)
+
+    index = db.collection(ALLOCATIONS_INDEX_COLLECTION)
+    batch = db.batch()
+    pending = written = 0
+    duplicates = []
+    for (student_id, semester), allocations in sorted(by_student.items()):
+        allocations.sort(key=allocated_at)
+        kept = allocations[0]
+        if len(allocations) > 1:
+            duplicates.append((student_id, semester, [a["id"] for a in allocations]))
+
+        batch.set(index.document(student_lock_id(student_id, semester)), {
+            "studentId": student_id,
+            "semester": semester,
+            "allocationId": kept["id"],
+            "hostelId": kept.get("hostelId"),
+            "roomId": kept.get("roomId"),
+            "createdAt": kept.get("allocatedAt")
+        })
+        pending += 1
+        if pending == BATCH_SIZE:
+            if not args.dry_run:
+                batch.commit()
+            written += pending
+            batch, pending = db.batch(), 0
+
+    if pending and not args.dry_run:
+        batch.commit()
+    written += pending
+
+    print(f"{'Would write' if args.dry_run else 'Wrote'} {written} allocations_index locks")
+    if duplicates:
+        print(f"{len(duplicates)} students hold more than one active allocation (locked to the first listed):")
+        for student_id, semester, allocation_ids in duplicates:
+            print(f"  {student_id} {semester}: {', '.join(allocation_ids)}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,67 @@
+"""
+Rebuild the rooms/{roomId}/roster subcollections from active allocations.
+
+The allocate and cancel transactions keep rosters current; run this once
+after deploying them, or after editing allocations outside the API
+(idempotent):
+
+    python scripts/backfill_room_roster.py [--dry-run]
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "accommodation_back_end"))
+
+from app.core.firebase import db, ALLOCATIONS_COLLECTION, ROOMS_COLLECTION, ROOM_ROSTER_SUBCOLLECTION, USERS_COLLECTION
+
+# Firestore caps a batched write at 500 operations
+BATCH_SIZE = 500
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--dry-run", action="store_true", help="Report what would be written without writing")
+    args = parser.parse_args()
+
+    names = {doc.id: (doc.to_dict() or {}).get("full_name") for doc in db.collection(USERS_COLLECTION).stream()}
+    active = {}
+    for doc in db.collection(ALLOCATIONS_COLLECTION).where("status", "==", "active").stream():
+        allocation = doc.to_dict()
+        if allocation.get("roomId"):
+            active[doc.id] = allocation
+
+    rooms = db.collection(ROOMS_COLLECTION)
+    writes = []
+    for allocation_id, allocation in active.items():
+        writes.append(("set", rooms.document(allocation["roomId"]).collection(ROOM_ROSTER_SUBCOLLECTION).document(allocation_id), {
+            "allocationId": allocation_id,
+            "studentId": allocation.get("studentId"),
+            "name": names.get(allocation.get("studentId")),
+            "bedLabel": allocation.get("bedLabel"),
+            "semester": allocation.get("semester"),
+            "allocatedAt": allocation.get("allocatedAt")
+        }))
+
+    # Entries left behind by allocations that are no longer active
+    stale = 0
+    for room in rooms.stream():
+        for entry in room.reference.collection(ROOM_ROSTER_SUBCOLLECTION).stream():
+            if entry.id not in active or active[entry.id]["roomId"] != room.id:
+                writes.append(("delete", entry.reference, None))
+                stale += 1
+
+    if not args.dry_run:
+        for start in range(0, len(writes), BATCH_SIZE):
+            batch = db.batch()
+            for op, ref, data in writes[start:start + BATCH_SIZE]:
+                if op == "set":
+                    batch.set(ref, data)
+                else:
+                    batch.delete(ref)
+            batch.commit()
+
+    print(f"{'Would write' if args.dry_run else 'Wrote'} {len(active)} roster entries and remove {stale} stale ones")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,115 @@
+"""
+Build the frontend for production serving.
+
+Copies every static asset to frontend/build/ under a content-hashed name
+(styles/main.css -> styles/main.3f9a1c2b7d.css), writes .gz (and .br when the
+brotli package is installed) next to the compressible ones, rewrites the
+asset references in the HTML pages and CSS to the hashed URLs, and records
+the mapping in frontend/build/manifest.json.
+
+    python scripts/build_frontend.py
+"""
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+
+try:
+    import brotli
+except ImportError:  # .br output is optional
+    brotli = None
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+SOURCE_DIR = os.path.join(ROOT, "frontend")
+BUILD_DIR = os.path.join(SOURCE_DIR, "build")
+URL_PREFIX = "/frontend/build/"
+
+HASHED_EXTENSIONS = {".css", ".js", ".png", ".jpg", ".jpeg", ".gif", ".svg", ".ico", ".webp", ".woff", ".woff2", ".pdf", ".json"}
+COMPRESSIBLE_EXTENSIONS = {".css", ".js", ".html", ".svg", ".json"}
+PAGES = ["index.html", "pages/login.html", "pages/allocation.html", "pages/splash.html"]
+
+# src="..." / href="..." in HTML, url(...) in CSS
+HTML_REF = re.compile(r'(?P<attr>(?:src|href)=["\'])(?P<ref>[^"\'#?]+)(?P<end>["\'])')
+CSS_REF = re.compile(r'(?P<attr>url\(\s*["\']?)(?P<ref>[^"\')?#]+)(?P<end>["\']?\s*\))')
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:10]
+
+def hashed_name(rel_path: str, data: bytes) -> str:
+    base, ext = os.path.splitext(rel_path)
+    return f"{base}.{content_hash(data)}{ext}"
+
+def write_variants(path: str, data: bytes) -> None:
+    with open(path, "wb") as f:
+        f.write(data)
+    if os.path.splitext(path)[1] not in COMPRESSIBLE_EXTENSIONS:
+        return
+    with open(path + ".gz", "wb") as f:
+        f.write(gzip.compress(data, compresslevel=9, mtime=0))
+    if brotli is not None:
+        with open(path + ".br", "wb") as f:
+            f.write(brotli.compress(data, quality=11))
+
+def rewrite_refs(text: str, pattern, source_rel: str, manifest: dict) -> str:
+    """
+    Point relative asset references at their hashed build URLs
+    """
+    source_dir = os.path.dirname(source_rel)
+
+    def replace(match):
+        ref = match.group("ref")
+        if "://" in ref or ref.startswith(("/", "data:", "mailto:")):
+            return match.group(0)
+        target = os.path.normpath(os.path.join(source_dir, ref)).replace(os.sep, "/")
+        if target not in manifest:
+            return match.group(0)
+        return f"{match.group('attr')}{URL_PREFIX}{manifest[target]}{match.group('end')}"
+
+    return pattern.sub(replace, text)
+
+def collect_assets() -> list:
+    assets = []
+    for dirpath, dirnames, filenames in os.walk(SOURCE_DIR):
+        dirnames[:] = [d for d in dirnames if os.path.join(dirpath, d) != BUILD_DIR]
+        for filename in filenames:
+            if os.path.splitext(filename)[1].lower() in HASHED_EXTENSIONS:
+                rel = os.path.relpath(os.path.join(dirpath, filename), SOURCE_DIR).replace(os.sep, "/")
+                assets.append(rel)
+    # CSS last, so the images it references already have hashed names
+    return sorted(assets, key=lambda rel: (rel.endswith(".css"), rel))
+
+def build() -> dict:
+    if os.path.isdir(BUILD_DIR):
+        shutil.rmtree(BUILD_DIR)
+
+    manifest = {}
+    for rel in collect_assets():
+        with open(os.path.join(SOURCE_DIR, rel), "rb") as f:
+            data = f.read()
+        if rel.endswith(".css"):
+            data = rewrite_refs(data.decode("utf-8"), CSS_REF, rel, manifest).encode("utf-8")
+        target = hashed_name(rel, data)
+        os.makedirs(os.path.join(BUILD_DIR, os.path.dirname(target)), exist_ok=True)
+        write_variants(os.path.join(BUILD_DIR, target), data)
+        manifest[rel] = target
+
+    # Pages keep their names; they are served from memory with an ETag instead
+    for rel in PAGES:
+        source = os.path.join(SOURCE_DIR, rel)
+        if not os.path.exists(source):
+            continue
+        with open(source, encoding="utf-8") as f:
+            html = rewrite_refs(f.read(), HTML_REF, rel, manifest)
+        os.makedirs(os.path.join(BUILD_DIR, os.path.dirname(rel)), exist_ok=True)
+        write_variants(os.path.join(BUILD_DIR, rel), html.encode("utf-8"))
+
+    with open(os.path.join(BUILD_DIR, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+if __name__ == "__main__":
+    manifest = build()
+    print(f"Built {len(manifest)} hashed assets into {os.path.relpath(BUILD_DIR, ROOT)}"
+          f" ({'gzip + brotli' if brotli else 'gzip only; pip install brotli for .br'})")
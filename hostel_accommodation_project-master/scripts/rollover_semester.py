@@ -0,0 +1,35 @@
+"""
+Complete and archive every allocation of a semester.
+
+    python scripts/rollover_semester.py 2026S1
+    python scripts/rollover_semester.py 2026S1 --batch-size 50 --restart
+
+Re-running after an interruption resumes from the stored checkpoint.
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "accommodation_back_end"))
+
+from app.services.rollover_service import RolloverService, DEFAULT_BATCH_SIZE
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("semester", help="Semester to close out, e.g. 2026S1")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help=f"Allocations per batched write, at most {DEFAULT_BATCH_SIZE}")
+    parser.add_argument("--restart", action="store_true", help="Ignore an existing checkpoint")
+    return parser.parse_args()
+
+async def main():
+    args = parse_args()
+    result = await RolloverService().rollover_semester(args.semester, batch_size=args.batch_size, restart=args.restart)
+    print(
+        f"{result['semester']}: {result['moved']} allocations archived "
+        f"({result['completed']} completed), {result['movedThisRun']} this run "
+        f"in {result['elapsedSeconds']}s ({result['docsPerSecond']} docs/s)"
+    )
+
+if __name__ == "__main__":
+    asyncio.run(main())
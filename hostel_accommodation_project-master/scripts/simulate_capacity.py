@@ -0,0 +1,111 @@
+"""
+What-if: can next semester's bed inventory absorb the projected intake?
+
+    python scripts/simulate_capacity.py --intake 3000 [--runs 2000] [--female-share 0.55] ...
+    python scripts/simulate_capacity.py --historical 2026-1 [--growth 1.1] ...
+
+Reads rooms and hostels from Firestore, or from an offline snapshot with
+--snapshot DIR (scripts/snapshot.py), and replays allocate_room's rules for
+a synthetic or bootstrapped historical application stream in memory
+(app/services/capacity_simulator.py). Prints fill rates, rejections by
+reason and time to fill as 5th/50th/95th percentiles over the runs; --json
+prints the full report.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "accommodation_back_end"))
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--snapshot", help="Read from this snapshot directory instead of live Firestore")
+    parser.add_argument("--runs", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--keep-occupied", action="store_true", help="Start from current occupancy instead of an emptied inventory")
+    parser.add_argument("--preferred-only", action="store_true", help="Only place students in hostels they listed")
+    parser.add_argument("--intake", type=int, help="Applications to simulate (synthetic stream; or overrides --historical's count)")
+    parser.add_argument("--historical", metavar="SEMESTER", help="Bootstrap this semester's applications instead of a synthetic stream")
+    parser.add_argument("--growth", type=float, default=1.0, help="Scale the historical intake")
+    parser.add_argument("--days", type=float, default=30.0, help="Synthetic application window")
+    parser.add_argument("--female-share", type=float, default=0.5)
+    parser.add_argument("--other-share", type=float, default=0.0, help="Applicants with no recorded gender (mixed hostels only)")
+    parser.add_argument("--approval-rate", type=float, default=1.0)
+    parser.add_argument("--duplicate-rate", type=float, default=0.0, help="Share of requests repeating an earlier student")
+    parser.add_argument("--preferences", type=int, default=3, help="Hostels listed per application")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+    if not args.historical and not args.intake:
+        parser.error("give --intake for a synthetic stream, or --historical SEMESTER")
+    return args
+
+async def main():
+    args = parse_args()
+    if args.snapshot:
+        sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "benchmarks"))
+        from firestore_backend import install_snapshot
+        install_snapshot(args.snapshot)
+    else:
+        from app.core.firebase import db
+        if db is None:
+            sys.exit("Firestore is not configured (set FIREBASE_CREDENTIALS_PATH or FIRESTORE_EMULATOR_HOST, or use --snapshot)")
+
+    from app.repositories.applications_repo import ApplicationRepository
+    from app.repositories.hostels_repo import HostelRepository
+    from app.repositories.rooms_repo import RoomRepository
+    from app.repositories.users_repo import UserRepository
+    from app.services.capacity_simulator import HistoricalStream, SyntheticStream, hostel_inventory, simulate
+    from app.services.room_inventory import RoomTable
+
+    table = RoomTable.from_rooms(await RoomRepository().get_all_rooms())
+    hostels = {h["id"]: h for h in await HostelRepository().get_hostels()}
+    inventory = hostel_inventory(table, hostels, keep_occupied=args.keep_occupied)
+
+    if args.historical:
+        applications = await ApplicationRepository().get_applications_by_semester(args.historical)
+        genders = {u.get("id"): u.get("gender") for u in await UserRepository().get_users_by_role("student")}
+        stream = HistoricalStream(applications, genders, inventory["hostelIds"], preferences=args.preferences)
+        stream.intake = args.intake or round(stream.intake * args.growth)
+        source = (f"{len(applications):,} applications from {args.historical} "
+                  f"(approval {stream.approval_rate:.0%}, repeats {stream.duplicate_rate:.1%}, over {stream.days:.0f} days)")
+    else:
+        # Students pick hostels roughly in proportion to their size
+        stream = SyntheticStream(
+            args.intake, len(inventory["hostelIds"]), days=args.days, female_share=args.female_share,
+            other_share=args.other_share, approval_rate=args.approval_rate, duplicate_rate=args.duplicate_rate,
+            preferences=args.preferences, popularity=inventory["beds"]
+        )
+        source = "synthetic stream"
+
+    started = time.perf_counter()
+    report = simulate(inventory, stream, runs=args.runs, preferred_only=args.preferred_only, seed=args.seed)
+    report["seconds"] = round(time.perf_counter() - started, 3)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    def p(spread, scale=1, fmt="{:,.0f}"):
+        return " / ".join(fmt.format(spread[k] * scale) for k in ("p5", "p50", "p95"))
+
+    print(f"{report['runs']:,} runs of {report['intake']:,} applications ({source}) against {report['totalBeds']:,} beds"
+          f" in {len(inventory['hostelIds'])} hostels: {report['seconds']:.2f}s")
+    print(f"  {'':<23}p5 / p50 / p95")
+    print(f"  {'placed':<23}{p(report['placed'])}")
+    print(f"  {'fill rate':<23}{p(report['fillRate'], 100, '{:.1f}%')}")
+    for reason, spread in report["rejections"].items():
+        print(f"  {'rejected: ' + reason:<23}{p(spread)}")
+    print(f"  no one turned away for lack of a bed in {report['probabilityAllPlaced']:.1%} of runs")
+    for milestone, fill in report["timeToFill"].items():
+        days = p(fill["days"], fmt="{:.1f}") + " days" if fill["days"] else "never"
+        print(f"  {milestone + ' full':<23}{days}  ({fill['runsReaching']:.0%} of runs)")
+    print("  per hostel (fill rate p50)")
+    for hostel in report["hostels"]:
+        name = hostels[hostel["hostelId"]].get("name") or hostel["hostelId"]
+        policy = hostels[hostel["hostelId"]].get("gender") or "mixed"
+        print(f"    {name:<24} {policy:<7} {hostel['beds']:>6,} beds  {hostel['fillRate']['p50'] * 100:5.1f}%")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,43 @@
+"""
+Export live collections to an offline snapshot, or describe one.
+
+    python scripts/snapshot.py export DIR [--collections users rooms ...] [--workers N]
+    python scripts/snapshot.py info DIR
+
+Analytics and benchmarks then read the snapshot through the normal
+repositories with install_snapshot(DIR) from benchmarks/firestore_backend.py,
+leaving live Firestore quota to production traffic.
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "accommodation_back_end"))
+
+from app.core.firebase import db
+from app.core.snapshot import DEFAULT_COLLECTIONS, export_snapshot, read_manifest
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    commands = parser.add_subparsers(dest="command", required=True)
+    export = commands.add_parser("export", help="Read collections from Firestore into DIR")
+    export.add_argument("directory")
+    export.add_argument("--collections", nargs="+", default=DEFAULT_COLLECTIONS)
+    export.add_argument("--workers", type=int, default=None, help="Reader threads (default: one per collection)")
+    info = commands.add_parser("info", help="Show what a snapshot holds")
+    info.add_argument("directory")
+    args = parser.parse_args()
+
+    if args.command == "export":
+        if db is None:
+            sys.exit("Firestore is not configured (set FIREBASE_CREDENTIALS_PATH or FIRESTORE_EMULATOR_HOST)")
+        manifest = export_snapshot(db, args.directory, args.collections, args.workers)
+    else:
+        manifest = read_manifest(args.directory)
+
+    print(f"snapshot {args.directory} taken {manifest['createdAt']}")
+    for name, stats in manifest["collections"].items():
+        print(f"  {name:<14} {stats['documents']:>9,} documents {stats['bytes'] / 1024:>10,.1f} KiB  {stats['seconds']:>7.2f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""
+Backfill Firebase custom claims (role, gender, hostelId) from Firestore.
+
+Run once after deploying claims-based auth, and any time profiles were edited
+outside the API:
+
+    python scripts/sync_claims.py
+"""
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "accommodation_back_end"))
+
+from app.core.firebase import db, ALLOCATIONS_COLLECTION
+from app.repositories.users_repo import UserRepository
+from app.services.claims_service import ClaimsService
+
+async def main():
+    users = await UserRepository().get_all_users()
+    claims_service = ClaimsService()
+
+    # Hostel assignment lives on the active allocation, not the user document
+    active_hostels = {}
+    for doc in db.collection(ALLOCATIONS_COLLECTION).where("status", "==", "active").stream():
+        allocation = doc.to_dict()
+        active_hostels[allocation["studentId"]] = allocation.get("hostelId")
+
+    updated = 0
+    for user in users:
+        profile = {**user, "hostelId": active_hostels.get(user["id"])}
+        if await claims_service.sync_from_profile(user["id"], profile):
+            updated += 1
+
+    print(f"Synced claims for {updated} of {len(users)} users")
+
+if __name__ == "__main__":
+    asyncio.run(main())
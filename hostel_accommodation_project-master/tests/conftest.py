@@ -0,0 +1,45 @@
+"""
+Tests run the real repositories and services against the in-memory
+Firestore stand-in (benchmarks/memory_firestore.py). It is installed here,
+before any test module imports a repository or service, and emptied
+before every test along with the per-worker caches.
+
+Custom claims live in Firebase Auth, which the stand-in does not cover:
+sync_user_claims is replaced by a recorder (the claims fixture).
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "benchmarks"))
+
+from firestore_backend import install
+
+backend, store = install(latency=0.0)
+
+from app.core.cache import read_cache
+from app.services.claims_service import ClaimsService
+from app.services.room_inventory import room_inventory
+
+@pytest.fixture(autouse=True)
+def db():
+    store.documents.clear()
+    read_cache.entries.clear()
+    room_inventory.table = None
+    room_inventory.expires_at = 0.0
+    return store
+
+@pytest.fixture(autouse=True)
+def claims(monkeypatch):
+    """
+    (uid, updates) for every claims sync
+    """
+    calls = []
+
+    async def sync_user_claims(self, uid, updates):
+        calls.append((uid, updates))
+        return True
+
+    monkeypatch.setattr(ClaimsService, "sync_user_claims", sync_user_claims)
+    return calls
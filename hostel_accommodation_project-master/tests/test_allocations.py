@@ -0,0 +1,129 @@
+import asyncio
+
+import pytest
+
+from app.core.exceptions import RoomFullError
+from app.schemas.allocation import AllocationCreate
+from app.services.allocation_service import AllocationService, student_lock_id
+
+SEMESTER = "2026-1"
+
+def add_student(db, student_id: str, gender: str = "female", applications: int = 1) -> None:
+    db.collection("users").document(student_id).set({
+        "id": student_id, "full_name": f"Student {student_id}", "role": "student", "gender": gender
+    })
+    for n in range(applications):
+        db.collection("applications").document(f"{student_id}-app{n}").set({
+            "studentId": student_id, "semester": SEMESTER, "status": "approved"
+        })
+
+def add_room(db, room_id: str, capacity: int, hostel_id: str = "H1") -> None:
+    db.collection("rooms").document(room_id).set({
+        "id": room_id, "hostel_id": hostel_id, "room_number": room_id, "capacity": capacity, "occupied": 0
+    })
+
+def request(student_id: str, room_id: str, semester: str = SEMESTER) -> AllocationCreate:
+    return AllocationCreate(studentId=student_id, hostelId="H1", roomId=room_id, bedLabel="Bed 1", semester=semester)
+
+async def allocate_all(service: AllocationService, requests):
+    return await asyncio.gather(
+        *(service.allocate_room(r, "W1") for r in requests), return_exceptions=True
+    )
+
+@pytest.fixture
+def hostel(db):
+    db.collection("hostels").document("H1").set({"id": "H1", "name": "Hostel 1", "gender": "female", "isActive": True})
+    return "H1"
+
+@pytest.fixture
+def slow_db(db, monkeypatch):
+    # Round trips long enough for concurrent allocations to overlap
+    monkeypatch.setattr(db, "latency", 0.01)
+    return db
+
+def active_allocations(db, student_id: str):
+    return [
+        doc for doc in db.collection("allocations").where("studentId", "==", student_id).get()
+        if doc.to_dict()["status"] == "active"
+    ]
+
+def test_concurrent_allocations_for_one_student_place_them_once(hostel, slow_db):
+    add_student(slow_db, "S1")
+    add_room(slow_db, "R1", 2)
+    add_room(slow_db, "R2", 2)
+
+    results = asyncio.run(allocate_all(AllocationService(), [request("S1", "R1"), request("S1", "R2")]))
+
+    placed = [r for r in results if isinstance(r, dict)]
+    rejected = [r for r in results if isinstance(r, Exception)]
+    assert len(placed) == 1 and len(rejected) == 1
+    assert isinstance(rejected[0], ValueError)
+    assert len(active_allocations(slow_db, "S1")) == 1
+    occupied = [slow_db.collection("rooms").document(r).get().to_dict()["occupied"] for r in ("R1", "R2")]
+    assert sorted(occupied) == [0, 1]
+    lock = slow_db.collection("allocations_index").document(student_lock_id("S1", SEMESTER)).get().to_dict()
+    assert lock["allocationId"] == placed[0]["id"]
+
+def test_concurrent_allocations_never_overfill_a_room(hostel, slow_db):
+    for n in range(4):
+        add_student(slow_db, f"S{n}")
+    add_room(slow_db, "R1", 2)
+
+    results = asyncio.run(allocate_all(AllocationService(), [request(f"S{n}", "R1") for n in range(4)]))
+
+    assert sum(isinstance(r, dict) for r in results) == 2
+    assert all(isinstance(r, RoomFullError) for r in results if isinstance(r, Exception))
+    assert slow_db.collection("rooms").document("R1").get().to_dict()["occupied"] == 2
+    assert len(slow_db.collection("rooms").document("R1").collection("roster").get()) == 2
+
+def test_second_allocation_in_a_semester_is_refused(hostel, db):
+    # A second approved application must not get around the lock
+    add_student(db, "S1", applications=2)
+    add_room(db, "R1", 2)
+    add_room(db, "R2", 2)
+    service = AllocationService()
+
+    asyncio.run(service.allocate_room(request("S1", "R1"), "W1"))
+    with pytest.raises(ValueError, match="already has an active allocation"):
+        asyncio.run(service.allocate_room(request("S1", "R2"), "W1"))
+
+    # Another semester has its own lock
+    asyncio.run(service.allocate_room(request("S1", "R2", semester="2026-2"), "W1"))
+    assert len(active_allocations(db, "S1")) == 2
+
+def test_cancelling_releases_the_lock_and_the_bed(hostel, db, claims):
+    add_student(db, "S1", applications=2)
+    add_room(db, "R1", 1)
+    service = AllocationService()
+
+    allocation = asyncio.run(service.allocate_room(request("S1", "R1"), "W1"))
+    assert asyncio.run(service.cancel_allocation(allocation["id"], "W1")) is True
+
+    assert not db.collection("allocations_index").document(student_lock_id("S1", SEMESTER)).get().exists
+    assert db.collection("rooms").document("R1").get().to_dict()["occupied"] == 0
+    asyncio.run(service.allocate_room(request("S1", "R1"), "W1"))
+    assert claims[-2:] == [("S1", {"hostelId": None}), ("S1", {"hostelId": "H1"})]
+
+def test_cancelling_an_allocation_archived_meanwhile_changes_nothing(hostel, db, monkeypatch):
+    add_student(db, "S1")
+    add_room(db, "R1", 1)
+    service = AllocationService()
+    allocation = asyncio.run(service.allocate_room(request("S1", "R1"), "W1"))
+
+    # Read before a rollover moved it to the archive
+    async def stale(allocation_id):
+        return allocation
+
+    monkeypatch.setattr(service.allocation_repo, "get_allocation_by_id", stale)
+    db.collection("allocations").document(allocation["id"]).delete()
+
+    assert asyncio.run(service.cancel_allocation(allocation["id"], "W1")) is True
+    assert db.collection("rooms").document("R1").get().to_dict()["occupied"] == 1
+
+def test_gender_mismatch_is_refused(hostel, db):
+    add_student(db, "S1", gender="male")
+    add_room(db, "R1", 2)
+
+    with pytest.raises(ValueError, match="Gender mismatch"):
+        asyncio.run(AllocationService().allocate_room(request("S1", "R1"), "W1"))
+    assert db.collection("rooms").document("R1").get().to_dict()["occupied"] == 0
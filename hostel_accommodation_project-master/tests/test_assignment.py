@@ -0,0 +1,17 @@
+import asyncio
+
+from app.services.allocation_service import AllocationService
+from app.services.assignment_service import AssignmentService
+
+SEMESTER = "2026-1"
+
+def test_plan_matches_seed_data_students_by_document_id(db):
+    db.collection("hostels").document("H1").set({"id": "H1", "name": "Hostel 1", "gender": "female", "isActive": True})
+    db.collection("rooms").document("R1").set({"id": "R1", "hostel_id": "H1", "capacity": 2, "occupied": 0})
+    # As frontend/scripts/seed-data.js writes a profile: no id field
+    _, student = db.collection("users").add({"full_name": "Seeded Student", "role": "student", "gender": "female"})
+    db.collection("applications").document("A1").set({"studentId": student.id, "semester": SEMESTER, "status": "approved"})
+
+    plan = asyncio.run(AssignmentService(AllocationService()).plan(SEMESTER))
+
+    assert [(a["studentId"], a["roomId"]) for a in plan["assignments"]] == [(student.id, "R1")]
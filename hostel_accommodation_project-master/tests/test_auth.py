@@ -0,0 +1,62 @@
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import deps
+from app.api.routes import users
+
+STUDENT = {"uid": "S1", "role": "student"}
+WARDEN = {"uid": "W1", "role": "warden"}
+ADMIN = {"uid": "A1", "role": "admin"}
+
+@pytest.fixture
+def student(db):
+    now = datetime.now(timezone.utc)
+    db.collection("users").document("S1").set({
+        "id": "S1", "full_name": "Student One", "role": "student", "gender": "female",
+        "created_at": now, "updated_at": now
+    })
+    return "S1"
+
+def client_as(current_user: dict) -> TestClient:
+    app = FastAPI()
+    app.include_router(users.router, prefix="/api/users")
+    app.dependency_overrides[deps.get_current_user] = lambda: current_user
+    return TestClient(app)
+
+def test_student_updates_own_name(student, db, claims):
+    response = client_as(STUDENT).put("/api/users/S1", json={"full_name": "Student Renamed"})
+
+    assert response.status_code == 200
+    assert db.collection("users").document("S1").get().to_dict()["full_name"] == "Student Renamed"
+    # The name is not a claim
+    assert claims == []
+
+@pytest.mark.parametrize("field, value", [("role", "admin"), ("gender", "male"), ("hostelId", "H1")])
+def test_student_cannot_change_claim_fields(student, db, claims, field, value):
+    response = client_as(STUDENT).put("/api/users/S1", json={field: value})
+
+    assert response.status_code == 403
+    profile = db.collection("users").document("S1").get().to_dict()
+    assert profile["role"] == "student" and profile["gender"] == "female" and "hostelId" not in profile
+    assert claims == []
+
+def test_warden_cannot_change_gender(student, db):
+    response = client_as(WARDEN).put("/api/users/S1", json={"gender": "male"})
+
+    assert response.status_code == 403
+    assert db.collection("users").document("S1").get().to_dict()["gender"] == "female"
+
+def test_student_cannot_update_someone_else(student):
+    response = client_as({"uid": "S2", "role": "student"}).put("/api/users/S1", json={"full_name": "X"})
+
+    assert response.status_code == 403
+
+def test_admin_changes_gender_and_claims_follow(student, db, claims):
+    response = client_as(ADMIN).put("/api/users/S1", json={"gender": "male"})
+
+    assert response.status_code == 200
+    assert db.collection("users").document("S1").get().to_dict()["gender"] == "male"
+    assert claims == [("S1", {"gender": "male"})]
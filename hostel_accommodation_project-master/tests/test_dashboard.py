@@ -0,0 +1,17 @@
+import asyncio
+
+from app.services.dashboard_service import DashboardService
+
+def test_warden_dashboard_counts_applications_by_status(db):
+    db.collection("hostels").document("H1").set({"id": "H1", "name": "Hostel 1", "gender": "female", "isActive": True})
+    db.collection("rooms").document("R1").set({"id": "R1", "hostel_id": "H1", "capacity": 3, "occupied": 1})
+    db.collection("users").document("S1").set({"id": "S1", "role": "student"})
+    # "pending" is what the frontend files; "submitted" what the API does
+    for n, status in enumerate(["pending", "submitted", "approved", "allocated", "allocated", "rejected"]):
+        db.collection("applications").document(f"A{n}").set({"studentId": f"S{n}", "status": status})
+
+    dashboard = asyncio.run(DashboardService().get_warden_dashboard())
+
+    assert dashboard["applicationCounts"] == {"pending": 2, "approved": 1, "allocated": 2, "rejected": 1}
+    assert {a["id"] for a in dashboard["pendingApplications"]} == {"A0", "A1"}
+    assert dashboard["stats"] == {"totalStudents": 1, "allocated": 1, "availableBeds": 2, "pendingApplications": 2}
@@ -0,0 +1,63 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from app.services.occupancy_history_service import OccupancyHistoryService, bucket_start
+from app.services.room_inventory import room_inventory
+
+AT = datetime(2026, 8, 3, 10, 15, tzinfo=timezone.utc)
+
+def add_room(db, room_id: str, hostel_id: str, capacity: int, occupied: int) -> None:
+    db.collection("rooms").document(room_id).set({
+        "id": room_id, "hostel_id": hostel_id, "capacity": capacity, "occupied": occupied
+    })
+
+def bucket(db, hostel_id: str, resolution: str = "hour") -> dict:
+    start = bucket_start(AT, resolution)
+    return db.collection("occupancy_buckets").document(f"{hostel_id}_{resolution}_{start:%Y%m%d%H}").get().to_dict()
+
+def test_level_comes_from_the_room_documents(db):
+    add_room(db, "R1", "H1", 4, 2)
+    add_room(db, "R2", "H1", 2, 1)
+    asyncio.run(room_inventory.load())
+    # Another worker's allocation, which this worker's inventory has not seen
+    db.collection("rooms").document("R2").update({"occupied": 2})
+
+    asyncio.run(OccupancyHistoryService().record({"R2": 1}, "allocation.created", at=AT))
+
+    hourly = bucket(db, "H1")
+    assert (hourly["occupied"], hourly["capacity"], hourly["allocated"]) == (4, 6, 1)
+    assert (hourly["min"], hourly["max"]) == (3, 4)
+    assert bucket(db, "H1", "day")["occupied"] == 4
+    [event] = [doc.to_dict() for doc in db.collection("occupancy_events").get()]
+    assert (event["delta"], event["occupied"]) == (1, 4)
+
+def test_later_changes_in_a_bucket_keep_the_extremes(db):
+    add_room(db, "R1", "H1", 3, 3)
+    service = OccupancyHistoryService()
+    asyncio.run(service.record({"R1": 1}, "allocation.created", at=AT))
+
+    db.collection("rooms").document("R1").update({"occupied": 1})
+    asyncio.run(service.record({"R1": -2}, "rollover", at=AT + timedelta(minutes=5)))
+
+    hourly = bucket(db, "H1")
+    assert (hourly["occupied"], hourly["min"], hourly["max"]) == (1, 1, 3)
+    assert (hourly["allocated"], hourly["released"]) == (1, 2)
+
+def test_room_missing_from_the_inventory_is_still_recorded(db):
+    add_room(db, "R1", "H1", 2, 0)
+    asyncio.run(room_inventory.load())
+    add_room(db, "R2", "H2", 2, 1)
+
+    asyncio.run(OccupancyHistoryService().record({"R2": 1}, "allocation.created", at=AT))
+
+    assert bucket(db, "H2")["occupied"] == 1
+    assert bucket(db, "H1") is None
+
+def test_history_carries_the_level_forward(db):
+    add_room(db, "R1", "H1", 4, 1)
+    service = OccupancyHistoryService()
+    asyncio.run(service.record({"R1": 1}, "allocation.created", at=AT - timedelta(hours=2)))
+
+    history = asyncio.run(service.get_history("H1", "hour", AT - timedelta(hours=1), AT + timedelta(hours=1)))
+
+    assert [(p["occupied"], p["occupancyRate"]) for p in history["points"]] == [(1, 25.0)] * 3
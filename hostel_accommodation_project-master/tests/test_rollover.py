@@ -0,0 +1,91 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.core.exceptions import RolloverInProgressError
+from app.services.rollover_service import RolloverService
+
+SEMESTER = "2026-1"
+
+@pytest.fixture
+def semester(db):
+    """
+    Two rooms, five active allocations and one cancelled one
+    """
+    db.collection("rooms").document("R1").set({"id": "R1", "hostel_id": "H1", "capacity": 3, "occupied": 3})
+    db.collection("rooms").document("R2").set({"id": "R2", "hostel_id": "H1", "capacity": 3, "occupied": 2})
+    for n, room_id in enumerate(["R1", "R1", "R1", "R2", "R2"]):
+        db.collection("allocations").document(f"A{n}").set({
+            "studentId": f"S{n}", "roomId": room_id, "hostelId": "H1", "semester": SEMESTER, "status": "active"
+        })
+        db.collection("allocations_index").document(f"S{n}_{SEMESTER}").set({"allocationId": f"A{n}"})
+    db.collection("allocations").document("A9").set({
+        "studentId": "S9", "roomId": "R2", "hostelId": "H1", "semester": SEMESTER, "status": "cancelled"
+    })
+    return db
+
+def occupied(db, room_id: str) -> int:
+    return db.collection("rooms").document(room_id).get().to_dict()["occupied"]
+
+def test_rollover_archives_the_semester_and_frees_the_beds(semester, claims):
+    result = asyncio.run(RolloverService().rollover_semester(SEMESTER, batch_size=2))
+
+    assert (result["status"], result["moved"], result["completed"]) == ("completed", 6, 5)
+    assert occupied(semester, "R1") == 0 and occupied(semester, "R2") == 0
+    assert semester.collection("allocations").get() == []
+    assert len(semester.collection("allocation_archives").document(SEMESTER).collection("allocations").get()) == 6
+    assert semester.collection("allocations_index").get() == []
+    checkpoint = semester.collection("rollover_checkpoints").document(SEMESTER).get().to_dict()
+    assert "leaseOwner" not in checkpoint
+    assert len(claims) == 5
+
+def test_concurrent_rollovers_release_each_bed_once(semester, monkeypatch):
+    monkeypatch.setattr(semester, "latency", 0.005)
+
+    async def both():
+        service = RolloverService()
+        return await asyncio.gather(
+            service.rollover_semester(SEMESTER, batch_size=2), service.rollover_semester(SEMESTER, batch_size=2),
+            return_exceptions=True
+        )
+
+    results = asyncio.run(both())
+
+    assert sum(isinstance(r, dict) for r in results) == 1
+    assert sum(isinstance(r, RolloverInProgressError) for r in results) == 1
+    assert occupied(semester, "R1") == 0 and occupied(semester, "R2") == 0
+
+def test_a_held_lease_refuses_another_run(semester):
+    semester.collection("rollover_checkpoints").document(SEMESTER).set({
+        "semester": SEMESTER, "status": "running", "moved": 0, "completed": 0,
+        "leaseOwner": "other", "leaseExpiresAt": datetime.now(timezone.utc) + timedelta(minutes=1)
+    })
+
+    with pytest.raises(RolloverInProgressError):
+        asyncio.run(RolloverService().rollover_semester(SEMESTER))
+    assert occupied(semester, "R1") == 3
+
+def test_an_expired_lease_is_taken_over_and_the_run_resumes(semester):
+    semester.collection("rollover_checkpoints").document(SEMESTER).set({
+        "semester": SEMESTER, "status": "running", "moved": 4, "completed": 4,
+        "leaseOwner": "crashed", "leaseExpiresAt": datetime.now(timezone.utc) - timedelta(seconds=1)
+    })
+
+    result = asyncio.run(RolloverService().rollover_semester(SEMESTER))
+
+    assert (result["moved"], result["movedThisRun"]) == (10, 6)
+
+def test_a_batch_skips_allocations_already_archived(semester):
+    service = RolloverService()
+    owner = "run-1"
+    service._acquire_lease(SEMESTER, owner, restart=False)
+    refs = [semester.collection("allocations").document(f"A{n}") for n in range(3)]
+    service._archive_batch(SEMESTER, owner, refs)
+
+    # The same page again, as a run that read it before the first commit would
+    checkpoint, released, students, moved = service._archive_batch(SEMESTER, owner, refs)
+
+    assert (moved, students, dict(released)) == (0, [], {})
+    assert checkpoint["moved"] == 3
+    assert occupied(semester, "R1") == 0
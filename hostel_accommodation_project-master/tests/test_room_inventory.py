@@ -0,0 +1,80 @@
+import asyncio
+
+from app.schemas.allocation import AllocationCreate
+from app.schemas.room import RoomCreate
+from app.services.allocation_service import AllocationService
+from app.services.room_inventory import RoomTable, room_inventory
+from app.services.room_service import RoomService
+
+# As frontend/scripts/seed-data.js writes it: addDoc, so no id field, and "number" for the room number
+SEED_ROOM = {
+    "number": "G1-101", "block": "G1", "floor": 1, "gender": "female", "capacity": 3, "occupied": 1,
+    "amenities": ["WiFi"], "condition": "Good", "isActive": True
+}
+
+def add_room(db, room_id: str, hostel_id: str, capacity: int, occupied: int = 0, **fields) -> None:
+    db.collection("rooms").document(room_id).set({
+        "id": room_id, "hostel_id": hostel_id, "room_number": room_id, "capacity": capacity, "occupied": occupied, **fields
+    })
+
+def test_load_keys_rooms_by_document_id(db):
+    add_room(db, "R1", "H1", 2, floor=1, block="A")
+    _, seeded = db.collection("rooms").add(SEED_ROOM)
+
+    assert asyncio.run(room_inventory.load()) == 2
+    table = asyncio.run(room_inventory.get_table())
+    assert table.get("R1") == {
+        "id": "R1", "hostel_id": "H1", "capacity": 2, "occupied": 0, "floor": 1, "block": "A", "isActive": True
+    }
+    assert table.get(seeded.id)["capacity"] == 3
+    assert table.get(seeded.id)["hostel_id"] is None
+
+def test_hostel_occupancy_from_the_inventory(db):
+    add_room(db, "R1", "H1", 4, occupied=3)
+    add_room(db, "R2", "H1", 2, occupied=1)
+    add_room(db, "R3", "H2", 2, occupied=2)
+    service = AllocationService()
+
+    occupancy = asyncio.run(service.get_hostel_occupancy("H1"))
+
+    assert occupancy == {
+        "hostelId": "H1", "totalRooms": 2, "totalCapacity": 6, "totalOccupied": 4,
+        "totalAvailable": 2, "occupancyRate": 66.67
+    }
+    assert asyncio.run(service.get_hostel_occupancy("H9")) is None
+
+def test_writes_reach_a_loaded_inventory_without_a_reload(db):
+    db.collection("hostels").document("H1").set({"id": "H1", "name": "Hostel 1", "gender": "mixed", "isActive": True})
+    db.collection("users").document("S1").set({"id": "S1", "full_name": "Student 1", "role": "student"})
+    db.collection("applications").document("S1-app").set({"studentId": "S1", "semester": "2026-1", "status": "approved"})
+    add_room(db, "R1", "H1", 2)
+    asyncio.run(room_inventory.load())
+
+    created = asyncio.run(RoomService().create_room(RoomCreate(room_number="102", hostel_id="H1", capacity=3)))
+    asyncio.run(AllocationService().allocate_room(
+        AllocationCreate(studentId="S1", hostelId="H1", roomId="R1", bedLabel="Bed 1", semester="2026-1"), "W1"
+    ))
+
+    table = room_inventory.table
+    assert table.get("R1")["occupied"] == 1
+    assert table.get(created["id"])["capacity"] == 3
+    assert table.hostel_totals()["H1"] == {"rooms": 2, "capacity": 5, "occupied": 1, "free": 4}
+
+def test_table_filters_and_removal():
+    table = RoomTable.from_rooms([
+        {"id": "R1", "hostel_id": "H1", "capacity": 2, "occupied": 2, "floor": 1, "block": "A"},
+        {"id": "R2", "hostel_id": "H1", "capacity": 2, "occupied": 0, "floor": 2, "block": "A"},
+        {"id": "R3", "hostel_id": "H2", "capacity": 4, "occupied": 5, "floor": 1, "block": "B", "isActive": False},
+    ])
+
+    assert table.select(hostel_id="H1", min_free=1) == ["R2"]
+    assert table.select(floor=1) == ["R1", "R3"]
+    assert table.select(active_only=True) == ["R1", "R2"]
+    # An overfull room counts no free beds rather than negative ones
+    assert table.hostel_totals()["H2"]["free"] == 0
+
+    assert table.remove("R1") is True
+    assert len(table) == 2 and "R1" not in table
+    assert table.get("R3")["occupied"] == 5
+    assert table.add_occupied({"R2": 1, "R9": 1}) == ["R9"]
+    assert table.get("R2")["occupied"] == 1
@@ -0,0 +1,80 @@
+import logging
+from datetime import timezone
+from typing import List
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from google.api_core.datetime_helpers import DatetimeWithNanoseconds
+from pydantic import TypeAdapter
+
+from app.api import deps
+from app.api.routes import rooms
+from app.schemas.room import RoomOut
+
+WARDEN = {"uid": "W1", "role": "warden"}
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(rooms.router, prefix="/api/rooms")
+    for dependency in (deps.get_current_user, deps.require_warden):
+        app.dependency_overrides[dependency] = lambda: WARDEN
+    return TestClient(app)
+
+def add_room(db, room_id: str, **fields) -> dict:
+    # Firestore hands timestamps back as DatetimeWithNanoseconds
+    at = DatetimeWithNanoseconds(2026, 8, 1, 9, 30, tzinfo=timezone.utc)
+    room = {
+        "id": room_id, "hostel_id": "H1", "room_number": room_id, "capacity": 2, "occupied": 0, "floor": 1,
+        "block": "A", "amenities": ["wifi"], "created_at": at, "updated_at": at, **fields
+    }
+    db.collection("rooms").document(room_id).set(room)
+    return room
+
+def test_list_matches_the_response_model(client, db):
+    stored = [add_room(db, "R1"), add_room(db, "R2", occupied=2, floor=None, amenities=[])]
+
+    response = client.get("/api/rooms/")
+
+    assert response.status_code == 200
+    adapter = TypeAdapter(List[RoomOut])
+    assert response.json() == adapter.dump_python(adapter.validate_python(stored), mode="json")
+    assert response.json()[0]["created_at"] == "2026-08-01T09:30:00Z"
+
+def test_seed_data_rooms_are_listed(client, db):
+    add_room(db, "R1")
+    _, seeded = db.collection("rooms").add({
+        "number": "G1-101", "block": "G1", "floor": 1, "gender": "female", "capacity": 3, "occupied": 1,
+        "amenities": ["WiFi"], "condition": "Good", "isActive": True
+    })
+
+    response = client.get("/api/rooms/")
+
+    assert response.status_code == 200
+    listed = {room["id"]: room for room in response.json()}
+    assert set(listed) == {"R1", seeded.id}
+    assert listed[seeded.id]["number"] == "G1-101" and listed[seeded.id]["room_number"] is None
+
+def test_invalid_room_is_left_out_not_a_500(client, db, caplog):
+    add_room(db, "R1")
+    add_room(db, "R2", capacity="several")
+
+    with caplog.at_level(logging.WARNING, logger="app.core.responses"):
+        response = client.get("/api/rooms/")
+
+    assert response.status_code == 200
+    assert [room["id"] for room in response.json()] == ["R1"]
+    assert any("RoomOut left out of list response" in r.getMessage() and r.id == "R2" for r in caplog.records)
+
+def test_list_is_cached_until_a_room_changes(client, db):
+    add_room(db, "R1")
+    assert len(client.get("/api/rooms/").json()) == 1
+
+    # Written behind the service's back: the cached list is still served
+    add_room(db, "R2")
+    assert len(client.get("/api/rooms/").json()) == 1
+
+    created = client.post("/api/rooms/", json={"room_number": "103", "hostel_id": "H1", "capacity": 3})
+    assert created.status_code == 200
+    assert {room["id"] for room in client.get("/api/rooms/").json()} == {"R1", "R2", created.json()["id"]}
@@ -0,0 +1,13 @@
+import pytest
+
+from app.core.static_assets import accepted_encodings
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip, deflate, br", {"gzip", "deflate", "br"}),
+    ("br;q=0.8, gzip;q=0.5", {"br", "gzip"}),
+    ("br;q=0, gzip; q=0.000, identity", {"identity"}),
+    ("GZIP;Q=0.01, br;q=oops", {"gzip"}),
+    ("", set()),
+])
+def test_only_q_zero_refuses_a_coding(header, expected):
+    assert accepted_encodings({"accept-encoding": header}) == expected
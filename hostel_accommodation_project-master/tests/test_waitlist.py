@@ -0,0 +1,106 @@
+import asyncio
+
+import pytest
+
+from app.schemas.allocation import AllocationCreate
+from app.schemas.waitlist import WaitlistCreate
+from app.services.allocation_service import AllocationService
+from app.services.waitlist_service import WaitlistService
+
+SEMESTER = "2026-1"
+
+def add_student(db, student_id: str) -> None:
+    db.collection("users").document(student_id).set({
+        "id": student_id, "full_name": f"Student {student_id}", "role": "student", "gender": "female"
+    })
+    db.collection("applications").document(f"{student_id}-app").set({
+        "studentId": student_id, "semester": SEMESTER, "status": "approved"
+    })
+
+@pytest.fixture
+def full_room(db):
+    """
+    R1 (one bed) taken by S0; returns (allocation service, waitlist service, S0's allocation id)
+    """
+    db.collection("hostels").document("H1").set({"id": "H1", "name": "Hostel 1", "gender": "female", "isActive": True})
+    db.collection("rooms").document("R1").set({
+        "id": "R1", "hostel_id": "H1", "room_number": "101", "capacity": 1, "occupied": 0
+    })
+    for n in range(4):
+        add_student(db, f"S{n}")
+
+    allocations = AllocationService()
+    waitlist = WaitlistService(allocations)
+    allocation = asyncio.run(allocations.allocate_room(
+        AllocationCreate(studentId="S0", hostelId="H1", roomId="R1", bedLabel="Bed 1", semester=SEMESTER), "W1"
+    ))
+    return allocations, waitlist, allocation["id"]
+
+def join(waitlist: WaitlistService, student_id: str, priority: int = None) -> dict:
+    return asyncio.run(waitlist.join(WaitlistCreate(hostelId="H1", semester=SEMESTER, priority=priority), student_id))
+
+def entry_status(db, entry_id: str) -> dict:
+    return db.collection("waitlist").document(entry_id).get().to_dict()
+
+def test_cancellation_promotes_the_highest_priority_student(db, full_room):
+    allocations, waitlist, allocation_id = full_room
+    first = join(waitlist, "S1")
+    priority = join(waitlist, "S2", priority=2)
+
+    asyncio.run(allocations.cancel_allocation(allocation_id, "W1"))
+
+    promoted = entry_status(db, priority["id"])
+    assert promoted["status"] == "promoted"
+    allocation = db.collection("allocations").document(promoted["allocationId"]).get().to_dict()
+    assert allocation["studentId"] == "S2" and allocation["roomId"] == "R1" and allocation["bedLabel"] == "Bed 1"
+    assert db.collection("rooms").document("R1").get().to_dict()["occupied"] == 1
+    # The other student keeps their place
+    assert entry_status(db, first["id"])["status"] == "waiting"
+    assert [e["id"] for e in asyncio.run(waitlist.get_queue(SEMESTER, "H1"))] == [first["id"]]
+
+def test_equal_priority_is_first_come_first_served(db, full_room):
+    allocations, waitlist, allocation_id = full_room
+    first = join(waitlist, "S1")
+    join(waitlist, "S2")
+
+    asyncio.run(allocations.cancel_allocation(allocation_id, "W1"))
+
+    assert entry_status(db, first["id"])["status"] == "promoted"
+
+def test_rejected_candidate_is_removed_and_the_next_one_promoted(db, full_room):
+    allocations, waitlist, allocation_id = full_room
+    withdrawn = join(waitlist, "S1", priority=1)
+    second = join(waitlist, "S2")
+    # No longer approved, so allocate_room refuses S1
+    db.collection("applications").document("S1-app").update({"status": "withdrawn"})
+
+    asyncio.run(allocations.cancel_allocation(allocation_id, "W1"))
+
+    assert entry_status(db, withdrawn["id"])["status"] == "removed"
+    assert entry_status(db, second["id"])["status"] == "promoted"
+
+def test_unexpected_failure_keeps_the_student_waiting(db, full_room, monkeypatch):
+    allocations, waitlist, allocation_id = full_room
+    entry = join(waitlist, "S1")
+
+    async def unavailable(*args, **kwargs):
+        raise RuntimeError("Firestore unavailable")
+
+    monkeypatch.setattr(allocations, "allocate_room", unavailable)
+
+    # The cancellation itself is committed and still succeeds
+    assert asyncio.run(allocations.cancel_allocation(allocation_id, "W1")) is True
+    assert db.collection("rooms").document("R1").get().to_dict()["occupied"] == 0
+    assert entry_status(db, entry["id"])["status"] == "waiting"
+    assert [e["id"] for e in asyncio.run(waitlist.get_queue(SEMESTER, "H1"))] == [entry["id"]]
+
+def test_load_rebuilds_the_queues_from_firestore(db, full_room):
+    allocations, waitlist, _ = full_room
+    low = join(waitlist, "S1")
+    high = join(waitlist, "S2", priority=3)
+    left = join(waitlist, "S3")
+    asyncio.run(waitlist.leave(left["id"]))
+
+    restarted = WaitlistService(allocations)
+    assert asyncio.run(restarted.load()) == 2
+    assert [e["id"] for e in asyncio.run(restarted.get_queue(SEMESTER, "H1"))] == [high["id"], low["id"]]